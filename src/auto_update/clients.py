@@ -27,6 +27,19 @@ class RawStatus:
     created_at: str
 
 
+@dataclass(frozen=True)
+class ReleaseAsset:
+    name: str
+    download_url: str
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "ReleaseAsset":
+        return cls(
+            name=str(data.get("name") or ""),
+            download_url=str(data.get("browser_download_url") or ""),
+        )
+
+
 @dataclass(frozen=True)
 class GitHubRelease:
     tag_name: str
@@ -35,6 +48,7 @@ class GitHubRelease:
     zipball_url: str
     draft: bool
     prerelease: bool
+    assets: tuple[ReleaseAsset, ...] = ()
 
     @classmethod
     def from_api(cls, data: dict[str, Any]) -> "GitHubRelease":
@@ -45,8 +59,19 @@ class GitHubRelease:
             zipball_url=str(data.get("zipball_url") or ""),
             draft=bool(data.get("draft", False)),
             prerelease=bool(data.get("prerelease", False)),
+            assets=tuple(
+                ReleaseAsset.from_api(item)
+                for item in data.get("assets") or []
+                if isinstance(item, dict)
+            ),
         )
 
+    def find_asset(self, name: str) -> ReleaseAsset | None:
+        for asset in self.assets:
+            if asset.name == name and asset.download_url:
+                return asset
+        return None
+
     @property
     def metadata(self) -> dict[str, Any]:
         match = _METADATA_PATTERN.search(self.body)
@@ -163,6 +188,12 @@ class GitHubClient:
         )
 
 
+    def download_release_asset(
+        self, asset: ReleaseAsset, destination: Path
+    ) -> None:
+        self._client.download(asset.download_url, destination)
+
+
 def find_release_for_token(
     releases: list[GitHubRelease], token: str
 ) -> GitHubRelease | None:
@@ -39,10 +39,19 @@ class TranslationSettings:
     from_lang: str
     proper_path: str
     max_workers: int
+    max_concurrent_requests: int
+    part_concurrency: int
+    token_budget: int
+    cost_budget: float
+    price_per_million_tokens: float
     translation_mode: str
     disambiguation_mode: str
     min_confidence: str
     prompt_format: str
+    prompt_layout: str
+    proper_match_mode: str
+    ac_backend: str
+    cache_dir: str
 
 
 @dataclass(frozen=True)
@@ -60,6 +69,12 @@ class FeatureConfig:
     fallback: bool
     debug_mode: bool
     dump: bool
+    translation_memory: bool
+    incremental: bool
+    adaptive_rate_limit: bool
+    dedup: bool
+    batch_small_files: bool
+    resume: bool
 
 
 @dataclass(frozen=True)
@@ -116,6 +131,15 @@ class AppConfig:
         retries = _integer(network, "retries", minimum=0, maximum=10)
 
         max_workers = _integer(translation, "max_workers", minimum=1, maximum=32)
+        max_concurrent_requests = _integer(
+            translation, "max_concurrent_requests", minimum=0, maximum=256
+        )
+        part_concurrency = _integer(translation, "part_concurrency", minimum=1, maximum=32)
+        token_budget = _integer(translation, "token_budget", minimum=0, maximum=10**12)
+        cost_budget = _non_negative_number(translation, "cost_budget")
+        price_per_million_tokens = _non_negative_number(translation, "price_per_million_tokens")
+        if cost_budget > 0 and price_per_million_tokens == 0:
+            raise ConfigError("设置 cost_budget 时 price_per_million_tokens 必须为正数")
         translation_mode = _choice(
             translation, "translation_mode", {"multi_stage", "single_stage"}
         )
@@ -128,6 +152,11 @@ class AppConfig:
         prompt_format = _choice(
             translation, "prompt_format", {"xml_json", "xml_xml", "json_json"}
         )
+        prompt_layout = _choice(translation, "prompt_layout", {"default", "cache"})
+        proper_match_mode = _choice(
+            translation, "proper_match_mode", {"all", "leftmost_longest", "longest_per_position"}
+        )
+        ac_backend = _choice(translation, "ac_backend", {"auto", "python", "pyahocorasick"})
 
         output_dir = _safe_name(publishing, "output_dir")
         asset_prefix = _safe_name(publishing, "asset_prefix")
@@ -156,10 +185,19 @@ class AppConfig:
                 from_lang=_string(translation, "from_lang"),
                 proper_path=_optional_string(translation, "proper_path"),
                 max_workers=max_workers,
+                max_concurrent_requests=max_concurrent_requests,
+                part_concurrency=part_concurrency,
+                token_budget=token_budget,
+                cost_budget=cost_budget,
+                price_per_million_tokens=price_per_million_tokens,
                 translation_mode=translation_mode,
                 disambiguation_mode=disambiguation_mode,
                 min_confidence=min_confidence,
                 prompt_format=prompt_format,
+                prompt_layout=prompt_layout,
+                proper_match_mode=proper_match_mode,
+                ac_backend=ac_backend,
+                cache_dir=_relative_path(translation, "cache_dir"),
             ),
             features=FeatureConfig(
                 enabled=_boolean(features, "enabled"),
@@ -175,6 +213,12 @@ class AppConfig:
                 fallback=_boolean(features, "fallback"),
                 debug_mode=_boolean(features, "debug_mode"),
                 dump=_boolean(features, "dump"),
+                translation_memory=_boolean(features, "translation_memory"),
+                incremental=_boolean(features, "incremental"),
+                adaptive_rate_limit=_boolean(features, "adaptive_rate_limit"),
+                dedup=_boolean(features, "dedup"),
+                batch_small_files=_boolean(features, "batch_small_files"),
+                resume=_boolean(features, "resume"),
             ),
             publishing=PublishingConfig(
                 zip=publish_zip,
@@ -239,6 +283,13 @@ def _positive_number(parent: dict[str, Any], key: str) -> float:
     return float(value)
 
 
+def _non_negative_number(parent: dict[str, Any], key: str) -> float:
+    value = parent.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ConfigError(f"{key} 必须是非负数")
+    return float(value)
+
+
 def _choice(parent: dict[str, Any], key: str, choices: set[str]) -> str:
     value = _string(parent, key)
     if value not in choices:
@@ -263,3 +314,11 @@ def _safe_name(parent: dict[str, Any], key: str) -> str:
     if Path(value).name != value or value in {".", ".."}:
         raise ConfigError(f"{key} 只能是单个安全文件名")
     return value
+
+
+def _relative_path(parent: dict[str, Any], key: str) -> str:
+    value = _string(parent, key)
+    path = Path(value)
+    if path.is_absolute() or ".." in path.parts:
+        raise ConfigError(f"{key} 必须是工作区内的相对路径")
+    return path.as_posix()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from translateFunc.config import FilePathConfig, PathConfig
+
+
+_logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_SCHEMA = 1
+_KEYWORD_FILE = "KR_BattleKeywords.json"
+_MODEL_FILE = "KR_ScenarioModelCodes-AutoCreated.json"
+
+
+def build_manifest(
+    *,
+    kr_root: Path,
+    jp_root: Path,
+    en_root: Path,
+    llc_root: Path,
+    config_fingerprint: str,
+) -> dict[str, Any]:
+    """为每个 KR 文件记录其 KR/JP/EN/LLC 输入的内容哈希。
+
+    技能文件依赖 BattleKeywords，剧情文件依赖 ScenarioModelCodes：
+    被依赖文件变化时，依赖方的条目也随之变化。
+    术语表内容与提示词模板由 config_fingerprint（TranslateConfig.fingerprint()）覆盖。
+    """
+    path_config = PathConfig(
+        llc_base_path=llc_root,
+        KR_base_path=kr_root,
+        JP_base_path=jp_root,
+        EN_base_path=en_root,
+    )
+    files: dict[str, dict[str, str]] = {}
+    for kr_file in sorted(kr_root.rglob("*.json")):
+        file_paths = FilePathConfig(kr_file, path_config, has_prefix=True)
+        files[file_paths.rel_path.as_posix()] = {
+            "kr": _file_hash(kr_file),
+            "jp": _file_hash(file_paths.JP_path),
+            "en": _file_hash(file_paths.EN_path),
+            "llc": _file_hash(file_paths.LLC_path),
+        }
+
+    keyword_hash = _entry_hash(files.get(_KEYWORD_FILE))
+    model_hash = _entry_hash(files.get(_MODEL_FILE))
+    for rel_path, entry in files.items():
+        path = Path(rel_path)
+        if path.parent.name == "StoryData":
+            entry["depends"] = model_hash
+        elif path.name.startswith("KR_Skills_"):
+            entry["depends"] = keyword_hash
+
+    return {
+        "schema": MANIFEST_SCHEMA,
+        "config": config_fingerprint,
+        "files": files,
+    }
+
+
+def unchanged_files(
+    current: dict[str, Any], previous: dict[str, Any] | None
+) -> frozenset[str]:
+    """返回输入与上次运行完全一致、可直接复用输出的 KR 相对路径。"""
+    if not previous:
+        return frozenset()
+    if previous.get("schema") != MANIFEST_SCHEMA:
+        return frozenset()
+    if previous.get("config") != current.get("config"):
+        _logger.info("翻译配置已变化，不复用上次输出")
+        return frozenset()
+    previous_files = previous.get("files")
+    if not isinstance(previous_files, dict):
+        return frozenset()
+    return frozenset(
+        rel_path
+        for rel_path, entry in current["files"].items()
+        if previous_files.get(rel_path) == entry
+    )
+
+
+def without_files(manifest: dict[str, Any], file_names: set[str]) -> dict[str, Any]:
+    """移除结果不可复用（错误或回退）的文件条目，按输出文件名匹配。"""
+    files = {
+        rel_path: entry
+        for rel_path, entry in manifest["files"].items()
+        if _output_name(rel_path) not in file_names
+    }
+    return {**manifest, "files": files}
+
+
+def load_manifest(path: Path) -> dict[str, Any] | None:
+    if not path.is_file():
+        return None
+    try:
+        value = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        _logger.warning("无法读取上次运行的清单: %s", path, exc_info=True)
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def write_manifest(manifest: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+
+def _file_hash(path: Path) -> str:
+    if not path.is_file():
+        return ""
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _entry_hash(entry: dict[str, str] | None) -> str:
+    if not entry:
+        return ""
+    raw = json.dumps(entry, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _output_name(rel_path: str) -> str:
+    name = Path(rel_path).name
+    return name[3:] if name.startswith("KR_") else name
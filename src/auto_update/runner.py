@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
 import json
 import logging
@@ -23,18 +24,52 @@ from auto_update.clients import (
     fetch_raw_status,
     find_release_for_token,
 )
-from auto_update.config import AppConfig
+from auto_update.config import AppConfig, TranslationSettings
+from auto_update.manifest import (
+    MANIFEST_NAME,
+    build_manifest,
+    load_manifest,
+    unchanged_files,
+    without_files,
+    write_manifest,
+)
 from auto_update.packaging import create_packages
 from auto_update.versioning import is_version_tag, next_version
 from translateFunc import PipelineSummary, TranslateConfig, TranslationPipeline
+from translateFunc.checkpoint import CHECKPOINT_NAME
+from translateFunc.config import glossary_digest
+from translateFunc.matcher.proper import ProperAnalyzer
+from translateFunc.sharding import (
+    PREPARE_BUNDLE,
+    SHARD_BUNDLE_NAME,
+    ShardSpec,
+    merge_bundles,
+)
 from translateFunc.diagnostics import safe_json_value
+from translateFunc.usage import latency_percentiles
 
 
 _logger = logging.getLogger(__name__)
 _SHANGHAI = timezone(timedelta(hours=8), "Asia/Shanghai")
+SHARD_BUNDLES_DIR = "shard-bundles"
+THROUGHPUT_NAME = "throughput.json"
+
 
+def run(
+    project_root: Path,
+    config: AppConfig,
+    *,
+    prepare: bool = False,
+    shard: ShardSpec | None = None,
+    merge: bool = False,
+    dry_run: bool = False,
+) -> None:
+    """执行一次自动更新。
 
-def run(project_root: Path, config: AppConfig) -> None:
+    prepare / shard 只生成分片结果到 shard-bundles/ 下，不打包发布；
+    merge 合并 shard-bundles/ 中的全部结果后按正常流程打包发布；
+    dry_run 不调用 LLM，只把调用次数、token 数与预计耗时写入 run-summary.json。
+    """
     diagnostics_path = project_root / "run-summary.json"
     _write_actions_outputs(
         should_publish=False,
@@ -111,8 +146,14 @@ def run(project_root: Path, config: AppConfig) -> None:
 
     output_directory = project_root / config.publishing.output_dir
     assets_directory = project_root / "release-assets"
-    _remove_generated_path(project_root, output_directory)
-    _remove_generated_path(project_root, assets_directory)
+    if not dry_run:
+        _remove_generated_path(project_root, output_directory)
+        _remove_generated_path(project_root, assets_directory)
+
+    cache_root = project_root / config.translation.cache_dir
+    work_root = None
+    if config.features.resume and not dry_run:
+        work_root = _prepare_work_dir(cache_root / "work", raw_status.token)
 
     with tempfile.TemporaryDirectory(prefix="lcta-auto-update-") as temp_name:
         temporary_root = Path(temp_name)
@@ -122,16 +163,104 @@ def run(project_root: Path, config: AppConfig) -> None:
         cooked_root = _download_cooked_source(
             github, cooked_release, temporary_root
         )
-        summary, staged_output = _run_translation(
+        translate_config = _build_translate_config(
             config,
             raw_paths=raw_paths,
             cooked_root=cooked_root,
             temporary_root=temporary_root,
+            cache_root=cache_root,
+            work_root=work_root,
+            require_api_key=not (merge or dry_run),
+        )
+        if dry_run:
+            translate_config = replace(translate_config, dry_run=True)
+        translate_config = _snapshot_glossary(translate_config, temporary_root)
+        manifest = build_manifest(
+            kr_root=raw_paths["kr"],
+            jp_root=raw_paths["jp"],
+            en_root=raw_paths["en"],
+            llc_root=cooked_root / "LLC_zh-CN",
+            config_fingerprint=translate_config.fingerprint(),
         )
+        incremental: dict[str, Any] = {"previous_release": None, "reusable_files": 0}
+        if config.features.incremental and not merge:
+            previous = _download_previous_output(
+                github, own_releases, config, temporary_root
+            )
+            if previous is not None:
+                previous_release, previous_root, previous_manifest = previous
+                reusable = unchanged_files(manifest, previous_manifest)
+                translate_config = replace(
+                    translate_config,
+                    reuse_output_dir=previous_root,
+                    reuse_files=reusable,
+                )
+                incremental = {
+                    "previous_release": previous_release.tag_name,
+                    "reusable_files": len(reusable),
+                }
+                _logger.info(
+                    "增量模式: 上次 Release %s，%d/%d 个文件输入未变化",
+                    previous_release.tag_name,
+                    len(reusable),
+                    len(manifest["files"]),
+                )
+        if merge:
+            staged_output = temporary_root / "merged" / "LLc-CN-LCTA"
+            bundle_roots = _find_bundles(project_root / SHARD_BUNDLES_DIR)
+            _logger.info("合并 %d 个分片结果", len(bundle_roots))
+            summary = merge_bundles(
+                bundle_roots,
+                staged_output,
+                expected_config=manifest["config"],
+            )
+        else:
+            if prepare:
+                translate_config = replace(translate_config, prepare_only=True)
+            elif shard is not None:
+                prepared = project_root / SHARD_BUNDLES_DIR / PREPARE_BUNDLE
+                translate_config = replace(
+                    translate_config,
+                    shard_index=shard.index,
+                    shard_count=shard.count,
+                    prepared_dir=prepared if prepared.is_dir() else None,
+                )
+            summary, staged_output = _run_translation(translate_config)
+        if dry_run:
+            diagnostics_path.write_text(
+                json.dumps(
+                    _estimate_data(
+                        summary,
+                        raw_token=raw_status.token,
+                        version=version,
+                        incremental=incremental,
+                    ),
+                    ensure_ascii=False,
+                    indent=2,
+                ),
+                encoding="utf-8",
+            )
+            _logger.info("dry run 完成，预估结果已写入 %s", diagnostics_path)
+            return
         dump_file = temporary_root / "translation-dump.jsonl"
         if dump_file.is_file():
             shutil.copy2(dump_file, project_root / dump_file.name)
-        if not any(staged_output.rglob("*.json")):
+        if prepare or shard is not None:
+            bundle = project_root / SHARD_BUNDLES_DIR / (
+                PREPARE_BUNDLE if prepare else shard.name
+            )
+            _remove_generated_path(project_root, bundle)
+            bundle.parent.mkdir(parents=True, exist_ok=True)
+            (staged_output / CHECKPOINT_NAME).unlink(missing_ok=True)
+            shutil.move(str(staged_output), str(bundle))
+            _logger.info("分片结果已写入 %s", bundle)
+            if work_root is not None:
+                shutil.rmtree(work_root, ignore_errors=True)
+            return
+        if not any(
+            path.relative_to(staged_output).parts[0] != "Info"
+            for path in staged_output.rglob("*.json")
+        ):
             raise RuntimeError("翻译管线没有生成任何 JSON 文件")
         _write_package_info(
             staged_output,
@@ -144,8 +273,19 @@ def run(project_root: Path, config: AppConfig) -> None:
                 "generated_at": datetime.now(timezone.utc).isoformat(),
             },
         )
+        failed_names = {
+            outcome.file_name for outcome in summary.errors
+        } | set(summary.fallback)
+        write_manifest(
+            without_files(manifest, failed_names),
+            staged_output / "Info" / MANIFEST_NAME,
+        )
+        (staged_output / CHECKPOINT_NAME).unlink(missing_ok=True)
         shutil.move(str(staged_output), str(output_directory))
 
+    if work_root is not None:
+        shutil.rmtree(work_root, ignore_errors=True)
+
     version_info = json.loads(
         (output_directory / "Info" / "version.json").read_text(encoding="utf-8")
     )
@@ -155,6 +295,7 @@ def run(project_root: Path, config: AppConfig) -> None:
         version_info=version_info,
         manual_run=manual_run,
         overwritten_release=bool(manual_run and matching_release),
+        incremental=incremental,
     )
     diagnostics_path.write_text(
         json.dumps(summary_data, ensure_ascii=False, indent=2),
@@ -209,23 +350,64 @@ def _download_cooked_source(
     return find_repository_root(extracted, "LLC_zh-CN")
 
 
-def _run_translation(
+def _download_previous_output(
+    github: GitHubClient,
+    releases: list[GitHubRelease],
+    config: AppConfig,
+    temporary_root: Path,
+) -> tuple[GitHubRelease, Path, dict[str, Any]] | None:
+    previous_release = next(
+        (release for release in releases if is_version_tag(release.tag_name)),
+        None,
+    )
+    if previous_release is None:
+        return None
+    asset_name = f"{config.publishing.asset_prefix}-{previous_release.tag_name}.zip"
+    asset = previous_release.find_asset(asset_name)
+    if asset is None:
+        _logger.info("上次 Release %s 没有 %s，执行完整翻译", previous_release.tag_name, asset_name)
+        return None
+    try:
+        archive_path = temporary_root / "downloads" / "previous.zip"
+        github.download_release_asset(asset, archive_path)
+        extracted = temporary_root / "previous"
+        extract_zip_safely(archive_path, extracted)
+        previous_root = find_named_directory(extracted, config.publishing.output_dir)
+    except Exception:
+        _logger.warning("下载上次 Release 输出失败，执行完整翻译", exc_info=True)
+        return None
+    previous_manifest = load_manifest(previous_root / "Info" / MANIFEST_NAME)
+    if previous_manifest is None:
+        _logger.info("上次 Release %s 没有输入清单，执行完整翻译", previous_release.tag_name)
+        return None
+    return previous_release, previous_root, previous_manifest
+
+
+def _build_translate_config(
     config: AppConfig,
     *,
     raw_paths: dict[str, Path],
     cooked_root: Path,
     temporary_root: Path,
-) -> tuple[PipelineSummary, Path]:
+    cache_root: Path,
+    work_root: Path | None = None,
+    require_api_key: bool = True,
+) -> TranslateConfig:
     api_settings = dict(config.translation.api)
     api_key = os.getenv(config.translation.api_key_env, "")
-    if config.translation.translator_name == "LLM通用翻译服务" and not api_key:
+    if (
+        require_api_key
+        and config.translation.translator_name == "LLM通用翻译服务"
+        and not api_key
+    ):
         raise RuntimeError(
             f"缺少翻译 API key 环境变量: {config.translation.api_key_env}"
         )
     if api_key:
         api_settings["api_key"] = api_key
 
-    pipeline_output_root = temporary_root / "pipeline-output"
+    # 提供持久工作目录时管线输出写在其中，中断后重跑同一 raw token 可按断点日志续跑
+    pipeline_output_root = (work_root or temporary_root) / "pipeline-output"
     dump_path = temporary_root / "translation-dump.jsonl"
     translate_config = TranslateConfig(
         translator_name=config.translation.translator_name,
@@ -238,6 +420,11 @@ def _run_translation(
         enable_skill=config.features.enable_skill,
         enable_dev_settings=True,
         max_workers=config.translation.max_workers,
+        max_concurrent_requests=config.translation.max_concurrent_requests,
+        part_concurrency=config.translation.part_concurrency,
+        adaptive_rate_limit=config.features.adaptive_rate_limit,
+        batch_small_files=config.features.batch_small_files,
+        token_budget=_token_budget(config.translation),
         enable_concurrent=config.features.enable_concurrent,
         translation_mode=config.translation.translation_mode,
         enable_self_check=config.features.enable_self_check,
@@ -245,10 +432,20 @@ def _run_translation(
         disambiguation_mode=config.translation.disambiguation_mode,
         min_confidence=config.translation.min_confidence,
         prompt_format=config.translation.prompt_format,
+        prompt_layout=config.translation.prompt_layout,
+        proper_match_mode=config.translation.proper_match_mode,
+        ac_backend=config.translation.ac_backend,
         enable_thinking=config.features.enable_thinking,
         debug_mode=config.features.debug_mode,
         dump=config.features.dump,
         dump_path=dump_path if config.features.dump else None,
+        translation_memory=config.features.translation_memory,
+        dedup=config.features.dedup,
+        translation_memory_path=cache_root / "translation-memory.sqlite3",
+        throughput_path=cache_root / THROUGHPUT_NAME,
+        automaton_cache_dir=cache_root / "automata",
+        entry_index=config.features.incremental,
+        checkpoint=work_root is not None,
         fallback=config.features.fallback,
         has_prefix=True,
         from_lang=config.translation.from_lang,
@@ -257,10 +454,68 @@ def _run_translation(
         en_path=str(raw_paths["en"]),
         llc_path=str(cooked_root / "LLC_zh-CN"),
     )
+    return translate_config
+
+
+def _snapshot_glossary(translate_config: TranslateConfig, temporary_root: Path) -> TranslateConfig:
+    """先获取术语表并固定为本地快照，清单指纹与本次翻译使用同一份术语内容。"""
+    if not translate_config.enable_proper:
+        return translate_config
+    terms = ProperAnalyzer().fetch_terms(
+        auto_fetch=translate_config.auto_fetch_proper,
+        proper_path=translate_config.proper_path,
+    )
+    snapshot = temporary_root / "proper-terms.json"
+    snapshot.write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+    _logger.info("术语表快照: %d 个术语", len(terms))
+    return replace(
+        translate_config,
+        auto_fetch_proper=False,
+        proper_path=str(snapshot),
+        glossary_digest=glossary_digest(terms),
+    )
+
+
+def _token_budget(settings: TranslationSettings) -> int:
+    """合并 token 预算与金额预算，返回 token 上限；0 表示不限制。"""
+    budgets = []
+    if settings.token_budget > 0:
+        budgets.append(settings.token_budget)
+    if settings.cost_budget > 0:
+        budgets.append(int(settings.cost_budget / settings.price_per_million_tokens * 1_000_000))
+    return max(min(budgets), 1) if budgets else 0
+
+
+def _find_bundles(bundles_root: Path) -> list[Path]:
+    """返回 bundles_root 下全部含分片信息的目录。"""
+    if not bundles_root.is_dir():
+        raise RuntimeError(f"未找到分片结果目录: {bundles_root}")
+    return sorted(
+        path for path in bundles_root.iterdir()
+        if (path / "Info" / SHARD_BUNDLE_NAME).is_file()
+    )
+
+
+def _prepare_work_dir(work_base: Path, raw_token: str) -> Path:
+    """返回 raw token 对应的持久工作目录，并清理其他 token 的残留目录。"""
+    if work_base.is_dir():
+        for stale in work_base.iterdir():
+            if stale.name != raw_token:
+                shutil.rmtree(stale, ignore_errors=True)
+    work_root = work_base / raw_token
+    if work_root.is_dir():
+        _logger.info("发现 raw token %s 的未完成工作目录，将断点续跑", raw_token)
+    work_root.mkdir(parents=True, exist_ok=True)
+    return work_root
+
+
+def _run_translation(
+    translate_config: TranslateConfig,
+) -> tuple[PipelineSummary, Path]:
     pipeline = TranslationPipeline(translate_config)
     pipeline.set_callbacks(on_log=_logger.info)
     summary = pipeline.run()
-    return summary, pipeline_output_root / "LLc-CN-LCTA"
+    return summary, translate_config.output_dir / "LLc-CN-LCTA"
 
 
 def _write_package_info(
@@ -285,12 +540,22 @@ def _summary_data(
     version_info: dict[str, str],
     manual_run: bool,
     overwritten_release: bool,
+    incremental: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     return {
         "status": "completed_with_issues" if summary.errors else "completed",
         **version_info,
         "manual_run": manual_run,
         "overwritten_release": overwritten_release,
+        "incremental": incremental or {},
+        "budget": {
+            **summary.budget,
+            "degradations": summary.degradations,
+        },
+        "usage": {
+            **summary.usage,
+            "latency": latency_percentiles(summary.latencies),
+        },
         "translation": {
             "total": summary.total,
             "saved": summary.success_count,
@@ -309,6 +574,28 @@ def _summary_data(
     }
 
 
+def _estimate_data(
+    summary: PipelineSummary,
+    *,
+    raw_token: str,
+    version: str,
+    incremental: dict[str, Any],
+) -> dict[str, Any]:
+    return {
+        "status": "dry_run",
+        "raw_token": raw_token,
+        "version": version,
+        "incremental": incremental,
+        "files": {
+            "total": summary.total,
+            "to_translate": summary.estimate.get("files", 0),
+            "skipped": len(summary.skipped) - summary.estimate.get("files", 0),
+            "errors": summary.error_count,
+        },
+        "estimate": summary.estimate,
+    }
+
+
 def _build_release_note(summary: dict[str, Any]) -> str:
     translation = summary["translation"]
     metadata = build_release_metadata(
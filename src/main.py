@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 from pathlib import Path
@@ -13,6 +14,7 @@ if str(SOURCE_ROOT) not in sys.path:
 
 from auto_update.config import AppConfig
 from auto_update.runner import run
+from translateFunc.sharding import ShardSpec
 
 
 def configure_logging() -> None:
@@ -35,14 +37,56 @@ def configure_logging() -> None:
     root_logger.addHandler(console_handler)
 
 
-def main() -> int:
+def _shard_spec(text: str) -> ShardSpec:
+    try:
+        return ShardSpec.parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LCTA 自动更新")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--prepare",
+        action="store_true",
+        help="只处理优先文件，结果供各分片复用",
+    )
+    mode.add_argument(
+        "--shard",
+        type=_shard_spec,
+        metavar="I/N",
+        help="只处理第 I 片（共 N 片）的文件",
+    )
+    mode.add_argument(
+        "--merge",
+        action="store_true",
+        help="合并 shard-bundles/ 中的分片结果并打包发布",
+    )
+    mode.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="不调用 LLM，只预估调用次数、token 数与耗时并写入 run-summary.json",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
     configure_logging()
     config_path = Path(
         os.getenv("LCTA_CONFIG", str(SOURCE_ROOT / "config.yaml"))
     )
     try:
         config = AppConfig.load(config_path)
-        run(PROJECT_ROOT, config)
+        run(
+            PROJECT_ROOT,
+            config,
+            prepare=args.prepare,
+            shard=args.shard,
+            merge=args.merge,
+            dry_run=args.dry_run,
+        )
     except Exception:
         logging.getLogger(__name__).exception("自动更新失败")
         return 1
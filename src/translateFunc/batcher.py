@@ -0,0 +1,195 @@
+"""
+translateFunc/batcher.py
+RequestBatcher —— 把多个小文件的阶段 1 请求合并为一次 LLM 调用。
+
+UI / OTHER 类的小文件往往只有几个待翻译条目，却要各自承担完整的
+system prompt 与一次往返。同一文件类别、同一格式的小请求在短暂的
+聚合窗口内合并：
+  - 第一个到达的文件成为 leader，等待 linger 秒或批次写满后关闭批次，
+    用自己的 FileProcessor 发出合并后的请求
+  - 文本块按到达顺序拼接，id 连续编号；解析结果按 id 区间拆回各文件，
+    并重新编号为各文件内的 1..n
+  - 批次只有一个文件、调用失败或某文件没有拿到任何结果时，该文件
+    返回 None，按原有格式回退链单独请求，ProcessOutcome 语义不变
+  - 调用成功后每个文件（含未拿到结果的）都记录调用记录、自己的序号与
+    全部文件的文本块数，用于按块数分摊该次调用的用量
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Callable
+
+_logger = logging.getLogger("LCTA")
+
+# 聚合窗口（秒）；远小于一次 LLM 往返
+DEFAULT_LINGER_SECONDS = 0.05
+
+
+@dataclass
+class BatchItem:
+    """一个文件提交的阶段 1 分片。"""
+    owner: str
+    request: dict
+    length: int
+    parsed: list[dict] | None = None
+    record: dict | None = None
+    leader: str = ""
+    batch_index: int = 0                                    # 本文件在批次中的序号
+    batch_sizes: list[int] = field(default_factory=list)    # 批次内各文件的文本块数
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass
+class _Batch:
+    items: list[BatchItem] = field(default_factory=list)
+    length: int = 0
+    full: threading.Event = field(default_factory=threading.Event)
+
+
+def merge_requests(requests: list[dict]) -> dict:
+    """合并多个分片请求：拼接文本块，引用按术语 / id 去重后合并。"""
+    proper_terms: dict[str, dict] = {}
+    affects: dict[str, dict] = {}
+    models: dict[str, dict] = {}
+    text_blocks: list[dict] = []
+    for request in requests:
+        reference = request.get("reference", {})
+        for term in reference.get("proper_terms", []):
+            proper_terms.setdefault(term.get("term", ""), term)
+        for affect in reference.get("affects", []):
+            affects.setdefault(affect.get("id", ""), affect)
+        for model in reference.get("models", []):
+            models.setdefault(str(model.get("id", model)), model)
+        text_blocks.extend(request.get("text_blocks", []))
+    return {
+        "metadata": {
+            **requests[0].get("metadata", {}),
+            "total_text_blocks": len(text_blocks),
+            "batched_files": len(requests),
+        },
+        "reference": {
+            "proper_terms": list(proper_terms.values()),
+            "affects": list(affects.values()),
+            "models": list(models.values()),
+            "model_docs": [],
+            "skill_doc": "",
+        },
+        "text_blocks": text_blocks,
+    }
+
+
+def split_results(parsed: list, sizes: list[int]) -> list[list[dict]]:
+    """按文本块数把合并结果的全局 id 拆回各文件，并重新编号为 1..n。"""
+    offsets = []
+    total = 0
+    for size in sizes:
+        offsets.append(total)
+        total += size
+    routed: list[list[dict]] = [[] for _ in sizes]
+    for item in parsed or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            global_id = int(item.get("id", 0))
+        except (TypeError, ValueError):
+            continue
+        for index, (offset, size) in enumerate(zip(offsets, sizes)):
+            if offset < global_id <= offset + size:
+                routed[index].append({**item, "id": global_id - offset})
+                break
+    return routed
+
+
+class RequestBatcher:
+    """线程安全的小请求聚合器。key 相同的请求才会合并。"""
+
+    def __init__(
+        self,
+        *,
+        max_length: int = 20000,
+        max_blocks: int = 20,
+        linger: float = DEFAULT_LINGER_SECONDS,
+    ):
+        self._max_length = max_length
+        self._max_blocks = max_blocks
+        self._linger = linger
+        self._lock = threading.Lock()
+        self._open: dict[tuple, _Batch] = {}
+        self.batches = 0        # 实际发出的合并请求数
+        self.batched_files = 0  # 通过合并请求翻译的文件分片数
+
+    def accepts(self, request: dict, length: int) -> bool:
+        """只合并文本块少、渲染长度不超过上限一半的分片。"""
+        return (
+            len(request.get("text_blocks", [])) <= self._max_blocks
+            and length <= self._max_length // 2
+        )
+
+    def submit(
+        self,
+        key: tuple,
+        item: BatchItem,
+        execute: Callable[[dict], tuple[list, dict]],
+    ) -> BatchItem:
+        """提交分片并阻塞到批次完成。
+
+        execute 只在 leader 线程调用：参数为合并后的请求，返回 (解析结果, 调用记录)。
+        返回的 item.parsed 为 None 时调用方应单独请求。
+        """
+        with self._lock:
+            batch = self._open.get(key)
+            if batch is not None and batch.length + item.length > self._max_length:
+                batch.full.set()
+                batch = None
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._open[key] = batch
+            batch.items.append(item)
+            batch.length += item.length
+            if batch.length >= self._max_length * 0.9:
+                batch.full.set()
+
+        if not leader:
+            item.done.wait()
+            return item
+
+        batch.full.wait(self._linger)
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+        self._run(batch, execute)
+        return item
+
+    def _run(self, batch: _Batch, execute: Callable[[dict], tuple[list, dict]]) -> None:
+        items = batch.items
+        try:
+            if len(items) < 2:
+                return
+            parsed, record = execute(merge_requests([item.request for item in items]))
+            sizes = [len(item.request.get("text_blocks", [])) for item in items]
+            routed = split_results(parsed, sizes)
+            with self._lock:
+                self.batches += 1
+            for index, (item, results) in enumerate(zip(items, routed)):
+                item.record = record
+                item.leader = items[0].owner
+                item.batch_index = index
+                item.batch_sizes = sizes
+                if results:
+                    item.parsed = results
+                    with self._lock:
+                        self.batched_files += 1
+        except Exception as e:
+            # 合并请求失败：全部文件按原流程单独请求
+            _logger.warning(f"合并请求失败 ({e})，{len(items)} 个文件改为单独请求")
+            for item in items:
+                item.parsed = None
+        finally:
+            for item in items:
+                item.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"batches": self.batches, "batched_files": self.batched_files}
@@ -0,0 +1,113 @@
+"""
+translateFunc/budget.py
+RunBudget —— 整次运行共享的 token 预算。
+
+每次 AI 调用前由 FileProcessor._call_ai 检查并预留估算的 token 数（check 与预留在同一把锁内，
+并发调用不会同时越过上限），调用后结算：响应带 usage 时按服务商返回的实际用量
+（含推理 token）记账，否则按字符估算记账，并释放预留。
+接近上限时逐级降级，而不是中止整次运行：
+  1. 已用达到 soft_ratio：停用可选阶段（阶段 0 消歧、阶段 2 自校验、P1-2 补充翻译）
+  2. 已用达到上限：不再开始新文件，也不再发出新的阶段 1 请求，
+     受影响的文件通过 _save_except 回退保存
+每个降级步骤只记录一次，写入 PipelineSummary.degradations。
+"""
+from __future__ import annotations
+from datetime import datetime
+import logging
+import threading
+
+_logger = logging.getLogger("LCTA")
+
+# 预算紧张时停用的可选阶段
+OPTIONAL_STAGES = frozenset({"stage_0", "stage_2", "p1_2"})
+
+STEP_DROP_OPTIONAL = "drop_optional_stages"
+STEP_STOP_NEW_FILES = "stop_new_files"
+
+
+class BudgetExhausted(RuntimeError):
+    """预算已用尽，拒绝发出新的 AI 调用。"""
+
+
+class RunBudget:
+    """线程安全的 token 预算与降级状态。"""
+
+    def __init__(self, limit_tokens: int, *, soft_ratio: float = 0.8):
+        if limit_tokens < 1:
+            raise ValueError("limit_tokens 必须为正整数")
+        if not 0 < soft_ratio <= 1:
+            raise ValueError("soft_ratio 必须位于 (0, 1] 之间")
+        self._limit = limit_tokens
+        self._soft_limit = int(limit_tokens * soft_ratio)
+        self._spent = 0
+        self._reserved = 0  # 已通过检查、尚未结算的调用预留的 token
+        self._lock = threading.Lock()
+        self.degradations: list[dict] = []
+        # 因预算跳过的调用（按阶段）与回退保存的文件数
+        self.skipped: dict[str, int] = {}
+
+    @property
+    def spent(self) -> int:
+        return self._spent
+
+    @property
+    def optional_allowed(self) -> bool:
+        return self._spent < self._soft_limit
+
+    @property
+    def exhausted(self) -> bool:
+        return self._spent >= self._limit
+
+    def allows(self, stage: str) -> bool:
+        """返回 stage 当前是否还能发出调用（已用加预留计入）；不允许时计入 skipped。"""
+        with self._lock:
+            return self._admit(stage, 0)
+
+    def check(self, stage: str, reserve: int = 0) -> None:
+        """检查 stage 能否发出调用并预留 reserve 个 token；调用结束后须以 charge() 结算。"""
+        with self._lock:
+            if self._admit(stage, reserve):
+                return
+        raise BudgetExhausted(
+            f"token 预算不足（已用 {self._spent}/{self._limit}），跳过 {stage} 调用"
+        )
+
+    def _admit(self, stage: str, reserve: int) -> bool:
+        committed = self._spent + self._reserved
+        if committed >= self._limit or (
+            stage in OPTIONAL_STAGES and committed >= self._soft_limit
+        ):
+            self.skipped[stage] = self.skipped.get(stage, 0) + 1
+            return False
+        self._reserved += reserve
+        return True
+
+    def charge(self, tokens: int, reserved: int = 0) -> None:
+        """结算一次调用：释放 check() 预留的 reserved，记账实际消耗的 tokens，越过阈值时记录降级步骤。"""
+        with self._lock:
+            self._reserved = max(self._reserved - reserved, 0)
+            before = self._spent
+            self._spent += tokens
+            if before < self._soft_limit <= self._spent:
+                self._degrade(STEP_DROP_OPTIONAL)
+            if before < self._limit <= self._spent:
+                self._degrade(STEP_STOP_NEW_FILES)
+
+    def _degrade(self, step: str) -> None:
+        self.degradations.append({
+            "step": step,
+            "spent_tokens": self._spent,
+            "limit_tokens": self._limit,
+            "at": datetime.now().isoformat(),
+        })
+        _logger.warning(
+            f"token 预算已用 {self._spent}/{self._limit}，降级: {step}"
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit_tokens": self._limit,
+                "spent_tokens": self._spent,
+                "skipped": dict(self.skipped),
+            }
@@ -380,6 +380,7 @@ class PromptFactory:
         prompt_format: str = "xml_json",
         *,
         examples: list[dict] | None = None,
+        skill_doc: str = "",
     ) -> str:
         """为给定文件类型、阶段和格式构建系统提示词。
 
@@ -388,15 +389,19 @@ class PromptFactory:
             stage: 0（消歧）、1（翻译）、2（自校验）
             prompt_format: "xml_json" | "xml_xml" | "json_json"
             examples: 可选的 few-shot 示例
+            skill_doc: 可选的技能翻译指南（静态文本，放入系统提示词以利于前缀缓存）
         """
-        return self._build_system_prompt(file_type, stage, prompt_format, examples=examples)
+        return self._build_system_prompt(
+            file_type, stage, prompt_format, examples=examples, skill_doc=skill_doc,
+        )
 
     def _build_system_prompt(
         self, file_type: FileType, stage: int, prompt_format: str, *,
         examples: list[dict] | None = None,
+        skill_doc: str = "",
     ) -> str:
         """构建系统提示词：
-        role → translation_rules → format_rules → examples → output_format
+        role → translation_rules → format_rules → examples → skill_reference → output_format
 
         rules 带 priority 标记，reasoning 在 translation 之前。
         format_rules 按响应格式（JSON/XML）选择，避免转义指令混淆。
@@ -448,7 +453,15 @@ class PromptFactory:
         elif examples and is_json:
             parts.append(self._render_examples_json(examples))
 
-        # 5. Output Format (last, as concrete instruction)
+        # 5. Skill Reference（可选，静态文本）
+        if skill_doc:
+            if is_json:
+                import json as _json
+                parts.append(_json.dumps({"skill_reference": skill_doc}, ensure_ascii=False, indent=2) + "\n")
+            else:
+                parts.append(f"<skill_reference>\n{skill_doc}\n</skill_reference>\n")
+
+        # 6. Output Format (last, as concrete instruction)
         if is_json:
             if stage == 0:
                 parts.append(self._JSON_STAGE0_FORMAT)
@@ -4,15 +4,17 @@ RequestBuilder —— 从扁平化文本数据构建结构化翻译请求。
 """
 from __future__ import annotations
 from contextlib import suppress
-from copy import deepcopy
 import json
 import logging
+import time
 from typing import Any, Optional
 
 logger = logging.getLogger("LCTA")  # 与 LogManager 一致，确保日志正确路由到 app.log
 
 from translateFunc.enums import FileType
 from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.memory import TranslationMemory
+from translateFunc.dedup import SharedTranslations
 import translateFunc.translate_doc as translate_doc
 
 EMPTY_TEXT = {'', '-'}
@@ -30,6 +32,12 @@ class RequestBuilder:
         is_skill: bool = False,
         max_length: int = 20000,
         file_type: FileType = FileType.OTHER,
+        memory: "TranslationMemory | None" = None,
+        memory_context: str = "",
+        shared: "SharedTranslations | None" = None,
+        shared_owner: str = "",
+        wait_shared: bool = True,
+        prompt_layout: str = "default",
     ):
         self.kr_text = request_text["kr"]
         self.jp_text = request_text.get("jp", {})
@@ -39,9 +47,27 @@ class RequestBuilder:
         self.is_skill = is_skill
         self.max_length = max_length
         self.file_type = file_type
+        self._memory = memory
+        self._memory_context = memory_context
+        # "cache"：引用按确定顺序排列，静态技能指南由系统提示词承载
+        self.prompt_layout = prompt_layout
         # 构建状态
         self.unified_request: dict | None = None
         self.split_requests: list[dict] = []
+        # 翻译记忆：非空位置序号 → 命中的译文；memory_keys 与 text_blocks 一一对应
+        self.memory_hits: dict[int, str] = {}
+        self.memory_keys: list[str] = []
+        # 运行内去重：shared_hits 为其他文件已翻译的位置；shared_keys 与 text_blocks
+        # 一一对应，当前文件为所有者时为去重键，否则为空字符串
+        self._shared = shared
+        self._shared_owner = shared_owner
+        self._wait_shared = wait_shared
+        self.shared_hits: dict[int, str] = {}
+        self.shared_keys: list[str] = []
+        # 其他文件认领、尚未取得译文的位置 → (去重键, 条目序号, 路径)，由 resolve_shared() 处理；
+        # shared_unresolved 为所有者未能提供译文、待补译的位置 → (条目序号, 路径)
+        self.shared_pending: dict[int, tuple[str, Any, tuple]] = {}
+        self.shared_unresolved: dict[int, tuple[Any, tuple]] = {}
 
     # ========== 构建 ==========
 
@@ -55,6 +81,14 @@ class RequestBuilder:
         all_proper_terms: dict[str, dict] = {}
         all_affects: dict[str, dict] = {}
         all_models: dict[str, dict] = {}
+        self.memory_hits = {}
+        self.memory_keys = []
+        self.shared_hits = {}
+        self.shared_keys = []
+        self.shared_pending = {}
+        self.shared_unresolved = {}
+        foreign_keys = self._claim_shared()
+        position = -1
 
         for idx in self.kr_text:
             kr_item = self.kr_text.get(idx, {})
@@ -69,42 +103,56 @@ class RequestBuilder:
 
                 if kr_text_val in EMPTY_TEXT and jp_text_val in EMPTY_TEXT and en_text_val in EMPTY_TEXT:
                     continue
+                position += 1
 
                 text_block: dict[str, Any] = {
                     "kr": kr_text_val,
                     "jp": jp_text_val,
                     "en": en_text_val,
                 }
-
-                # 匹配专有名词
-                match_result = self._engine.match_all(kr_text_val)
+                shared_key = ""
+                if self._shared is not None:
+                    shared_key = self._shared.make_key(self.file_type, text_block)
+                    if shared_key in foreign_keys:
+                        # 不在构建时等待所有者：先发送本文件其余文本块，译文由 resolve_shared() 取回；
+                        # dry run 不等待，所有者会翻译，这里按命中计
+                        if self._wait_shared:
+                            self.shared_pending[position] = (shared_key, idx, path_tuple)
+                        else:
+                            self.shared_hits[position] = ""
+                        continue
+                block_terms: dict[str, dict] = {}
+                block_affects: dict[str, dict] = {}
+                block_models: dict[str, dict] = {}
+
+                # 匹配专有名词；JP/EN 参考用于过滤韩文状态效果名的误匹配
+                match_result = self._engine.match_all(
+                    kr_text_val,
+                    jp_text=jp_text_val if isinstance(jp_text_val, str) else "",
+                    en_text=en_text_val if isinstance(en_text_val, str) else "",
+                )
                 if match_result.proper_matches:
                     text_block["proper_refs"] = []
                     for m in match_result.proper_matches:
                         if m.data:
                             term_data = m.data if isinstance(m.data, dict) else {"term": m.pattern}
                             term_key = term_data.get("term", m.pattern)
-                            if term_key not in all_proper_terms:
-                                all_proper_terms[term_key] = term_data
+                            block_terms.setdefault(term_key, term_data)
                             text_block["proper_refs"].append(term_key)
                         else:
-                            if m.pattern not in all_proper_terms:
-                                all_proper_terms[m.pattern] = {"term": m.pattern, "translation": ""}
+                            block_terms.setdefault(m.pattern, {"term": m.pattern, "translation": ""})
                             text_block["proper_refs"].append(m.pattern)
 
                 # 匹配状态效果
                 affect_matches = match_result.affect_id_matches + match_result.affect_name_matches
                 if affect_matches:
                     text_block["affect_refs"] = []
-                    seen_affects: set[str] = set()
                     for m in affect_matches:
                         if m.data and isinstance(m.data, dict):
                             aff_id = m.data.get("id", "")
-                            if aff_id not in seen_affects:
-                                seen_affects.add(aff_id)
+                            if aff_id not in block_affects:
+                                block_affects[aff_id] = m.data
                                 text_block["affect_refs"].append(f'[{aff_id}]')
-                                if aff_id not in all_affects:
-                                    all_affects[aff_id] = m.data
 
                 # 匹配角色（仅剧情文件）
                 if self.is_story:
@@ -118,10 +166,43 @@ class RequestBuilder:
                         if model:
                             model_info = self._engine.role_by_id.get(model)
                             if model_info is not None:
-                                all_models[model] = model_info
+                                block_models[model] = model_info
                                 text_block["model"] = model
 
+                # 查询翻译记忆：命中的文本块不进入请求，引用也不计入 reference
+                memory_key = ""
+                if self._memory is not None:
+                    memory_key = self._memory.make_key(
+                        text_block,
+                        {
+                            "proper_terms": list(block_terms.values()),
+                            "affects": list(block_affects.values()),
+                            "models": list(block_models.values()),
+                        },
+                        self._memory_context,
+                    )
+                    cached = self._memory.get(memory_key)
+                    if cached is not None:
+                        self.memory_hits[position] = cached
+                        if shared_key:
+                            self._shared.publish(shared_key, cached)
+                        continue
+
+                for term_key, term_data in block_terms.items():
+                    all_proper_terms.setdefault(term_key, term_data)
+                for aff_id, aff_data in block_affects.items():
+                    all_affects.setdefault(aff_id, aff_data)
+                all_models.update(block_models)
+
                 text_items.append(text_block)
+                self.memory_keys.append(memory_key)
+                self.shared_keys.append(shared_key)
+
+        if self.prompt_layout == "cache":
+            # 匹配顺序随文本变化；按键排序使相同引用集合渲染出相同字节
+            all_proper_terms = dict(sorted(all_proper_terms.items(), key=lambda item: str(item[0])))
+            all_affects = dict(sorted(all_affects.items(), key=lambda item: str(item[0])))
+            all_models = dict(sorted(all_models.items(), key=lambda item: str(item[0])))
 
         # 构建统一请求
         self.unified_request = {
@@ -130,6 +211,8 @@ class RequestBuilder:
                 "proper_terms_count": len(all_proper_terms),
                 "affects_count": len(all_affects),
                 "models_count": len(all_models),
+                "memory_hits": len(self.memory_hits),
+                "shared_hits": len(self.shared_hits),
                 "file_type": self.file_type.name,
             },
             "reference": {
@@ -269,19 +352,73 @@ class RequestBuilder:
         import json as _json
         return _json.dumps(request_data, indent=2, ensure_ascii=False)
 
+    def _claim_shared(self) -> set[str]:
+        """一次性认领本文件全部文本块的去重键，返回已由其他文件认领的键。"""
+        if self._shared is None:
+            return set()
+        keys = []
+        for idx in self.kr_text:
+            kr_item = self.kr_text.get(idx, {})
+            jp_item = self.jp_text.get(idx, {})
+            en_item = self.en_text.get(idx, {})
+            for path_tuple, kr_val in kr_item.items():
+                block = {
+                    "kr": kr_val,
+                    "jp": jp_item.get(path_tuple, ""),
+                    "en": en_item.get(path_tuple, ""),
+                }
+                if not all(value in EMPTY_TEXT for value in block.values()):
+                    keys.append(self._shared.make_key(self.file_type, block))
+        return self._shared.claim(self._shared_owner, keys)
+
+    def resolve_shared(self, timeout: float) -> dict:
+        """等待其他文件发布 shared_pending 中的译文，取得的译文并入 shared_hits。
+
+        Args:
+            timeout: 全部等待的总时长上限（秒）
+
+        Returns:
+            所有者未能提供译文的文本块组成的请求文本（结构同构造参数），
+            由调用方补译后经 fill_unresolved() 填回；全部取得时 kr 为空。
+        """
+        unresolved: dict[str, dict] = {"kr": {}, "jp": {}, "en": {}}
+        deadline = time.monotonic() + timeout
+        for position, (key, idx, path_tuple) in self.shared_pending.items():
+            translation = self._shared.wait(key, max(0.0, deadline - time.monotonic()))
+            if translation is not None:
+                self.shared_hits[position] = translation
+                continue
+            self.shared_unresolved[position] = (idx, path_tuple)
+            for lang, source in (("kr", self.kr_text), ("jp", self.jp_text), ("en", self.en_text)):
+                if path_tuple in source.get(idx, {}):
+                    unresolved[lang].setdefault(idx, {})[path_tuple] = source[idx][path_tuple]
+        self.shared_pending = {}
+        return unresolved
+
+    def fill_unresolved(self, translated: dict) -> None:
+        """填回 resolve_shared() 返回文本块的补译结果（deBuild 的返回结构）。"""
+        for position, (idx, path_tuple) in self.shared_unresolved.items():
+            self.shared_hits[position] = translated[idx][path_tuple]
+        self.shared_unresolved = {}
+
     # ========== 还原 ==========
 
     def deBuild(self, translated_texts: list[str]) -> dict:
         """将扁平翻译文本列表还原为嵌套字典结构。
 
+        translated_texts 仅对应实际发送的 text_blocks；翻译记忆命中与运行内去重命中的位置
+        直接使用 memory_hits / shared_hits 中的译文。
         当翻译数量与预期不符时，按位置用对应 KR 原文填充缺失条目：
         - 不足时：末尾 shortfall 个位置用各自的 KR 原文补齐
         - 多余时：截断多余条目
         """
-        result_dict = deepcopy(self.kr_text)
+        # kr_text 为扁平化结构，值均为叶子：逐条目浅复制即可，不必深复制整份原文
+        result_dict = {idx: dict(paths) for idx, paths in self.kr_text.items()}
+        hits = {**self.shared_hits, **self.memory_hits}
 
-        # 收集每个非空位置的 KR 原文，用于缺失时按位置精确回退
+        # 收集每个待翻译位置的 KR 原文，用于缺失时按位置精确回退
         kr_fallback_by_pos: list[str] = []
+        position = -1
         for idx in result_dict:
             kr_item = self.kr_text.get(idx, {})
             jp_item = self.jp_text.get(idx, {})
@@ -291,7 +428,9 @@ class RequestBuilder:
                 en_val = en_item.get(path_tuple, "")
                 kr_val = kr_item.get(path_tuple, "")
                 if not (jp_val in EMPTY_TEXT and en_val in EMPTY_TEXT and kr_val in EMPTY_TEXT):
-                    kr_fallback_by_pos.append(kr_val)
+                    position += 1
+                    if position not in hits:
+                        kr_fallback_by_pos.append(kr_val)
 
         expected_count = len(kr_fallback_by_pos)
 
@@ -313,6 +452,7 @@ class RequestBuilder:
             translated_texts = translated_texts[:expected_count]
 
         translated_iter = iter(translated_texts)
+        position = -1
         for idx in result_dict:
             kr_item = self.kr_text.get(idx, {})
             jp_item = self.jp_text.get(idx, {})
@@ -324,7 +464,11 @@ class RequestBuilder:
                 en_val = en_item.get(path_tuple, "")
                 kr_val = kr_item.get(path_tuple, "")
                 if not (jp_val in EMPTY_TEXT and en_val in EMPTY_TEXT and kr_val in EMPTY_TEXT):
-                    result_dict[idx][path_tuple] = next(translated_iter)
+                    position += 1
+                    cached = hits.get(position)
+                    result_dict[idx][path_tuple] = (
+                        cached if cached is not None else next(translated_iter)
+                    )
 
         return result_dict
 
@@ -343,8 +487,8 @@ class RequestBuilder:
         return docs
 
     def _get_skill_doc(self) -> str:
-        """获取技能翻译指南。"""
-        if self.is_skill:
+        """获取技能翻译指南。cache 布局下由系统提示词承载，此处为空。"""
+        if self.is_skill and self.prompt_layout != "cache":
             return translate_doc.SKILL_DOC
         return ""
 
@@ -126,7 +126,12 @@ class StageStrategy:
         *,
         examples: list[dict] | None = None,
     ) -> str:
-        """构建主翻译系统提示词。自动加载 FileType 对应的 few-shot 示例。"""
+        """构建主翻译系统提示词。自动加载 FileType 对应的 few-shot 示例。
+
+        prompt_layout 为 "cache" 时，技能文件的静态技能指南放入系统提示词
+        （RequestBuilder 相应地不再放入 user prompt），使同一 (FileType, 格式)
+        的请求共享更长的字节稳定前缀。
+        """
         # 自动加载 FileType 对应的 few-shot 示例
         if examples is None:
             try:
@@ -134,11 +139,16 @@ class StageStrategy:
                 examples = get_examples(file_type.name)
             except ImportError:
                 pass
+        skill_doc = ""
+        if file_type == FileType.SKILL and self._config.prompt_layout == "cache":
+            import translateFunc.translate_doc as translate_doc
+            skill_doc = translate_doc.SKILL_DOC
         return self._prompt_factory.build_system_prompt(
             file_type=file_type,
             stage=1,
             prompt_format=prompt_format,
             examples=examples,
+            skill_doc=skill_doc,
         )
 
     def build_stage_1_user_prompt(
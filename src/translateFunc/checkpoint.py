@@ -0,0 +1,130 @@
+"""
+translateFunc/checkpoint.py
+CheckpointJournal —— 已完成文件的断点日志，与 processing_log.jsonl 同目录。
+
+每个文件处理完成后追加一行：
+  {"file", "config", "input", "output", "result", "entries"}
+  - input：KR/JP/EN/LLC 输入文件内容的哈希
+  - output：输出文件内容的哈希（无输出时为空串）
+  - entries：该文件的条目级索引记录（未启用时为 null）
+续跑时，配置指纹与输入哈希一致且输出文件未被改动的文件直接沿用上次结果。
+配置指纹包含术语表内容与提示词模板哈希（TranslateConfig.fingerprint），
+二者变化后旧记录全部作废。
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from translateFunc.config import FilePathConfig, ProcessOutcome
+from translateFunc.enums import ProcessResult
+
+_logger = logging.getLogger("LCTA")
+
+CHECKPOINT_NAME = "checkpoint.jsonl"
+
+# 只有这些结果代表文件已最终完成；降级与错误需要在续跑时重新处理
+_FINISHED = frozenset({
+    ProcessResult.SUCCESS_SAVED,
+    ProcessResult.ALREADY_TRANSLATED,
+    ProcessResult.EMPTY_WITH_LLC,
+    ProcessResult.EMPTY_SKIPPED,
+    ProcessResult.REUSED_PREVIOUS,
+})
+
+
+def _hash_file(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _hash_inputs(file_pc: FilePathConfig) -> str:
+    digest = hashlib.sha256()
+    for path in (file_pc.KR_path, file_pc.JP_path, file_pc.EN_path, file_pc.LLC_path):
+        digest.update(_hash_file(path).encode("ascii"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """线程安全的断点日志：读取已有记录，追加本次完成的文件。"""
+
+    def __init__(self, path: Path, config: str):
+        self._path = path
+        self._config = config
+        self._lock = threading.Lock()
+        entries = self._read(path)
+        self._entries: dict[str, dict] = {
+            file: item for file, item in entries.items() if item.get("config") == config
+        }
+        # 配置指纹不同（如术语表或提示词模板已变化）而作废的记录数
+        self.stale: int = len(entries) - len(self._entries)
+
+    @property
+    def resumable(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, dict]:
+        entries: dict[str, dict] = {}
+        if not path.is_file():
+            return entries
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程被中断时最后一行可能不完整
+                    continue
+                if isinstance(item, dict) and isinstance(item.get("file"), str):
+                    entries[item["file"]] = item
+        return entries
+
+    def lookup(self, file_pc: FilePathConfig) -> tuple[ProcessOutcome, dict | None] | None:
+        """返回可沿用的 (结果, 条目索引记录)；不可沿用时返回 None。"""
+        item = self._entries.get(file_pc.rel_path.as_posix())
+        if item is None:
+            return None
+        try:
+            result = ProcessResult[item.get("result", "")]
+        except KeyError:
+            return None
+        if item.get("input") != _hash_inputs(file_pc):
+            return None
+        output = item.get("output", "")
+        if output and _hash_file(file_pc.target_file) != output:
+            return None
+        outcome = ProcessOutcome(result, file_pc.real_name, {"resumed": True})
+        return outcome, item.get("entries")
+
+    def record(
+        self,
+        file_pc: FilePathConfig,
+        outcome: ProcessOutcome,
+        entries: dict | None = None,
+    ) -> None:
+        """追加一条已完成文件的记录。未完成的结果不记录。"""
+        if outcome.result not in _FINISHED:
+            return
+        target = file_pc.target_file
+        item = {
+            "file": file_pc.rel_path.as_posix(),
+            "config": self._config,
+            "input": _hash_inputs(file_pc),
+            "output": _hash_file(target) if target.is_file() else "",
+            "result": outcome.result.name,
+            "entries": entries,
+        }
+        line = json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            with self._lock:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+        except OSError:
+            _logger.exception(f"断点日志写入失败 ({file_pc.real_name})，但不影响主流程")
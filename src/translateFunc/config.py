@@ -5,11 +5,41 @@ translateFunc/config.py
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+import json
 from pathlib import Path
 from typing import Any, Optional
 
 from translateFunc.enums import ProcessResult
 
+# 决定提示词内容的源码（模板、阶段策略、请求构建与翻译指南），相对 translateFunc 包目录
+_PROMPT_SOURCES = ("builder", "translate_doc.py")
+
+
+@lru_cache(maxsize=1)
+def prompt_template_digest() -> str:
+    """提示词模板的内容哈希：上述源码任一变化，先前的译文即视为由旧模板生成。"""
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    for name in _PROMPT_SOURCES:
+        source = package_dir / name
+        files = sorted(source.rglob("*.py")) if source.is_dir() else [source]
+        for path in files:
+            digest.update(path.relative_to(package_dir).as_posix().encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def glossary_digest(terms: list[dict]) -> str:
+    """术语表内容哈希（term / translation / note，按原顺序）。"""
+    raw = json.dumps(
+        [[t.get("term", ""), t.get("translation", ""), t.get("note", "")] for t in terms],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 
 @dataclass
 class TranslateConfig:
@@ -31,6 +61,15 @@ class TranslateConfig:
     # --- 并发 ---
     max_workers: int = 4
     enable_concurrent: bool = True
+    max_concurrent_requests: int = 0          # >0 时启用请求引擎：全部 LLM 请求共享该在途上限，分片进入同等线程数的共享队列
+    part_concurrency: int = 1                 # 单个文件同时排入请求引擎队列的分片数（需启用请求引擎）
+    adaptive_rate_limit: bool = False         # 全局 AIMD 并发控制：429/5xx/超时时减半，成功后逐步恢复
+    batch_small_files: bool = False           # 同类 UI / OTHER 小文件的阶段 1 请求合并发送（需并发）
+    batch_max_blocks: int = 20                # 文本块数不超过该值的分片才参与合并
+
+    # --- 预算 ---
+    token_budget: int = 0                     # >0 时限制整次运行的输入+输出 token 数（估算）
+    budget_soft_ratio: float = 0.8            # 已用达到该比例时停用阶段 0 / 阶段 2 / P1-2 补充翻译
 
     # --- 提示词 / 管线 ---
     translation_mode: str = "multi_stage"     # "multi_stage" | "single_stage"
@@ -39,10 +78,38 @@ class TranslateConfig:
     disambiguation_mode: str = "hybrid"       # "similarity" | "llm" | "hybrid"
     min_confidence: str = "medium"            # "high" | "medium" | "low"
     prompt_format: str = "xml_json"           # "xml_json" | "xml_xml" | "json_json"
+    prompt_layout: str = "default"            # "default" | "cache"：静态文档移入系统提示词、引用按确定顺序排列，利于服务商前缀缓存
+    proper_match_mode: str = "leftmost_longest"  # "all" | "leftmost_longest" | "longest_per_position"：专有名词匹配模式
+    glossary_digest: str = ""                 # 本次使用的术语表内容哈希（glossary_digest()），由管线在获取术语后填入
 
     # --- 保存 ---
     save_result: bool = True
 
+    # --- 翻译记忆 ---
+    translation_memory: bool = False          # 跨运行复用已翻译文本块，避免重复调用 LLM
+    translation_memory_path: Optional[Path] = None
+    dedup: bool = False                       # 同类文件中相同的 (KR, JP, EN) 原文整次运行只翻译一次
+
+    # --- 增量复用 ---
+    reuse_output_dir: Optional[Path] = None   # 上次运行的输出目录（含 LLc-CN-LCTA 内容）
+    reuse_files: frozenset = frozenset()      # 可直接复用的 KR 相对路径（POSIX 格式）
+    entry_index: bool = False                 # 维护条目级哈希索引，只重译原文变化的条目
+    checkpoint: bool = False                  # 写入断点日志，续跑时跳过输入与配置均未变化的已完成文件
+
+    # --- 分片执行 ---
+    shard_index: int = 1                      # 当前分片序号（1..shard_count）
+    shard_count: int = 1                      # >1 时只处理按工作量划分给当前分片的文件
+    prepare_only: bool = False                # 只处理优先文件（BattleKeywords / ScenarioModelCodes）
+    prepared_dir: Optional[Path] = None       # prepare 输出目录；分片直接复制其中的优先文件
+
+    # --- 预估 ---
+    dry_run: bool = False                     # 只构建请求并统计调用次数 / token 数，不调用 LLM、不保存译文
+    throughput_path: Optional[Path] = None    # 跨运行保存的单请求吞吐量，用于预测耗时
+
+    # --- 启动 ---
+    automaton_cache_dir: Optional[Path] = None  # 已构建的 AC 自动机缓存目录，术语表未变化时跳过构建（仅纯 Python 后端）
+    ac_backend: str = "auto"                  # "auto" | "python" | "pyahocorasick"：auto 在安装了 pyahocorasick 时使用 C 实现
+
     # --- LLM 思考模式 ---
     enable_thinking: bool = False
 
@@ -92,6 +159,9 @@ class TranslateConfig:
             # 新增配置项及其默认值：
             max_workers=configs.get("max_workers", 4),
             enable_concurrent=configs.get("enable_concurrent", True),
+            max_concurrent_requests=configs.get("max_concurrent_requests", 0),
+            part_concurrency=configs.get("part_concurrency", 1),
+            adaptive_rate_limit=configs.get("adaptive_rate_limit", False),
             translation_mode=configs.get("translation_mode", "multi_stage"),
             enable_self_check=configs.get("enable_self_check", False),
             disambiguation_mode=configs.get("disambiguation_mode", "hybrid"),
@@ -99,9 +169,49 @@ class TranslateConfig:
             prompt_format=configs.get("prompt_format", "xml_json"),
             enable_thinking=configs.get("enable_thinking", False),
             enable_rule_validation=configs.get("enable_rule_validation", True),
+            translation_memory=configs.get("translation_memory", False),
+            translation_memory_path=(
+                Path(configs["translation_memory_path"])
+                if configs.get("translation_memory_path") else None
+            ),
         )
 
 
+    def fingerprint(self) -> str:
+        """影响翻译结果的配置指纹。路径、并发度和调试选项不参与计算。
+
+        术语表按内容（glossary_digest）而非 proper_path 参与计算，
+        并包含提示词模板的源码哈希，两者任一变化都会使旧的输出、条目索引和断点日志失效。
+        """
+        api = {
+            key: value for key, value in self.translator_api.items()
+            if key not in ("api_key", "base_url")
+        }
+        payload = {
+            "translator_name": self.translator_name,
+            "translator_api": api,
+            "enable_proper": self.enable_proper,
+            "enable_role": self.enable_role,
+            "enable_skill": self.enable_skill,
+            "translation_mode": self.translation_mode,
+            "enable_self_check": self.enable_self_check,
+            "enable_rule_validation": self.enable_rule_validation,
+            "disambiguation_mode": self.disambiguation_mode,
+            "min_confidence": self.min_confidence,
+            "prompt_format": self.prompt_format,
+            "prompt_layout": self.prompt_layout,
+            "proper_match_mode": self.proper_match_mode,
+            "enable_thinking": self.enable_thinking,
+            "is_llm": self.is_llm,
+            "from_lang": self.from_lang,
+            "glossary": self.glossary_digest if self.enable_proper else "",
+            "prompt_template": prompt_template_digest(),
+            "fallback": self.fallback,
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
 def inject_thinking_mode(api_settings: dict, enable_thinking: bool) -> dict:
     """根据 enable_thinking 配置向 api_settings 注入思考模式参数。
 
@@ -142,6 +252,15 @@ class ProcessOutcome:
     extra: dict | None = None  # 错误详情、耗时等附加信息
 
 
+def _add_counts(total: dict, counts: dict) -> None:
+    """把 counts 中的数值（可嵌套）累加到 total。"""
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            _add_counts(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+
+
 @dataclass
 class PipelineSummary:
     """一次翻译运行的汇总结果。"""
@@ -149,6 +268,14 @@ class PipelineSummary:
     skipped: list[str] = field(default_factory=list)
     fallback: list[str] = field(default_factory=list)
     errors: list[ProcessOutcome] = field(default_factory=list)
+    # dry run 的请求规模统计；projection 为按吞吐量预测的耗时，不参与合并
+    estimate: dict = field(default_factory=dict)
+    # token 预算触发的降级步骤，以及预算用量与因预算跳过的调用数
+    degradations: list[dict] = field(default_factory=list)
+    budget: dict = field(default_factory=dict)
+    # 服务商返回的 token 用量（总计 / 按阶段 / 按格式 / 按文件），以及按阶段的调用耗时样本（秒）
+    usage: dict = field(default_factory=dict)
+    latencies: dict = field(default_factory=dict)
 
     @property
     def total(self) -> int:
@@ -166,6 +293,59 @@ class PipelineSummary:
     def error_count(self) -> int:
         return len(self.errors)
 
+    def extend(self, other: "PipelineSummary") -> None:
+        """并入另一次（分片）运行的结果。"""
+        self.saved.extend(other.saved)
+        self.skipped.extend(other.skipped)
+        self.fallback.extend(other.fallback)
+        self.errors.extend(other.errors)
+        self.add_estimate(other.estimate)
+        self.degradations.extend(other.degradations)
+        _add_counts(self.budget, other.budget)
+        _add_counts(self.usage, other.usage)
+        for stage, samples in other.latencies.items():
+            self.latencies.setdefault(stage, []).extend(samples)
+
+    def add_estimate(self, estimate: dict) -> None:
+        """累加单个文件（或另一次运行）的 dry run 统计。"""
+        _add_counts(self.estimate, {k: v for k, v in estimate.items() if k != "projection"})
+
+    def to_dict(self) -> dict:
+        return {
+            "saved": list(self.saved),
+            "skipped": list(self.skipped),
+            "fallback": list(self.fallback),
+            "errors": [
+                {"result": o.result.name, "file_name": o.file_name, "extra": o.extra}
+                for o in self.errors
+            ],
+            "estimate": self.estimate,
+            "degradations": list(self.degradations),
+            "budget": self.budget,
+            "usage": self.usage,
+            "latencies": self.latencies,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PipelineSummary":
+        return cls(
+            saved=list(data.get("saved", [])),
+            skipped=list(data.get("skipped", [])),
+            fallback=list(data.get("fallback", [])),
+            errors=[
+                ProcessOutcome(ProcessResult[item["result"]], item["file_name"], item.get("extra"))
+                for item in data.get("errors", [])
+            ],
+            estimate=dict(data.get("estimate", {})),
+            degradations=list(data.get("degradations", [])),
+            budget=dict(data.get("budget", {})),
+            usage=dict(data.get("usage", {})),
+            latencies={
+                stage: list(samples)
+                for stage, samples in data.get("latencies", {}).items()
+            },
+        )
+
 
 # --- 路径配置 ---
 
@@ -0,0 +1,108 @@
+"""
+translateFunc/dedup.py
+SharedTranslations —— 整次运行内相同原文只翻译一次。
+
+键为文件类别与文本块的 (KR, JP, EN) 原文：剧情 / 技能等类别的提示词规则不同，
+不同类别之间不共享译文。
+
+RequestBuilder.build() 在匹配前一次性认领文件内全部文本块：
+  - 未被认领的键归当前文件所有，随当前文件的请求翻译（即首次出现处的上下文），
+    译文确定后发布；阶段 1 结果即最终结果时按分片提前发布
+  - 已被其他文件认领的键不进入请求，build() 不等待；当前文件自身的请求
+    全部完成后才等待所有者发布，得到译文后在 deBuild 时填回；所有者失败
+    （发布 None）或等待超时时由当前文件补译
+
+认领在锁内按文件整体完成，等待只会指向更早认领的文件，不会形成循环等待；
+所有者结束处理时 release() 兜底，等待另有 SHARED_WAIT_TIMEOUT 上限。
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+
+from translateFunc.enums import FileType
+
+# 等待其他文件发布译文的总时长上限（秒），超时的文本块由等待方补译
+SHARED_WAIT_TIMEOUT = 600.0
+
+
+class _Shared:
+    """一个原文键的所有者与发布结果。"""
+
+    __slots__ = ("owner", "translation", "done")
+
+    def __init__(self, owner: str):
+        self.owner = owner
+        self.translation: str | None = None
+        self.done = threading.Event()
+
+
+class SharedTranslations:
+    """线程安全的运行内去重登记表。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Shared] = {}
+        self._owned: dict[str, list[str]] = {}
+        self.unique = 0          # 被认领的不同原文数
+        self.fanned_out = 0      # 直接使用其他文件译文的文本块数
+        self.self_translated = 0  # 所有者未能提供译文、由等待方自行翻译的文本块数
+
+    @staticmethod
+    def make_key(file_type: FileType, block: dict) -> str:
+        raw = json.dumps(
+            [file_type.name, block.get("kr", ""), block.get("jp", ""), block.get("en", "")],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def claim(self, owner: str, keys: list[str]) -> set[str]:
+        """认领 keys 中尚无所有者的键，返回已由其他文件认领的键。"""
+        foreign: set[str] = set()
+        with self._lock:
+            owned = self._owned.setdefault(owner, [])
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = _Shared(owner)
+                    owned.append(key)
+                    self.unique += 1
+                elif entry.owner != owner:
+                    foreign.add(key)
+        return foreign
+
+    def wait(self, key: str, timeout: float | None = None) -> str | None:
+        """等待其他文件发布译文；所有者失败或超时时返回 None。"""
+        entry = self._entries[key]
+        entry.done.wait(timeout)
+        with self._lock:
+            if entry.translation is None:
+                self.self_translated += 1
+            else:
+                self.fanned_out += 1
+        return entry.translation
+
+    def publish(self, key: str, translation: str | None) -> None:
+        """发布所有者的译文；None 表示无可靠译文。只有首次发布生效。"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.done.is_set():
+                return
+            entry.translation = translation
+            entry.done.set()
+
+    def release(self, owner: str) -> None:
+        """所有者处理结束：尚未发布的键一律发布 None，唤醒全部等待方。"""
+        with self._lock:
+            keys = self._owned.pop(owner, [])
+        for key in keys:
+            self.publish(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "unique": self.unique,
+                "fanned_out": self.fanned_out,
+                "self_translated": self.self_translated,
+            }
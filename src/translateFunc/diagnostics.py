@@ -187,15 +187,22 @@ class HttpResponseObserver:
         self._initialized = True
         self._local = threading.local()
         self._installed = False
-        session = getattr(translator, "_session", None)
-        hooks = getattr(session, "hooks", None)
-        if not isinstance(hooks, dict):
-            return
-
-        response_hooks = hooks.setdefault("response", [])
-        if self._capture not in response_hooks:
-            response_hooks.append(self._capture)
-        self._installed = True
+        sessions = [getattr(translator, "_session", None)]
+        # translatekit 实际通过线程本地 Session 发送请求，一并挂载当前线程的 Session
+        get_session = getattr(translator, "_get_session", None)
+        if callable(get_session):
+            try:
+                sessions.append(get_session())
+            except Exception:
+                pass
+        for session in sessions:
+            hooks = getattr(session, "hooks", None)
+            if not isinstance(hooks, dict):
+                continue
+            response_hooks = hooks.setdefault("response", [])
+            if self._capture not in response_hooks:
+                response_hooks.append(self._capture)
+            self._installed = True
 
     @property
     def installed(self) -> bool:
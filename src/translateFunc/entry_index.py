@@ -0,0 +1,102 @@
+"""
+translateFunc/entry_index.py
+EntryIndex —— 条目级内容哈希索引，随每次发布保存。
+
+每个文件记录 id → [KR 哈希, LLC 哈希, 来源]：
+  - KR/LLC 哈希取自 flatten_dict_enhanced 展开后的文本值
+  - 来源为 "llc"（沿用熟肉翻译）或 "ours"（本工具翻译）
+FileProcessor 据此找出 KR 已变化而熟肉未更新的过期条目，
+并直接复用上次输出中原文未变化的自有译文。
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from translateFunc.builder.request import AVOID_PATH
+from translateFunc.proper import flatten_dict_enhanced
+
+_logger = logging.getLogger("LCTA")
+
+ENTRY_INDEX_NAME = "entry-index.json"
+SOURCE_LLC = "llc"
+SOURCE_OURS = "ours"
+_SCHEMA = 1
+
+
+def hash_entry(entry) -> str:
+    """计算单个条目展开后文本值的哈希。"""
+    if entry is None:
+        return ""
+    flat = flatten_dict_enhanced(entry, ignore_types=[None, int, float])
+    items = sorted(
+        ("/".join(map(str, path)), value)
+        for path, value in flat.items()
+        if path and path[-1] not in AVOID_PATH
+    )
+    raw = json.dumps(items, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class EntryIndex:
+    """线程安全的条目索引：读取上次发布的索引，收集本次运行的索引。"""
+
+    def __init__(self, previous: dict | None = None, config: str = ""):
+        self._previous: dict[str, dict[str, list[str]]] = previous or {}
+        self._config = config
+        self._current: dict[str, dict[str, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | None, config: str = "") -> "EntryIndex":
+        """从上次发布的索引文件构建。
+
+        文件缺失、无效或翻译配置指纹（TranslateConfig.fingerprint）不一致时，
+        不沿用任何旧条目。
+        """
+        if path is None or not path.is_file():
+            return cls(config=config)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            _logger.warning(f"条目索引读取失败，按无索引处理: {path}", exc_info=True)
+            return cls(config=config)
+        if not isinstance(data, dict) or data.get("schema") != _SCHEMA:
+            return cls(config=config)
+        if data.get("config") != config:
+            _logger.info("翻译配置已变化，不沿用上次的条目索引")
+            return cls(config=config)
+        files = data.get("files")
+        return cls(files if isinstance(files, dict) else {}, config)
+
+    def previous_entries(self, file_key: str) -> dict[str, list[str]]:
+        return self._previous.get(file_key, {})
+
+    def record(self, file_key: str, entries: dict[str, list[str]]) -> None:
+        with self._lock:
+            self._current[file_key] = entries
+
+    def current_entries(self, file_key: str) -> dict[str, list[str]] | None:
+        with self._lock:
+            return self._current.get(file_key)
+
+    def carry_over(self, file_key: str) -> None:
+        """文件整体复用上次输出时沿用其旧索引。"""
+        entries = self._previous.get(file_key)
+        if entries is not None:
+            self.record(file_key, entries)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "schema": _SCHEMA,
+                "config": self._config,
+                "files": dict(sorted(self._current.items())),
+            }
+        path.write_text(
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
@@ -15,6 +15,8 @@ class ProcessResult(Enum):
     SAVE_ERROR           = auto()   # 保存失败
     TRANSLATION_MISMATCH = auto()   # 翻译结果数量与输入数量不匹配
     FALLBACK_TO_ORIGINAL = auto()   # 全部格式解析失败，回退保存为 KR 原文
+    REUSED_PREVIOUS      = auto()   # 输入未变化，直接复用上次运行的输出
+    DRY_RUN_ESTIMATED    = auto()   # dry run：只统计请求规模，未调用 LLM
 
 
 class FileType(Enum):
@@ -32,3 +34,10 @@ class MatchConfidence(Enum):
     LOW         = auto()   # 弱匹配，可能不适用
     UNKNOWN     = auto()   # 术语无上下文数据，无法判断
     FALSE_MATCH = auto()   # 更接近负向上下文，判定为假阳性
+
+
+class MatchMode(Enum):
+    """AC 自动机的匹配模式。值与配置项中的字符串一致。"""
+    ALL                  = "all"                    # 全部匹配，包括相互重叠与包含的子串
+    LEFTMOST_LONGEST     = "leftmost_longest"       # 从左到右取起点最靠左的最长匹配，结果互不重叠
+    LONGEST_PER_POSITION = "longest_per_position"   # 每个起点只保留最长匹配，不同起点之间可重叠
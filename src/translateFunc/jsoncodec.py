@@ -0,0 +1,148 @@
+"""
+translateFunc/jsoncodec.py
+JSON 编解码 —— 安装了 orjson 时使用 orjson，否则回退到标准库 json。
+
+两种后端的输出逐字节一致：
+  - 不转义非 ASCII 字符（等价于 ensure_ascii=False），游戏读取的译文文件带 UTF-8 BOM
+  - orjson 只支持 2 空格缩进；indent=4 时把行首缩进加倍得到与 json.dump(indent=4) 相同的输出
+    （JSON 字符串内的换行总是被转义，按 "\n" 后的空格处理是安全的）
+  - orjson 无法处理的对象（超出 64 位的整数、非 dict 的映射、孤立代理字符等）
+    自动改用标准库，结果不受后端影响
+  - 浮点数：orjson 把 NaN / Infinity 写成 null，科学计数法的写法与标准库不同
+    （1e16 / 1e+16，0.00001 / 1e-05）。orjson 输出中出现指数形式、0.0000 开头的小数，
+    或出现 null 且对象中含非有限浮点数时，改用标准库重新序列化（字符串内容误判只影响速度）
+解析：orjson 不接受 NaN / Infinity 字面量，解析失败时回退到标准库；
+解析错误统一为 json.JSONDecodeError（orjson.JSONDecodeError 是其子类），调用方无需区分后端。
+"""
+from __future__ import annotations
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+_backend = "orjson" if orjson is not None else "json"
+
+# orjson 的指数形式（如 1e16、1e-7）；以字面量开头，正则引擎可快速定位候选位置
+_EXPONENT = re.compile(rb"e[-0-9]")
+
+
+def backend() -> str:
+    """当前使用的后端名称："orjson" 或 "json"。"""
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """切换后端（基准测试与对照测试用）。指定 orjson 但未安装时抛出 ValueError。"""
+    global _backend
+    if name not in ("orjson", "json"):
+        raise ValueError(f"未知的 JSON 后端: {name}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("orjson 未安装")
+    _backend = name
+
+
+def loads(data: bytes | str) -> Any:
+    """解析 JSON 文本；bytes 开头的 UTF-8 BOM 会被去掉。"""
+    if isinstance(data, (bytes, bytearray)) and data.startswith(UTF8_BOM):
+        data = data[len(UTF8_BOM):]
+    elif isinstance(data, str) and data.startswith("\ufeff"):
+        data = data[1:]
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN / Infinity 等扩展字面量交给标准库；真正的语法错误由标准库抛出
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load(path: Path | str) -> Any:
+    """读取并解析 JSON 文件（兼容 UTF-8 BOM）。文件不存在时抛出 FileNotFoundError。"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def _double_indent(raw: bytes) -> bytes:
+    """把 2 空格缩进改为 4 空格缩进。
+
+    第 j 轮（j 从 0 开始）之后，层级 L 的行首有 2L + 2·min(L, j) 个空格：
+    行首至少 4j + 2 个空格的行即层级 > j 的行，给它们再加 2 个空格。
+    每轮都是一次 C 层面的 bytes.replace，比逐行正则替换快一个数量级。
+    """
+    level = 0
+    while True:
+        old = b"\n" + b" " * (4 * level + 2)
+        if old not in raw:
+            return raw
+        raw = raw.replace(old, b"\n" + b" " * (4 * level + 4))
+        level += 1
+
+
+def _float_mismatch(raw: bytes) -> bool:
+    """orjson 输出中是否可能有与标准库写法不同的浮点数。
+
+    标准库对 1e-4 以下的小数使用指数形式，orjson 写成 0.0000…；两者的指数写法也不同。
+    """
+    if b"0.0000" in raw:
+        return True
+    for match in _EXPONENT.finditer(raw):
+        if raw[match.start() - 1:match.start()].isdigit():
+            return True
+    return False
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """对象中是否含 NaN / Infinity。"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def dumps_bytes(obj: Any, *, indent: int | None = None) -> bytes:
+    """序列化为 UTF-8 bytes；indent 为 None、2 或 4 时两种后端输出一致。"""
+    if _backend == "orjson" and indent in (None, 2, 4):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            raw = orjson.dumps(obj, option=option)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if not _float_mismatch(raw) and not (b"null" in raw and _has_non_finite(obj)):
+                return _double_indent(raw) if indent == 4 else raw
+    separators = (",", ":") if indent is None else None
+    return json.dumps(
+        obj, ensure_ascii=False, indent=indent, separators=separators,
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, *, indent: int | None = None) -> str:
+    """序列化为 str，输出与 json.dumps(ensure_ascii=False) 的紧凑 / 缩进格式一致。"""
+    return dumps_bytes(obj, indent=indent).decode("utf-8")
+
+
+def dump(obj: Any, path: Path | str, *, indent: int | None = None, bom: bool = False) -> None:
+    """序列化并写入文件；bom=True 时写入 UTF-8 BOM（游戏读取的译文文件需要）。"""
+    data = dumps_bytes(obj, indent=indent)
+    with open(path, "wb") as f:
+        if bom:
+            f.write(UTF8_BOM)
+        f.write(data)
@@ -1,10 +1,12 @@
 """translateFunc.matcher — AC automaton matching and proper noun analysis."""
-from translateFunc.matcher.ac_automaton import AcAutomaton, ACPattern
+from translateFunc.matcher.ac_automaton import AcAutomaton, ACMatch, ACPattern
+from translateFunc.matcher.ac_backend import NativeAcAutomaton, new_automaton
 from translateFunc.matcher.engine import MatcherEngine, MatchResult
 from translateFunc.matcher.proper import ProperAnalyzer, ProperTerm
 
 __all__ = [
-    "AcAutomaton", "ACPattern",
+    "AcAutomaton", "ACMatch", "ACPattern",
+    "NativeAcAutomaton", "new_automaton",
     "MatcherEngine", "MatchResult",
     "ProperAnalyzer", "ProperTerm",
 ]
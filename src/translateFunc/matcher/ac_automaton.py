@@ -3,17 +3,58 @@ translateFunc/matcher/ac_automaton.py
 纯 Aho-Corasick 自动机实现。
 不依赖游戏数据 —— 仅算法。
 
+build() 把构建期的字典 trie 编译为扁平表示：
+  - goto：单个 dict，键为 (节点 << 21) | 码位（Unicode 码位不超过 21 位）；
+    根节点的转移单独保存为 码位 → 节点，从根节点出发时可少一次键计算
+  - fail / out_node：按节点编号索引的 list[int]
+  - 输出链不按节点物化：out_node[v] 为 v 自身或最近的带输出后缀节点，
+    节点内的多个模式通过 pattern_next 串成链表，沿 out_node 链逐级输出
+  - 命中返回的是每个模式唯一的 ACPattern 实例，不按命中分配对象
+
+搜索时文本先整体编码为 UTF-32 并转换为码位列表，循环内不逐字符调用 ord()。
+
+save() / load() 把编译后的表以小端整数数组写入紧凑的二进制文件；
+load() 一次读入整个文件并反序列化为与 build() 相同的 dict / list 表，
+省去 trie 构建与失败链接计算，模式串与数据由调用方提供（与构建时的顺序一致）。
+
+search() 返回全部命中的 ACPattern；find() 返回带位置的 ACMatch（命名元组，
+绕过 __init__ 直接构造），并按 MatchMode 过滤：全部匹配 / 最左最长（互不重叠）/ 每个起点最长。
+
 复杂度：
   构建: O(L)，L = 所有模式串长度之和
   搜索: O(m + k)，m = 文本长度，k = 命中数
 """
 from __future__ import annotations
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass
 from collections import deque
-from typing import Any
+from pathlib import Path
+from typing import Any, NamedTuple
+import struct
+import sys
+
+from translateFunc.enums import MatchMode
+
+# 码位位宽：goto 键 = (node << _CODE_BITS) | ord(ch)
+_CODE_BITS = 21
+
+# 序列化格式：魔数 + 头部（节点数、模式数、goto 边数、根节点边数）+ 各表
+_FILE_MAGIC = b"LCTAAC01"
+_HEADER = struct.Struct("<4Q")
+
+# 按本机字节序编码为 UTF-32，memoryview.cast("I") 即得码位序列；孤立代理项原样保留
+_UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+# ACMatch 的快速构造：_new_match(ACMatch, (pattern, data, start, end))
+_new_match = tuple.__new__
+
 
+def _code_points(text: str) -> list[int]:
+    """文本的码位序列（与逐字符 ord() 相同），编码与转换均在 C 层一次完成。"""
+    return memoryview(text.encode(_UTF32, "surrogatepass")).cast("I").tolist()
 
-@dataclass
+
+@dataclass(slots=True)
 class ACPattern:
     """自动机匹配到的单个模式。"""
     pattern: str
@@ -21,13 +62,52 @@ class ACPattern:
     data: Any = None
 
 
+class ACMatch(NamedTuple):
+    """带位置的一次命中：text[start:end] == pattern。"""
+    pattern: str
+    data: Any
+    start: int
+    end: int
+
+
+def select_matches(matches: list[ACMatch], mode: MatchMode) -> list[ACMatch]:
+    """按匹配模式过滤命中。
+
+    ALL 原样返回；其余模式按起点排序，同一片段上的多个模式（相同模式串重复添加）一并保留。
+    """
+    if mode is MatchMode.ALL or not matches:
+        return matches
+    # 每个起点的最长结束位置
+    longest: dict[int, int] = {}
+    for match in matches:
+        if match.end > longest.get(match.start, -1):
+            longest[match.start] = match.end
+    if mode is MatchMode.LEFTMOST_LONGEST:
+        chosen: dict[int, int] = {}
+        covered = 0
+        for start in sorted(longest):
+            if start >= covered:
+                chosen[start] = covered = longest[start]
+        longest = chosen
+    selected = [match for match in matches if longest.get(match.start) == match.end]
+    selected.sort(key=lambda match: match.start)
+    return selected
+
+
 class AcAutomaton:
     """Aho-Corasick 多模式字符串匹配自动机。"""
 
     def __init__(self):
-        self._trie: list[dict[str, int]] = [{}]
-        self._fail: list[int] = [0]
-        self._output: list[list[ACPattern]] = [[]]
+        # 构建期：字典 trie；build() 后释放
+        self._trie: list[dict[str, int]] | None = [{}]
+        self._patterns: list[ACPattern] = []
+        # 编译后的扁平表示
+        self._root: dict[int, int] = {}
+        self._goto: dict[int, int] = {}
+        self._fail: list[int] = []
+        self._out_node: list[int] = []
+        self._pattern_head: list[int] = []   # 节点 → 该节点第一个模式的下标，-1 表示无
+        self._pattern_next: list[int] = []   # 模式下标 → 同一节点的下一个模式下标，-1 结束
         self._built: bool = False
 
     def add_pattern(self, pattern: str, data: Any = None) -> None:
@@ -36,61 +116,247 @@ class AcAutomaton:
             raise RuntimeError("不能在 build() 之后添加模式")
         if not pattern:
             return
+        trie = self._trie
         node = 0
         for ch in pattern:
-            if ch not in self._trie[node]:
-                self._trie[node][ch] = len(self._trie)
-                self._trie.append({})
-                self._fail.append(0)
-                self._output.append([])
-            node = self._trie[node][ch]
-        self._output[node].append(ACPattern(pattern=pattern, node_id=node, data=data))
+            child = trie[node].get(ch)
+            if child is None:
+                child = len(trie)
+                trie[node][ch] = child
+                trie.append({})
+            node = child
+        self._patterns.append(ACPattern(pattern=pattern, node_id=node, data=data))
 
     def build(self) -> None:
-        """构建失败链接（BFS）。必须在所有 add_pattern() 调用之后执行。"""
+        """编译 trie 并构建失败链接（BFS）。必须在所有 add_pattern() 调用之后执行。"""
         if self._built:
             return
-        queue: deque[int] = deque()
-        # 初始化深度为 1 的节点的失败链接
-        for ch, child in self._trie[0].items():
-            self._fail[child] = 0
-            queue.append(child)
-        # 广度优先构建
+        trie = self._trie
+        size = len(trie)
+
+        head = [-1] * size
+        pattern_next = [-1] * len(self._patterns)
+        # 逆序头插，使同一节点的模式链保持添加顺序
+        for index in range(len(self._patterns) - 1, -1, -1):
+            node = self._patterns[index].node_id
+            pattern_next[index] = head[node]
+            head[node] = index
+
+        # 失败链接在字典 trie 上计算；广度优先保证父节点的 fail 先于子节点确定
+        fail = [0] * size
+        out_node = [0] * size
+        queue: deque[int] = deque(trie[0].values())
+        for child in queue:
+            out_node[child] = child if head[child] >= 0 else 0
         while queue:
             r = queue.popleft()
-            for ch, child in self._trie[r].items():
+            for ch, child in trie[r].items():
                 queue.append(child)
-                f = self._fail[r]
-                while f != 0 and ch not in self._trie[f]:
-                    f = self._fail[f]
-                self._fail[child] = self._trie[f].get(ch, 0)
-                self._output[child].extend(self._output[self._fail[child]])
+                f = fail[r]
+                while f and ch not in trie[f]:
+                    f = fail[f]
+                target = trie[f].get(ch, 0)
+                fail[child] = target
+                out_node[child] = child if head[child] >= 0 else out_node[target]
+
+        goto: dict[int, int] = {}
+        for node in range(1, size):
+            base = node << _CODE_BITS
+            for ch, child in trie[node].items():
+                goto[base | ord(ch)] = child
+        root = {ord(ch): child for ch, child in trie[0].items()}
+
+        self._root = root
+        self._goto = goto
+        self._fail = fail
+        self._out_node = out_node
+        self._pattern_head = head
+        self._pattern_next = pattern_next
+        self._trie = None
         self._built = True
 
     def search(self, text: str) -> list[ACPattern]:
         """在文本中搜索所有模式。返回匹配的 ACPattern 列表。"""
         if not self._built:
             raise RuntimeError("必须在 search() 之前调用 build()")
-        if not text:
+        if not text or not self._patterns:
             return []
+        root = self._root
+        goto = self._goto
+        fail = self._fail
+        out_node = self._out_node
+        head = self._pattern_head
+        pattern_next = self._pattern_next
+        patterns = self._patterns
+
         result: list[ACPattern] = []
+        append = result.append
+        goto_get = goto.get
+        root_get = root.get
+        bits = _CODE_BITS
         node = 0
-        for ch in text:
-            while node != 0 and ch not in self._trie[node]:
-                node = self._fail[node]
-            node = self._trie[node].get(ch, 0)
-            if self._output[node]:
-                result.extend(self._output[node])
+        for code in _code_points(text):
+            if node:
+                child = goto_get((node << bits) | code)
+                while child is None:
+                    node = fail[node]
+                    if not node:
+                        child = root_get(code, 0)
+                        break
+                    child = goto_get((node << bits) | code)
+                node = child
+            else:
+                node = root_get(code, 0)
+            out = out_node[node]
+            while out:
+                index = head[out]
+                while index >= 0:
+                    append(patterns[index])
+                    index = pattern_next[index]
+                out = out_node[fail[out]]
         return result
 
+    def find(self, text: str, mode: MatchMode = MatchMode.ALL) -> list[ACMatch]:
+        """搜索并返回带位置的命中，按 mode 过滤。"""
+        if not self._built:
+            raise RuntimeError("必须在 find() 之前调用 build()")
+        if not text or not self._patterns:
+            return []
+        goto_get = self._goto.get
+        root_get = self._root.get
+        fail = self._fail
+        out_node = self._out_node
+        head = self._pattern_head
+        pattern_next = self._pattern_next
+        patterns = self._patterns
+        bits = _CODE_BITS
+
+        new_match = _new_match
+        result: list[ACMatch] = []
+        append = result.append
+        node = 0
+        for position, code in enumerate(_code_points(text), 1):
+            if node:
+                child = goto_get((node << bits) | code)
+                while child is None:
+                    node = fail[node]
+                    if not node:
+                        child = root_get(code, 0)
+                        break
+                    child = goto_get((node << bits) | code)
+                node = child
+            else:
+                node = root_get(code, 0)
+            out = out_node[node]
+            while out:
+                index = head[out]
+                while index >= 0:
+                    hit = patterns[index]
+                    append(new_match(ACMatch, (hit.pattern, hit.data, position - len(hit.pattern), position)))
+                    index = pattern_next[index]
+                out = out_node[fail[out]]
+        return select_matches(result, mode)
+
+    # ----- 序列化 -----
+
+    def save(self, path: Path | str) -> None:
+        """把编译后的表写入二进制文件。
+
+        文件只含表与各模式的终止节点，不含模式串与数据：load() 时由调用方按相同顺序提供。
+        """
+        if not self._built:
+            raise RuntimeError("必须在 save() 之前调用 build()")
+        tables = (
+            array("i", self._fail),
+            array("i", self._out_node),
+            array("i", self._pattern_head),
+            array("i", self._pattern_next),
+            array("i", (p.node_id for p in self._patterns)),
+            array("q", self._goto.keys()),
+            array("i", self._goto.values()),
+            array("I", self._root.keys()),
+            array("i", self._root.values()),
+        )
+        with open(path, "wb") as f:
+            f.write(_FILE_MAGIC)
+            f.write(_HEADER.pack(len(self._fail), len(self._patterns), len(self._goto), len(self._root)))
+            for table in tables:
+                if sys.byteorder != "little":
+                    table.byteswap()
+                f.write(table.tobytes())
+
+    @classmethod
+    def load(cls, path: Path | str, items: list[tuple[str, Any]]) -> "AcAutomaton":
+        """读取 save() 写出的文件，反序列化为已构建的自动机。
+
+        整个文件一次读入内存后逐表复制为 list / dict（搜索路径与 build() 的结果相同），
+        文件本身不被保留。
+        items 为构建时按顺序添加的 [(模式串, 数据), ...]（空模式串除外）。
+        文件格式不符或与 items 数量不一致时抛出 ValueError。
+        """
+        view = memoryview(Path(path).read_bytes())
+        if view[:len(_FILE_MAGIC)] != _FILE_MAGIC:
+            raise ValueError(f"不是自动机缓存文件: {path}")
+        offset = len(_FILE_MAGIC)
+        if len(view) < offset + _HEADER.size:
+            raise ValueError(f"自动机缓存文件被截断: {path}")
+        size, pattern_count, goto_count, root_count = _HEADER.unpack_from(view, offset)
+        offset += _HEADER.size
+        if pattern_count != len(items):
+            raise ValueError(f"自动机缓存与模式列表不一致: {path}")
+
+        def take(typecode: str, count: int) -> list[int]:
+            nonlocal offset
+            table = array(typecode)
+            end = offset + table.itemsize * count
+            if end > len(view):
+                raise ValueError(f"自动机缓存文件被截断: {path}")
+            table.frombytes(view[offset:end])
+            if sys.byteorder != "little":
+                table.byteswap()
+            offset = end
+            return table.tolist()
+
+        fail = take("i", size)
+        out_node = take("i", size)
+        head = take("i", size)
+        pattern_next = take("i", pattern_count)
+        node_ids = take("i", pattern_count)
+        goto_keys = take("q", goto_count)
+        goto_values = take("i", goto_count)
+        root_codes = take("I", root_count)
+        root_values = take("i", root_count)
+        if offset != len(view):
+            raise ValueError(f"自动机缓存文件长度不符: {path}")
+
+        automaton = cls()
+        automaton._trie = None
+        automaton._patterns = [
+            ACPattern(pattern, node_id, data)
+            for (pattern, data), node_id in zip(items, node_ids)
+        ]
+        automaton._root = dict(zip(root_codes, root_values))
+        automaton._goto = dict(zip(goto_keys, goto_values))
+        automaton._fail = fail
+        automaton._out_node = out_node
+        automaton._pattern_head = head
+        automaton._pattern_next = pattern_next
+        automaton._built = True
+        return automaton
+
     def search_batch(self, texts: list[str]) -> list[list[ACPattern]]:
         """批量搜索多个文本。每个输入文本返回一个匹配列表。"""
         return [self.search(t) for t in texts]
 
+    @property
+    def patterns(self) -> list[ACPattern]:
+        """已添加的全部模式（按添加顺序）。"""
+        return list(self._patterns)
+
     @property
     def pattern_count(self) -> int:
         """已添加的模式总数。"""
-        return sum(len(out) for out in self._output)
+        return len(self._patterns)
 
     @property
     def is_built(self) -> bool:
@@ -0,0 +1,143 @@
+"""
+translateFunc/matcher/ac_backend.py
+AC 自动机后端选择 —— 安装了 pyahocorasick 时可使用其 C 实现，否则使用纯 Python 的 AcAutomaton。
+
+两种后端提供相同的接口（add_pattern / build / search / find / search_batch / patterns /
+pattern_count / is_built）与相同的结果顺序：按结束位置，同一位置由长到短，
+同一模式串重复添加时按添加顺序。
+原生后端不支持 save() / load()，ac_cache 对其直接构建（C 实现的构建本身很快）。
+"""
+from __future__ import annotations
+import logging
+from typing import Any
+
+from translateFunc.enums import MatchMode
+from translateFunc.matcher.ac_automaton import AcAutomaton, ACMatch, ACPattern, _new_match, select_matches
+
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖
+    ahocorasick = None
+
+_logger = logging.getLogger("LCTA")
+
+BACKENDS = ("auto", "python", "pyahocorasick")
+
+
+class NativeAcAutomaton:
+    """基于 pyahocorasick 的 AcAutomaton 等价实现。
+
+    同一模式串的全部 ACPattern 以元组形式作为该键的值，一次命中按添加顺序展开。
+    ACPattern.node_id 为模式串（去重后）的编号。
+    """
+
+    def __init__(self):
+        if ahocorasick is None:
+            raise RuntimeError("pyahocorasick 未安装")
+        self._automaton = ahocorasick.Automaton()
+        self._patterns: list[ACPattern] = []
+        self._by_key: dict[str, list[ACPattern]] | None = {}
+        self._built: bool = False
+
+    def add_pattern(self, pattern: str, data: Any = None) -> None:
+        """向自动机添加模式串。必须在调用 build() 之前完成。"""
+        if self._built:
+            raise RuntimeError("不能在 build() 之后添加模式")
+        if not pattern:
+            return
+        group = self._by_key.get(pattern)
+        if group is None:
+            group = self._by_key[pattern] = []
+        node_id = group[0].node_id if group else len(self._by_key) - 1
+        entry = ACPattern(pattern=pattern, node_id=node_id, data=data)
+        group.append(entry)
+        self._patterns.append(entry)
+
+    def build(self) -> None:
+        """构建自动机。必须在所有 add_pattern() 调用之后执行。"""
+        if self._built:
+            return
+        for key, group in self._by_key.items():
+            self._automaton.add_word(key, tuple(group))
+        if self._by_key:
+            self._automaton.make_automaton()
+        self._by_key = None
+        self._built = True
+
+    def search(self, text: str) -> list[ACPattern]:
+        """在文本中搜索所有模式。返回匹配的 ACPattern 列表。"""
+        if not self._built:
+            raise RuntimeError("必须在 search() 之前调用 build()")
+        if not text or not self._patterns:
+            return []
+        result: list[ACPattern] = []
+        extend = result.extend
+        for _, hits in self._automaton.iter(text):
+            extend(hits)
+        return result
+
+    def find(self, text: str, mode: MatchMode = MatchMode.ALL) -> list[ACMatch]:
+        """搜索并返回带位置的命中，按 mode 过滤。"""
+        if not self._built:
+            raise RuntimeError("必须在 find() 之前调用 build()")
+        if not text or not self._patterns:
+            return []
+        new_match = _new_match
+        result: list[ACMatch] = []
+        append = result.append
+        for last, hits in self._automaton.iter(text):
+            end = last + 1
+            for hit in hits:
+                append(new_match(ACMatch, (hit.pattern, hit.data, end - len(hit.pattern), end)))
+        return select_matches(result, mode)
+
+    def search_batch(self, texts: list[str]) -> list[list[ACPattern]]:
+        """批量搜索多个文本。每个输入文本返回一个匹配列表。"""
+        return [self.search(t) for t in texts]
+
+    @property
+    def patterns(self) -> list[ACPattern]:
+        """已添加的全部模式（按添加顺序）。"""
+        return list(self._patterns)
+
+    @property
+    def pattern_count(self) -> int:
+        """已添加的模式总数。"""
+        return len(self._patterns)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+
+# 两种后端的公共类型
+Automaton = AcAutomaton | NativeAcAutomaton
+
+
+def available_backends() -> list[str]:
+    """当前环境可用的具体后端名称。"""
+    return ["python", "pyahocorasick"] if ahocorasick is not None else ["python"]
+
+
+def resolve_backend(name: str) -> str:
+    """把配置值解析为具体后端。
+
+    "auto" 在安装了 pyahocorasick 时选择原生后端；指定 pyahocorasick 但未安装时
+    记录警告并回退到 "python"。未知名称抛出 ValueError。
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"未知的 AC 自动机后端: {name}")
+    if name == "python":
+        return name
+    if ahocorasick is None:
+        if name == "pyahocorasick":
+            _logger.warning("pyahocorasick 未安装，AC 自动机回退为纯 Python 实现")
+        return "python"
+    return "pyahocorasick"
+
+
+def new_automaton(backend: str = "python") -> Automaton:
+    """创建指定后端（"auto" / "python" / "pyahocorasick"）的空自动机。"""
+    if resolve_backend(backend) == "pyahocorasick":
+        return NativeAcAutomaton()
+    return AcAutomaton()
@@ -0,0 +1,102 @@
+"""
+translateFunc/matcher/ac_cache.py
+已构建自动机的磁盘缓存。
+
+键为模式列表（模式串及其数据，按添加顺序）的哈希：术语表未变化时直接读取
+AcAutomaton.save() 写出的表，跳过 trie 构建与失败链接计算；
+加载得到的模式直接引用调用方传入的数据对象。
+只有纯 Python 后端使用缓存；原生后端（pyahocorasick）每次直接构建。
+每个名称只保留最近使用的 _KEEP 个缓存文件（命中时刷新修改时间），更早的文件被删除。
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from translateFunc import jsoncodec
+from translateFunc.matcher.ac_automaton import AcAutomaton
+from translateFunc.matcher.ac_backend import Automaton, new_automaton, resolve_backend
+
+_logger = logging.getLogger("LCTA")
+
+_CACHE_SUFFIX = ".acbin"
+_KEEP = 4
+
+
+def pattern_digest(items: list[tuple[str, Any]]) -> str:
+    """模式列表的哈希。数据按 JSON 序列化后参与计算，无法序列化的值按 str() 处理。"""
+    try:
+        raw = jsoncodec.dumps_bytes(items)
+    except TypeError:
+        raw = json.dumps(items, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _build(items: Iterable[tuple[str, Any]], backend: str = "python") -> Automaton:
+    automaton = new_automaton(backend)
+    for pattern, data in items:
+        automaton.add_pattern(pattern, data=data)
+    automaton.build()
+    return automaton
+
+
+def cached_automaton(
+    items: list[tuple[str, Any]],
+    cache_dir: Path | None,
+    name: str,
+    backend: str = "python",
+) -> Automaton:
+    """返回由 items 构建的自动机，命中缓存时从磁盘读取。
+
+    Args:
+        items: [(模式串, 数据), ...]，不含空模式串；数据参与缓存键计算
+        cache_dir: 缓存目录；None 时不使用缓存
+        name: 缓存文件名前缀，区分不同用途的自动机
+        backend: 自动机后端（见 ac_backend.BACKENDS）
+    """
+    backend = resolve_backend(backend)
+    if cache_dir is None or backend != "python":
+        return _build(items, backend)
+
+    path = cache_dir / f"{name}-{pattern_digest(items)[:32]}{_CACHE_SUFFIX}"
+    if path.exists():
+        try:
+            automaton = AcAutomaton.load(path, items)
+        except (OSError, ValueError) as e:
+            _logger.warning(f"自动机缓存 {path.name} 无法读取，将重新构建: {e}")
+        else:
+            _logger.debug(f"从缓存加载自动机 {path.name}（{automaton.pattern_count} 个模式）")
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return automaton
+
+    automaton = _build(items)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        automaton.save(temp)
+        temp.replace(path)
+    except OSError as e:
+        _logger.warning(f"写入自动机缓存 {path.name} 失败: {e}")
+        return automaton
+
+    _prune(cache_dir, name)
+    return automaton
+
+
+def _prune(cache_dir: Path, name: str) -> None:
+    """按修改时间只保留最近的 _KEEP 个同名缓存文件。"""
+    entries = []
+    for candidate in cache_dir.glob(f"{name}-*{_CACHE_SUFFIX}"):
+        try:
+            entries.append((candidate.stat().st_mtime, candidate))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _, stale in entries[_KEEP:]:
+        stale.unlink(missing_ok=True)
@@ -1,20 +1,36 @@
 """
 translateFunc/matcher/engine.py
 MatcherEngine —— 管理全部四个 AC 自动机实例，提供统一匹配接口。
+
+match_all 不逐个运行四个自动机：每次发布快照时把四组模式合并为一个自动机，
+模式数据为 [类别, 下标]，一次扫描后按类别分拣，返回的仍是各自动机中的 ACPattern 实例。
+
+给出 cache_dir 时，专有名词自动机与合并自动机通过 ac_cache 从磁盘缓存加载。
+命中带位置（ACMatch）；专有名词按 proper_match_mode 过滤，默认最左最长，
+长术语内部的短术语不再进入术语表。
+
+match_all 的结果按 (文本, JP, EN, 快照版本) 记忆在有界 LRU 中：UI / 关键词数据里
+大量重复的字符串只扫描一次。发布新快照时清空记忆，命中 / 未命中次数通过 memo_stats() 报告。
 """
 from __future__ import annotations
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import threading
 
-from translateFunc.matcher.ac_automaton import AcAutomaton, ACPattern
+from translateFunc.enums import MatchMode
+from translateFunc.matcher.ac_automaton import ACMatch, ACPattern, _new_match, select_matches
+from translateFunc.matcher.ac_backend import Automaton, new_automaton, resolve_backend
+from translateFunc.matcher.ac_cache import cached_automaton
 
 
 @dataclass
 class MatchResult:
     """同时对文本运行全部匹配器的聚合结果。"""
-    proper_matches: list[ACPattern] = field(default_factory=list)
-    role_matches: list[ACPattern] = field(default_factory=list)
-    affect_id_matches: list[ACPattern] = field(default_factory=list)
-    affect_name_matches: list[ACPattern] = field(default_factory=list)
+    proper_matches: list[ACMatch] = field(default_factory=list)
+    role_matches: list[ACMatch] = field(default_factory=list)
+    affect_id_matches: list[ACMatch] = field(default_factory=list)
+    affect_name_matches: list[ACMatch] = field(default_factory=list)
 
     @property
     def has_any(self) -> bool:
@@ -22,63 +38,150 @@ class MatchResult:
                     or self.affect_id_matches or self.affect_name_matches)
 
 
+@dataclass(frozen=True)
+class MatcherSnapshot:
+    """某一时刻全部自动机与数据的不可变视图。
+
+    构建方法只在新自动机完全构建后整体替换快照，读取方因此不会看到半构建状态。
+    """
+    proper_ac: Automaton
+    role_ac: Automaton
+    affect_id_ac: Automaton
+    affect_name_ac: Automaton
+    combined_ac: Automaton
+    # 合并自动机的 [类别, 下标] 指向的各类别模式列表
+    combined_sources: tuple[list[ACPattern], ...] = ((), (), (), ())
+    role_data: list[dict] = field(default_factory=list)
+    affect_data: list[dict] = field(default_factory=list)
+    role_by_id: dict[str, dict] = field(default_factory=dict)
+    # 每次发布递增，用作匹配记忆键的一部分
+    version: int = 0
+
+
+# 合并自动机中的类别标记，与 MatchResult 字段一一对应
+_PROPER, _ROLE, _AFFECT_ID, _AFFECT_NAME = range(4)
+
+
+def _built(automaton: Automaton) -> Automaton:
+    automaton.build()
+    return automaton
+
+
+def _combine(
+    automata: tuple[Automaton, ...],
+    cache_dir: Path | None,
+    backend: str,
+) -> tuple[Automaton, tuple[list[ACPattern], ...]]:
+    """按顺序合并各自动机的模式，数据为 [类别, 该类别模式列表中的下标]。
+
+    数据只含模式位置，缓存键因此只取决于各类别的模式串。
+    """
+    sources = tuple(automaton.patterns for automaton in automata)
+    items = [
+        (pattern.pattern, [tag, index])
+        for tag, patterns in enumerate(sources)
+        for index, pattern in enumerate(patterns)
+    ]
+    return cached_automaton(items, cache_dir, "combined", backend), sources
+
+
 class MatcherEngine:
     """统一匹配引擎，管理四个 AC 自动机：
     专有名词、角色、状态效果 ID（如 [Combustion]）、状态效果名称（如 '燃烧 '）。
+
+    自动机与数据保存在 MatcherSnapshot 中，构建时写时复制：
+    角色 / 状态效果可以在其他文件翻译期间重建，正在匹配的线程继续使用旧快照。
     """
 
-    def __init__(self):
-        self._proper_ac = AcAutomaton()
-        self._role_ac = AcAutomaton()
-        self._affect_id_ac = AcAutomaton()
-        self._affect_name_ac = AcAutomaton()
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        proper_match_mode: MatchMode = MatchMode.LEFTMOST_LONGEST,
+        memo_size: int = 8192,
+        backend: str = "python",
+    ):
+        # 已构建自动机的磁盘缓存目录；None 时每次重新构建
+        self._cache_dir = cache_dir
+        # 专有名词的匹配模式；角色与状态效果始终返回全部命中
+        self._proper_match_mode = proper_match_mode
+        # AC 自动机后端："auto" / "python" / "pyahocorasick"，构造时解析为具体后端
+        self._backend = resolve_backend(backend)
+        # 专有名词由 build_proper 构建；其余自动机先以空数据构建，
+        # 后续通过 _update_roles / _update_affects 用实际数据重建。
+        self._snapshot = MatcherSnapshot(
+            proper_ac=new_automaton(self._backend),
+            role_ac=_built(new_automaton(self._backend)),
+            affect_id_ac=_built(new_automaton(self._backend)),
+            affect_name_ac=_built(new_automaton(self._backend)),
+            combined_ac=_built(new_automaton(self._backend)),
+        )
+        # 串行化写入方，避免并发构建互相覆盖对方的字段
+        self._build_lock = threading.Lock()
+        # match_all 结果记忆：(text, jp, en, version) → MatchResult，memo_size <= 0 时关闭
+        self._memo: OrderedDict[tuple, MatchResult] = OrderedDict()
+        self._memo_size = memo_size
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
 
-        self._role_data: list[dict] = []
-        self._affect_data: list[dict] = []
+    def snapshot(self) -> MatcherSnapshot:
+        """返回当前快照。同一快照内的各自动机与数据相互一致。"""
+        return self._snapshot
 
-        # 确保所有 AC 自动机在翻译优先文件前已处于已构建状态，
-        # 后续通过 _update_roles / _update_affects 用实际数据重建。
-        self._role_ac.build()
-        self._affect_id_ac.build()
-        self._affect_name_ac.build()
+    def _publish(self, **changes) -> None:
+        with self._build_lock:
+            snap = replace(self._snapshot, **changes)
+            combined_ac, sources = _combine(
+                (snap.proper_ac, snap.role_ac, snap.affect_id_ac, snap.affect_name_ac),
+                self._cache_dir,
+                self._backend,
+            )
+            self._snapshot = replace(
+                snap, combined_ac=combined_ac, combined_sources=sources, version=snap.version + 1,
+            )
+        with self._memo_lock:
+            self._memo.clear()
 
     # ----- 构建 -----
 
     def build_proper(self, proper_terms: list[dict]) -> None:
-        """从 [{term, translation, note, ...}, ...] 构建专有名词 AC 自动机。"""
-        self._proper_ac = AcAutomaton()
-        for item in proper_terms:
-            term = item.get("term", "")
-            if term:
-                self._proper_ac.add_pattern(term, data=item)
-        self._proper_ac.build()
+        """从 [{term, translation, note, ...}, ...] 构建专有名词 AC 自动机。
+
+        术语表未变化且配置了缓存目录时，从磁盘缓存加载已构建的自动机。
+        """
+        items = [(item["term"], item) for item in proper_terms if item.get("term", "")]
+        self._publish(proper_ac=cached_automaton(items, self._cache_dir, "proper", self._backend))
 
     def build_roles(self, role_items: list[dict]) -> None:
         """从 [{id, kr, cn, nickName}, ...] 构建角色 AC 自动机。
         角色通过 `id` 字段精确匹配，非子串匹配。"""
-        self._role_data = role_items
-        self._role_by_id_cache = None  # 清除缓存
-        self._role_ac = AcAutomaton()
+        role_ac = new_automaton(self._backend)
         for item in role_items:
             role_id = item.get("id", "")
             if role_id:
-                self._role_ac.add_pattern(role_id, data=item)
-        self._role_ac.build()
+                role_ac.add_pattern(role_id, data=item)
+        self._publish(
+            role_ac=_built(role_ac),
+            role_data=role_items,
+            role_by_id={r.get("id", ""): r for r in role_items},
+        )
 
     def build_affects(self, affect_items: list[dict]) -> None:
         """从 [{id, kr, jp, en, cn, desc}, ...] 构建状态效果匹配器。"""
-        self._affect_data = affect_items
-        self._affect_id_ac = AcAutomaton()
-        self._affect_name_ac = AcAutomaton()
+        affect_id_ac = new_automaton(self._backend)
+        affect_name_ac = new_automaton(self._backend)
         for item in affect_items:
             aff_id = f'[{item.get("id", "")}]'
             aff_name = f'{item.get("kr", "")} '
             if item.get("id"):
-                self._affect_id_ac.add_pattern(aff_id, data=item)
+                affect_id_ac.add_pattern(aff_id, data=item)
             if item.get("kr"):
-                self._affect_name_ac.add_pattern(aff_name, data=item)
-        self._affect_id_ac.build()
-        self._affect_name_ac.build()
+                affect_name_ac.add_pattern(aff_name, data=item)
+        self._publish(
+            affect_id_ac=_built(affect_id_ac),
+            affect_name_ac=_built(affect_name_ac),
+            affect_data=affect_items,
+        )
 
     # ----- 匹配 -----
 
@@ -89,57 +192,103 @@ class MatcherEngine:
         jp_text: str = "",
         en_text: str = "",
     ) -> MatchResult:
-        """对文本运行全部匹配器，并用 JP/EN 参考过滤韩文名称误匹配。"""
-        affect_name_matches = [
-            match for match in self._affect_name_ac.search(text)
-            if self._is_affect_name_supported(match.data, text, jp_text, en_text)
-        ]
+        """单次扫描运行全部匹配器，并用 JP/EN 参考过滤韩文名称误匹配。
+
+        结果可能来自记忆并被多次返回，调用方不应修改其中的列表。
+        """
+        snap = self._snapshot
+        key = None
+        if self._memo_size > 0 and isinstance(text, str):
+            key = (text, jp_text, en_text, snap.version)
+            with self._memo_lock:
+                cached = self._memo.get(key)
+                if cached is not None:
+                    self._memo.move_to_end(key)
+                    self.memo_hits += 1
+                    return cached
+                self.memo_misses += 1
+
+        result = self._match(snap, text, jp_text, en_text)
+        if key is not None:
+            with self._memo_lock:
+                self._memo[key] = result
+                if len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        return result
+
+    def _match(self, snap: MatcherSnapshot, text: str, jp_text: str, en_text: str) -> MatchResult:
+        """在给定快照上执行一次合并扫描（不经过记忆）。"""
+        sources = snap.combined_sources
+        groups: tuple[list[ACMatch], ...] = ([], [], [], [])
+        for _, (tag, index), start, end in snap.combined_ac.find(text):
+            source = sources[tag][index]
+            groups[tag].append(_new_match(ACMatch, (source.pattern, source.data, start, end)))
+
+        affect_name_matches = groups[_AFFECT_NAME]
+        if affect_name_matches:
+            # 参考文本每次调用只准备一次；与韩文相同的参考视为不可用
+            jp_ref = jp_text if jp_text != text else ""
+            en_ref = en_text.casefold() if en_text and en_text != text else ""
+            affect_name_matches = [
+                match for match in affect_name_matches
+                if self._is_affect_name_supported(match.data, jp_ref, en_ref)
+            ]
         return MatchResult(
-            proper_matches=self._proper_ac.search(text),
-            role_matches=self._role_ac.search(text),
-            affect_id_matches=self._affect_id_ac.search(text),
+            proper_matches=select_matches(groups[_PROPER], self._proper_match_mode),
+            role_matches=groups[_ROLE],
+            affect_id_matches=groups[_AFFECT_ID],
             affect_name_matches=affect_name_matches,
         )
 
     @staticmethod
     def _is_affect_name_supported(
         affect_data: object,
-        kr_text: str,
-        jp_text: str,
-        en_text: str,
+        jp_ref: str,
+        en_ref_folded: str,
     ) -> bool:
-        """有可用 JP/EN 对照时，要求至少一种语言同时出现对应效果名。"""
+        """有可用 JP/EN 对照时，要求至少一种语言同时出现对应效果名。
+
+        en_ref_folded 为已 casefold 的英文参考；参考为空表示该语言不可用。
+        """
         if not isinstance(affect_data, dict):
             return True
 
         comparisons: list[bool] = []
         jp_name = str(affect_data.get("jp", "") or "").strip()
-        if jp_name and jp_text and jp_text != kr_text:
-            comparisons.append(jp_name in jp_text)
+        if jp_name and jp_ref:
+            comparisons.append(jp_name in jp_ref)
 
         en_name = str(affect_data.get("en", "") or "").strip()
-        if en_name and en_text and en_text != kr_text:
-            comparisons.append(en_name.casefold() in en_text.casefold())
+        if en_name and en_ref_folded:
+            comparisons.append(en_name.casefold() in en_ref_folded)
 
         return any(comparisons) if comparisons else True
 
-    def match_proper(self, text: str) -> list[ACPattern]:
-        """仅匹配专有名词。"""
-        return self._proper_ac.search(text)
+    def match_proper(self, text: str) -> list[ACMatch]:
+        """仅匹配专有名词（按 proper_match_mode 过滤）。"""
+        return self._snapshot.proper_ac.find(text, self._proper_match_mode)
+
+    def memo_stats(self) -> dict[str, int]:
+        """匹配记忆的命中 / 未命中次数与当前条目数。"""
+        with self._memo_lock:
+            return {"hits": self.memo_hits, "misses": self.memo_misses, "size": len(self._memo)}
 
     # ----- 访问器 -----
 
+    @property
+    def backend(self) -> str:
+        """实际使用的自动机后端（"python" 或 "pyahocorasick"）。"""
+        return self._backend
+
     @property
     def role_data(self) -> list[dict]:
-        return self._role_data
+        return self._snapshot.role_data
 
     @property
     def affect_data(self) -> list[dict]:
-        return self._affect_data
+        return self._snapshot.affect_data
 
     @property
     def role_by_id(self) -> dict[str, dict]:
         """以角色 ID 为键的 O(1) 查找表。"""
-        if not hasattr(self, "_role_by_id_cache") or self._role_by_id_cache is None:
-            self._role_by_id_cache = {r.get("id", ""): r for r in self._role_data}
-        return self._role_by_id_cache
+        return self._snapshot.role_by_id
@@ -43,10 +43,14 @@ class ProperAnalyzer:
 
     def __init__(self, kr_path: Path | None = None,
                  jp_path: Path | None = None,
-                 en_path: Path | None = None):
+                 en_path: Path | None = None,
+                 cache_dir: Path | None = None,
+                 ac_backend: str = "python"):
         self._kr_path = kr_path
         self._jp_path = jp_path
         self._en_path = en_path
+        self._cache_dir = cache_dir
+        self._ac_backend = ac_backend
         self._terms: list[ProperTerm] = []
 
     # ----- 获取 -----
@@ -83,7 +87,8 @@ class ProperAnalyzer:
         if self._kr_path and self._jp_path and self._en_path and kr_texts:
             from translateFunc.proper.analyze import extract_contexts_batch
             contexts_map = extract_contexts_batch(
-                kr_texts, self._kr_path, self._jp_path, self._en_path, max_examples=20
+                kr_texts, self._kr_path, self._jp_path, self._en_path, max_examples=20,
+                cache_dir=self._cache_dir, backend=self._ac_backend,
             )
 
         # 构建 ProperTerm 列表
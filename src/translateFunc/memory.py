@@ -0,0 +1,132 @@
+"""
+translateFunc/memory.py
+TranslationMemory —— 跨运行持久化的翻译记忆（SQLite）。
+
+键为文本块内容及其翻译上下文的哈希：KR/JP/EN 原文、引用的术语表条目、
+状态效果、角色模型，以及调用方给出的上下文指纹（模型名、提示词版本等）。
+RequestBuilder 在构建 text_blocks 前查询，命中的文本块不再发送给 LLM。
+"""
+from __future__ import annotations
+from datetime import datetime
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+_logger = logging.getLogger("LCTA")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    translation TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+class TranslationMemory:
+    """线程安全的翻译记忆存储。path 为 None 时仅保存在内存中。"""
+
+    def __init__(self, path: Path | None = None):
+        self._path = path
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path) if path is not None else ":memory:",
+            check_same_thread=False,
+        )
+        with self._lock:
+            if path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    @staticmethod
+    def make_key(block: dict, reference: dict, context: str = "") -> str:
+        """计算文本块的记忆键。
+
+        Args:
+            block: 文本块（kr/jp/en/proper_refs/affect_refs/model）
+            reference: 该文本块实际引用的 {"proper_terms", "affects", "models"}
+            context: 调用方提供的上下文指纹（模型名、提示词版本等）
+        """
+        payload = {
+            "kr": block.get("kr", ""),
+            "jp": block.get("jp", ""),
+            "en": block.get("en", ""),
+            "model": block.get("model", ""),
+            "proper_terms": sorted(
+                [
+                    t.get("term", ""),
+                    t.get("translation", ""),
+                    t.get("note", ""),
+                ]
+                for t in reference.get("proper_terms", [])
+            ),
+            "affects": sorted(
+                [a.get("id", ""), a.get("cn", "")]
+                for a in reference.get("affects", [])
+            ),
+            "models": sorted(
+                json.dumps(m, ensure_ascii=False, sort_keys=True, default=str)
+                for m in reference.get("models", [])
+            ),
+            "context": context,
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """查询单条记忆。未命中返回 None。"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put_many(self, items: Iterable[tuple[str, str]]) -> int:
+        """批量写入记忆，已存在的键被覆盖。返回写入条数。"""
+        now = datetime.now().isoformat()
+        rows = [(key, translation, now) for key, translation in items]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation, updated_at) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self.writes += len(rows)
+        return len(rows)
+
+    def put(self, key: str, translation: str) -> None:
+        """写入单条记忆。"""
+        self.put_many([(key, translation)])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> dict:
+        """返回本次运行的命中/未命中/写入计数。"""
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -5,16 +5,23 @@ TranslationPipeline —— 翻译运行的端到端编排。
 流程：
   1. ProperAnalyzer.fetch_and_build() —— 获取术语，构建 JP/EN 上下文
   2. MatcherEngine.build() —— 填充全部 4 个 AC 自动机
-  3. 串行处理优先文件（ScenarioModelCodes、BattleKeywords）
-  4. WorkerPool.map() 并发处理剩余文件
-  5. 聚合为 PipelineSummary
+  3. WorkerPool.map() 按依赖图并发处理全部文件：
+     ScenarioModelCodes 完成后更新角色，剧情文件等待角色；
+     BattleKeywords 完成后更新状态效果，技能文件等待状态效果；其余文件立即开始；
+     就绪文件按 planner 预估的工作量最长优先开始
+  4. 聚合为 PipelineSummary
+
+dry_run 时照常加载文件、匹配并构建请求，但不调用 LLM、不保存译文，
+只统计各阶段调用次数与 token 数，按历史吞吐量预测耗时。
 """
 from __future__ import annotations
 from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
 import json
 import logging
 import os
+import shutil
 import sys
 import tempfile
 from itertools import zip_longest
@@ -24,14 +31,23 @@ _logger = logging.getLogger("LCTA")  # 与 LogManager 一致，确保日志正
 
 from translateFunc.config import (
     TranslateConfig, ProcessOutcome, PipelineSummary,
-    PathConfig, FilePathConfig, inject_thinking_mode,
+    PathConfig, FilePathConfig, inject_thinking_mode, glossary_digest,
     _suppress_translatekit_log,
 )
-from translateFunc.enums import ProcessResult, FileType
+from translateFunc.enums import ProcessResult, FileType, MatchMode
 from translateFunc.matcher.engine import MatcherEngine
 from translateFunc.matcher.proper import ProperAnalyzer
 from translateFunc.processor import FileProcessor
+from translateFunc.request_engine import RequestEngine
+from translateFunc.rate_limit import AdaptiveLimiter
+from translateFunc.budget import RunBudget
+from translateFunc.dedup import SharedTranslations
+from translateFunc.batcher import RequestBatcher
+from translateFunc.usage import UsageMeter, latency_percentiles
 from translateFunc.workers import WorkerPool
+from translateFunc.planner import ThroughputMeter, estimate_file_work
+from translateFunc.checkpoint import CHECKPOINT_NAME, CheckpointJournal
+from translateFunc.sharding import assign_shards, write_bundle
 from translateFunc.get_proper import fetch as fetch_proper
 from translateFunc.translate_request import TRANSLATOR_TRANS
 # system_prompt 由 processor 通过 translator.update_config() 动态更新
@@ -44,12 +60,21 @@ def _get_log_manager():
     return LogManager()
 
 
+# 依赖图事件：对应文件处理完成且匹配引擎已更新
+_EVENT_ROLES = "roles"
+_EVENT_AFFECTS = "affects"
+
+
 class TranslationPipeline:
     """编排完整翻译流程的管道类。"""
 
     def __init__(self, config: TranslateConfig):
         self._config = config
-        self._engine = MatcherEngine()
+        self._engine = MatcherEngine(
+            cache_dir=config.automaton_cache_dir,
+            proper_match_mode=MatchMode(config.proper_match_mode),
+            backend=config.ac_backend,
+        )
         self._analyzer: ProperAnalyzer | None = None
         self._recorder: "TranslationRecorder | None" = None
 
@@ -57,6 +82,30 @@ class TranslationPipeline:
             from translateFunc.recorder import TranslationRecorder
             self._recorder = TranslationRecorder(config.dump_path)
 
+        self._memory: "TranslationMemory | None" = None
+        if config.translation_memory and config.is_llm:
+            from translateFunc.memory import TranslationMemory
+            self._memory = TranslationMemory(config.translation_memory_path)
+
+        self._request_engine: RequestEngine | None = None
+        self._rate_limiter: AdaptiveLimiter | None = None
+        self._checkpoint: CheckpointJournal | None = None
+        self._prepared_files: set[Path] = set()
+        self._throughput = ThroughputMeter.load(config.throughput_path)
+        self._shared: SharedTranslations | None = None
+        if config.dedup and config.is_llm:
+            self._shared = SharedTranslations()
+        self._batcher: RequestBatcher | None = None
+        if config.batch_small_files and config.is_llm and config.enable_concurrent and not config.dry_run:
+            self._batcher = RequestBatcher(max_blocks=config.batch_max_blocks)
+        self._usage = UsageMeter()
+        self._budget: RunBudget | None = None
+        if config.token_budget > 0 and config.is_llm and not config.dry_run:
+            self._budget = RunBudget(config.token_budget, soft_ratio=config.budget_soft_ratio)
+
+        # 条目索引在获取术语后加载：指纹包含术语表内容
+        self._entry_index: "EntryIndex | None" = None
+
         # 回调函数
         self._on_log: Callable[[str], None] = lambda msg: None
         self._on_status: Callable[[str], None] = lambda msg: None
@@ -94,7 +143,7 @@ class TranslationPipeline:
         profiler.reset()
 
         self._on_status("正在初始化...")
-        _logger.info("=== 阶段 1/5: 解析路径配置 ===")
+        _logger.info("=== 阶段 1/4: 解析路径配置 ===")
 
         # 1. 解析路径
         game_path = self._config.game_path
@@ -107,7 +156,8 @@ class TranslationPipeline:
         llc_path = Path(self._config.llc_path) if self._config.llc_path and self._config.enable_dev_settings else lang_path / "LLC_zh-CN"
 
         output_dir = self._config.output_dir / "LLc-CN-LCTA"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if not self._config.dry_run:
+            output_dir.mkdir(parents=True, exist_ok=True)
 
         base_path_config = PathConfig(
             target_path=output_dir,
@@ -118,17 +168,23 @@ class TranslationPipeline:
         )
 
         # 2. 获取专有名词
-        _logger.info("=== 阶段 2/5: 获取专有名词 ===")
+        _logger.info("=== 阶段 2/4: 获取专有名词 ===")
         with profiler.phase("获取专有名词"):
             if self._config.enable_proper:
                 self._on_status("正在获取专有名词...")
-                self._analyzer = ProperAnalyzer(kr_path, jp_path, en_path)
+                self._analyzer = ProperAnalyzer(
+                    kr_path, jp_path, en_path,
+                    cache_dir=self._config.automaton_cache_dir,
+                    ac_backend=self._config.ac_backend,
+                )
 
                 with profiler.phase("专有名词抓取"):
                     raw_terms = self._analyzer.fetch_terms(
                         auto_fetch=self._config.auto_fetch_proper,
                         proper_path=self._config.proper_path,
                     )
+                # 术语表内容参与配置指纹：术语变化时不沿用旧输出
+                self._config = replace(self._config, glossary_digest=glossary_digest(raw_terms))
 
                 with profiler.phase("专有名词分析"):
                     proper_terms = self._analyzer.analyze(raw_terms)
@@ -140,58 +196,147 @@ class TranslationPipeline:
                 self._log_bridge.info(f"已加载 {len(proper_terms)} 个专有名词")
             else:
                 self._log_bridge.info("专有名词分析已跳过（enable_proper=False）")
+        self._load_entry_index()
 
         # 3. 构建翻译器
-        _logger.info("=== 阶段 3/5: 构建匹配引擎与翻译器 ===")
+        _logger.info("=== 阶段 3/4: 构建匹配引擎与翻译器 ===")
         with profiler.phase("构建匹配引擎"):
             translator = self._build_translator()
+            if self._config.is_llm and self._config.max_concurrent_requests > 0:
+                self._request_engine = RequestEngine(
+                    lambda: self._build_translator(enable_cache=False),
+                    max_concurrent=self._config.max_concurrent_requests,
+                )
+                self._request_engine.start()
+                self._log_bridge.info(
+                    f"请求引擎已启动，最大在途请求数 {self._config.max_concurrent_requests}"
+                )
+            if self._config.is_llm and self._config.adaptive_rate_limit:
+                self._rate_limiter = AdaptiveLimiter(
+                    self._config.max_concurrent_requests or self._config.max_workers
+                )
+
+        try:
+            return self._run_files(
+                kr_path, base_path_config, output_dir, translator, profiler,
+            )
+        finally:
+            if self._request_engine is not None:
+                self._request_engine.close()
+                stats = self._request_engine.stats()
+                self._log_bridge.info(
+                    f"请求引擎: 完成 {stats['completed']} 个请求，"
+                    f"峰值在途 {stats['peak_in_flight']}/{stats['max_concurrent']}"
+                )
+                self._request_engine = None
+            if self._rate_limiter is not None:
+                stats = self._rate_limiter.stats()
+                self._log_bridge.info(
+                    f"自适应限流: 当前并发上限 {stats['limit']}/{stats['maximum']}，"
+                    f"最低 {stats['lowest_limit']}，降速 {stats['decreases']} 次"
+                )
+                self._rate_limiter = None
 
+    def _run_files(
+        self,
+        kr_path: Path,
+        base_path_config: PathConfig,
+        output_dir: Path,
+        translator: TranslatorBase,
+        profiler: TimingProfiler,
+    ) -> PipelineSummary:
+        """处理全部目标文件（阶段 4、5），返回 PipelineSummary。"""
         # 4. 收集目标文件
         target_files = list(kr_path.rglob("*.json"))
         self._log_bridge.info(f"找到 {len(target_files)} 个文件")
 
-        # 5. 重排序：优先文件放在前面
+        if self._config.checkpoint and not self._config.dry_run:
+            self._checkpoint = CheckpointJournal(
+                output_dir / CHECKPOINT_NAME, self._config.fingerprint(),
+            )
+            if self._checkpoint.stale:
+                self._log_bridge.info(
+                    f"断点日志中 {self._checkpoint.stale} 条记录的配置（含术语表 / 提示词模板）已变化，不再沿用"
+                )
+            if self._checkpoint.resumable:
+                self._log_bridge.info(
+                    f"断点续跑: 日志中有 {self._checkpoint.resumable} 个已完成文件，"
+                    f"输入未变化的将直接沿用"
+                )
+
+        # 5. 依赖图：关键字 / 模型文件完成后分别更新状态效果 / 角色，
+        #    仅技能文件等待状态效果、剧情文件等待角色，其余文件立即开始
         has_prefix = self._config.has_prefix
         model_name = "KR_ScenarioModelCodes-AutoCreated.json" if has_prefix else "ScenarioModelCodes-AutoCreated.json"
         keyword_name = "KR_BattleKeywords.json" if has_prefix else "BattleKeywords.json"
         model_file = kr_path / model_name
         keyword_file = kr_path / keyword_name
-        if model_file.exists() and keyword_file.exists():
-            target_files.remove(model_file)
-            target_files.remove(keyword_file)
-            priority_files = [keyword_file, model_file]
-        else:
-            if not model_file.exists():
-                self._log_bridge.warning(f"未找到模型文件 {model_name}，跳过优先处理")
-            if not keyword_file.exists():
-                self._log_bridge.warning(f"未找到关键字文件 {keyword_name}，跳过优先处理")
-            priority_files = []
-
-        # 6. 串行处理优先文件
-        _logger.info("=== 阶段 4/5: 处理优先文件 ===")
+        provides: dict[Path, tuple[str, Callable[[], None]]] = {}
+        if not model_file.exists():
+            self._log_bridge.warning(f"未找到模型文件 {model_name}，剧情文件不等待角色数据")
+        elif self._config.enable_role:
+            provides[model_file] = (
+                _EVENT_ROLES,
+                lambda: self._update_roles(model_file, base_path_config, has_prefix),
+            )
+        if not keyword_file.exists():
+            self._log_bridge.warning(f"未找到关键字文件 {keyword_name}，技能文件不等待状态效果")
+        elif self._config.enable_skill:
+            provides[keyword_file] = (
+                _EVENT_AFFECTS,
+                lambda: self._update_affects(keyword_file, base_path_config, has_prefix),
+            )
+        # 提供事件的文件排在最前，尽早提交
+        for pf in (model_file, keyword_file):
+            if pf in provides:
+                target_files.remove(pf)
+                target_files.insert(0, pf)
+
+        def work_of(file_path: Path) -> int:
+            return estimate_file_work(
+                FilePathConfig(KR_path=file_path, _PathConfig=base_path_config, has_prefix=has_prefix),
+                self._config,
+            )
+
+        # 分片：prepare 只处理优先文件；各分片处理按工作量划分给自己的文件，
+        # 优先文件复制 prepare 的输出（未提供时自行处理），用于更新角色 / 状态效果
+        shard_index, shard_count = self._config.shard_index, self._config.shard_count
+        if self._config.prepare_only:
+            target_files = [f for f in target_files if f in provides]
+            self._log_bridge.info(f"prepare: 只处理 {len(target_files)} 个优先文件")
+        elif shard_count > 1:
+            assignment = assign_shards(
+                {f.relative_to(kr_path).as_posix(): work_of(f) for f in target_files if f not in provides},
+                shard_count,
+            )
+            target_files = [
+                f for f in target_files
+                if f in provides or assignment[f.relative_to(kr_path).as_posix()] == shard_index
+            ]
+            if self._config.prepared_dir is not None:
+                self._prepared_files = set(provides)
+            self._log_bridge.info(f"分片 {shard_index}/{shard_count}: 处理 {len(target_files)} 个文件")
+
+        # 6. 按依赖图并发处理全部文件
+        _logger.info(f"=== 阶段 4/4: 并发翻译 ({len(target_files)} 个文件) ===")
         summary = PipelineSummary()
-        with profiler.phase("处理优先文件"):
-            for pf in priority_files:
-                outcome = self._process_one(pf, base_path_config, has_prefix, translator)
-                self._record_outcome(outcome, summary)
-
-                # 处理完优先文件后更新引擎
-                if pf == priority_files[1] and self._config.enable_role:  # model 文件（第2个）
-                    self._update_roles(pf, base_path_config, has_prefix)
-                elif pf == priority_files[0] and self._config.enable_skill:  # keyword 文件（第1个）
-                    self._update_affects(pf, base_path_config, has_prefix)
-
-        # 7. 并发处理剩余文件
-        _logger.info(f"=== 阶段 5/5: 并发翻译 ({len(target_files)} 个文件) ===")
         self._on_status("正在执行翻译...")
         self._on_progress(10, "正在执行翻译...")
 
         with profiler.phase("并发翻译"):
             if self._config.enable_concurrent and len(target_files) > 1:
-                worker_pool = WorkerPool(
-                    translator_factory=lambda: self._build_translator(),
-                    max_workers=self._config.max_workers,
-                )
+                if self._request_engine is not None:
+                    # HTTP 请求全部经请求引擎发送（线程本地翻译器），文件线程共享主翻译器；
+                    # 分片排入引擎的共享队列，文件线程数仍为 max_workers
+                    worker_pool = WorkerPool(
+                        translator_factory=lambda: translator,
+                        max_workers=self._config.max_workers,
+                    )
+                else:
+                    worker_pool = WorkerPool(
+                        translator_factory=lambda: self._build_translator(),
+                        max_workers=self._config.max_workers,
+                    )
 
                 def process_fn(file_path, translator):
                     return self._process_one(file_path, base_path_config, has_prefix, translator)
@@ -201,20 +346,125 @@ class TranslationPipeline:
                     self._on_progress(pct, f"处理 {fname} ({done}/{total})")
                     self._on_check_running()
 
-                outcomes = worker_pool.map(target_files, process_fn, on_progress=progress_cb)
+                outcomes = worker_pool.map(
+                    target_files, process_fn, on_progress=progress_cb,
+                    needs=lambda file_path: self._file_dependencies(
+                        file_path, base_path_config, has_prefix,
+                    ),
+                    provides=provides,
+                    weight=work_of,
+                )
             else:
+                # 串行时提供事件的文件已排在最前，按顺序处理即满足依赖
                 outcomes = []
                 for i, file_path in enumerate(target_files):
                     outcome = self._process_one(file_path, base_path_config, has_prefix, translator)
+                    if file_path in provides:
+                        provides[file_path][1]()
                     outcomes.append(outcome)
                     pct = 10 + int(((i + 1) / len(target_files)) * 80)
                     self._on_progress(pct, f"处理 {outcome.file_name} ({i + 1}/{len(target_files)})")
 
-        for o in outcomes:
+        for file_path, o in zip(target_files, outcomes):
+            # 分片运行时优先文件只计入 prepare（或未提供 prepare 时的第 1 片），避免合并后重复计数
+            if shard_count > 1 and file_path in provides and (
+                (o.extra or {}).get("prepared") or shard_index != 1
+            ):
+                continue
             self._record_outcome(o, summary)
 
+        if self._memory is not None:
+            stats = self._memory.stats()
+            self._log_bridge.info(
+                f"翻译记忆: 命中 {stats['hits']} 个文本块，"
+                f"未命中 {stats['misses']} 个，写入 {stats['writes']} 个"
+            )
+
+        if self._shared is not None:
+            stats = self._shared.stats()
+            self._log_bridge.info(
+                f"运行内去重: {stats['unique']} 个不同原文，"
+                f"{stats['fanned_out']} 个文本块沿用其他文件的译文，"
+                f"{stats['self_translated']} 个因所有者失败自行翻译"
+            )
+
+        if self._batcher is not None:
+            stats = self._batcher.stats()
+            self._log_bridge.info(
+                f"小文件合并: {stats['batched_files']} 个文件分片合并为 {stats['batches']} 个请求"
+            )
+
+        if self._config.reuse_files:
+            reused = sum(
+                1 for o in outcomes
+                if o.result == ProcessResult.REUSED_PREVIOUS
+            )
+            self._log_bridge.info(f"增量复用: {reused} 个文件直接沿用上次输出")
+
+        if self._checkpoint is not None:
+            resumed = sum(1 for o in outcomes if (o.extra or {}).get("resumed"))
+            self._log_bridge.info(f"断点续跑: {resumed} 个文件沿用上次运行的结果")
+            self._checkpoint = None
+
+        if self._budget is not None:
+            summary.degradations = list(self._budget.degradations)
+            summary.budget = self._budget.stats()
+            self._log_bridge.info(
+                f"token 预算: 已用 {summary.budget['spent_tokens']}/{summary.budget['limit_tokens']}，"
+                f"因预算跳过 {summary.budget['skipped'] or '无'}"
+            )
+
+        if self._usage.stats()["calls"]:
+            summary.usage = self._usage.summary()
+            summary.latencies = self._usage.latencies()
+            latency = latency_percentiles(summary.latencies)
+            for stage, counts in summary.usage["by_stage"].items():
+                timing = latency.get(stage, {})
+                self._log_bridge.info(
+                    f"LLM 用量 [{stage}]: {counts['calls']} 次调用，"
+                    f"输入 {counts['prompt_tokens']} / 输出 {counts['completion_tokens']} / "
+                    f"缓存命中 {counts['cached_tokens']} tokens，"
+                    f"耗时 p50={timing.get('p50', 0)}s p95={timing.get('p95', 0)}s "
+                    f"p99={timing.get('p99', 0)}s"
+                )
+
+        if self._config.dry_run:
+            self._report_estimate(summary)
+        elif self._entry_index is not None:
+            from translateFunc.entry_index import ENTRY_INDEX_NAME
+            self._entry_index.save(output_dir / "Info" / ENTRY_INDEX_NAME)
+
+        if self._config.throughput_path is not None and not self._config.dry_run:
+            try:
+                self._throughput.save(self._config.throughput_path)
+            except OSError:
+                _logger.warning("吞吐量记录保存失败", exc_info=True)
+
+        if (self._config.prepare_only or shard_count > 1) and not self._config.dry_run:
+            write_bundle(
+                output_dir, summary,
+                index=0 if self._config.prepare_only else shard_index,
+                count=shard_count,
+                config=self._config.fingerprint(),
+            )
+
         # 8. 输出剖析报告
         self._on_progress(90, "已完成汉化")
+        if self._rate_limiter is not None:
+            stats = self._rate_limiter.stats()
+            profiler.set_metric("LLM 并发上限(当前)", stats["limit"])
+            profiler.set_metric("LLM 并发上限(最低)", stats["lowest_limit"])
+            profiler.set_metric("LLM 拥塞降速次数", stats["decreases"])
+            profiler.set_metric("LLM 排队深度(峰值)", stats["peak_waiting"])
+        memo = self._engine.memo_stats()
+        if memo["hits"] or memo["misses"]:
+            profiler.set_metric("匹配记忆命中", memo["hits"])
+            profiler.set_metric("匹配记忆未命中", memo["misses"])
+        usage = self._usage.stats()
+        if usage["usage_calls"]:
+            profiler.set_metric("提示词 tokens", usage["prompt_tokens"])
+            profiler.set_metric("缓存命中 tokens", usage["cached_tokens"])
+            profiler.set_metric("缓存命中率(%)", round(usage["cache_hit_rate"] * 100, 1))
         report = profiler.report()
         self._log_bridge.info(report)
 
@@ -227,23 +477,102 @@ class TranslationPipeline:
     ) -> ProcessOutcome:
         """处理单个文件。返回 ProcessOutcome。"""
         file_pc = FilePathConfig(KR_path=file_path, _PathConfig=base_pc, has_prefix=has_prefix)
+        if file_path in self._prepared_files:
+            prepared = self._copy_prepared(file_pc)
+            if prepared is not None:
+                return prepared
+        if self._checkpoint is not None:
+            resumed = self._checkpoint.lookup(file_pc)
+            if resumed is not None:
+                outcome, entries = resumed
+                if self._entry_index is not None and entries is not None:
+                    self._entry_index.record(file_pc.rel_path.as_posix(), entries)
+                return outcome
+        outcome = self._reuse_previous(file_pc)
+        if outcome is None:
+            outcome = self._process_new(file_pc, translator)
+        if self._checkpoint is not None:
+            entries = None
+            if self._entry_index is not None:
+                entries = self._entry_index.current_entries(file_pc.rel_path.as_posix())
+            self._checkpoint.record(file_pc, outcome, entries)
+        return outcome
+
+    def _process_new(self, file_pc: FilePathConfig, translator) -> ProcessOutcome:
+        """用 FileProcessor 完整处理单个文件。"""
         processor = FileProcessor(
             path_config=file_pc,
             engine=self._engine,
             translate_config=self._config,
             translator=translator,
             recorder=self._recorder,
+            memory=self._memory,
+            entry_index=self._entry_index,
+            request_engine=self._request_engine,
+            rate_limiter=self._rate_limiter,
+            throughput=self._throughput,
+            budget=self._budget,
+            shared=self._shared,
+            batcher=self._batcher,
+            usage=self._usage,
         )
         return processor.process()
 
+    def _load_entry_index(self) -> None:
+        """按当前配置指纹（含术语表内容与提示词模板）加载上次的条目索引。"""
+        if not self._config.entry_index:
+            return
+        from translateFunc.entry_index import EntryIndex, ENTRY_INDEX_NAME
+        previous_index = (
+            self._config.reuse_output_dir / "Info" / ENTRY_INDEX_NAME
+            if self._config.reuse_output_dir is not None else None
+        )
+        self._entry_index = EntryIndex.load(previous_index, self._config.fingerprint())
+
+    def _reuse_previous(self, file_pc: FilePathConfig) -> ProcessOutcome | None:
+        """输入未变化时直接复制上次运行的输出，不解析、不匹配、不调用 LLM。"""
+        previous_root = self._config.reuse_output_dir
+        if previous_root is None or file_pc.rel_path.as_posix() not in self._config.reuse_files:
+            return None
+        previous_file = previous_root / file_pc.rel_dir / file_pc.real_name
+        if not previous_file.is_file():
+            return None
+        try:
+            if not self._config.dry_run:
+                file_pc.target_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(previous_file, file_pc.target_file)
+        except OSError:
+            _logger.exception(f"[{file_pc.real_name}] 复用上次输出失败，改为重新处理")
+            return None
+        if self._entry_index is not None:
+            self._entry_index.carry_over(file_pc.rel_path.as_posix())
+        return ProcessOutcome(ProcessResult.REUSED_PREVIOUS, file_pc.real_name)
+
+    def _copy_prepared(self, file_pc: FilePathConfig) -> ProcessOutcome | None:
+        """分片运行时直接复制 prepare 阶段输出的优先文件。"""
+        source = self._config.prepared_dir / file_pc.rel_dir / file_pc.real_name
+        if not source.is_file():
+            self._log_bridge.warning(f"prepare 输出中缺少 {file_pc.real_name}，改为自行处理")
+            return None
+        if not self._config.dry_run:
+            file_pc.target_file.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, file_pc.target_file)
+        return ProcessOutcome(ProcessResult.REUSED_PREVIOUS, file_pc.real_name, {"prepared": True})
+
     def _record_outcome(self, outcome: ProcessOutcome, summary: PipelineSummary) -> None:
         """将 ProcessOutcome 记录到 PipelineSummary 中。"""
         if outcome.result == ProcessResult.SUCCESS_SAVED:
             summary.saved.append(outcome.file_name)
         elif outcome.result == ProcessResult.FALLBACK_TO_ORIGINAL:
             summary.fallback.append(outcome.file_name)
-        elif outcome.result in (ProcessResult.ALREADY_TRANSLATED, ProcessResult.EMPTY_WITH_LLC, ProcessResult.EMPTY_SKIPPED):
+        elif outcome.result in (
+            ProcessResult.ALREADY_TRANSLATED, ProcessResult.EMPTY_WITH_LLC,
+            ProcessResult.EMPTY_SKIPPED, ProcessResult.REUSED_PREVIOUS,
+        ):
             summary.skipped.append(outcome.file_name)
+        elif outcome.result == ProcessResult.DRY_RUN_ESTIMATED:
+            summary.skipped.append(outcome.file_name)
+            summary.add_estimate(outcome.extra.get("estimate", {}))
         else:
             # 记录每个错误的详细信息，方便事后溯源
             extra_info = outcome.extra or {}
@@ -253,6 +582,41 @@ class TranslationPipeline:
             )
             summary.errors.append(outcome)
 
+    def _report_estimate(self, summary: PipelineSummary) -> None:
+        """按历史吞吐量预测耗时，写入 summary.estimate["projection"] 并输出报告。"""
+        estimate = summary.estimate
+        calls = estimate.get("calls", {})
+        tokens = estimate.get("input_tokens", 0) + estimate.get("output_tokens", 0)
+        tokens_per_second = self._throughput.tokens_per_second
+        if not self._config.enable_concurrent:
+            concurrency = 1
+        else:
+            concurrency = self._config.max_concurrent_requests or self._config.max_workers
+        projected_seconds = tokens / (tokens_per_second * max(concurrency, 1))
+        estimate["projection"] = {
+            "tokens_per_second": round(tokens_per_second, 2),
+            "concurrency": concurrency,
+            "projected_seconds": round(projected_seconds, 1),
+        }
+        self._log_bridge.info(
+            f"dry run: 需翻译 {estimate.get('files', 0)} 个文件，"
+            f"阶段 0/1/2 调用 {calls.get('stage_0', 0)}/{calls.get('stage_1', 0)}/"
+            f"{calls.get('stage_2', 0)} 次，输入约 {estimate.get('input_tokens', 0)} token，"
+            f"输出约 {estimate.get('output_tokens', 0)} token；"
+            f"按 {tokens_per_second:.1f} token/秒 × 并发 {concurrency} 预计耗时 "
+            f"{projected_seconds / 60:.1f} 分钟"
+        )
+
+    @staticmethod
+    def _file_dependencies(file_path: Path, base_pc: PathConfig, has_prefix: bool) -> set[str]:
+        """文件开始处理前需要就绪的事件；剧情 / 技能判定与 FileProcessor 一致。"""
+        file_pc = FilePathConfig(KR_path=file_path, _PathConfig=base_pc, has_prefix=has_prefix)
+        if file_pc.rel_path.parent.name == "StoryData":
+            return {_EVENT_ROLES}
+        if file_pc.real_name.startswith("Skills_"):
+            return {_EVENT_AFFECTS}
+        return set()
+
     def _update_roles(self, model_file: Path, base_pc: PathConfig, has_prefix: bool) -> None:
         """从 ScenarioModelCodes 更新 MatcherEngine 中的角色数据。"""
         try:
@@ -342,11 +706,12 @@ class TranslationPipeline:
             _logger.exception(f"加载状态效果失败: {e}")
             self._on_log(f"加载状态效果失败: {e}")
 
-    def _build_translator(self) -> TranslatorBase:
+    def _build_translator(self, enable_cache: bool = True) -> TranslatorBase:
         """根据配置创建翻译器实例。
 
         system_prompt 和 response_format 在 processor 中按需通过
         translator.update_config() 动态更新，不在构造时设置。
+        请求引擎的翻译器按请求传入提示词，不需要响应缓存。
         """
         translator_cls = TRANSLATOR_TRANS[self._config.translator_name]
         api_settings = dict(self._config.translator_api)
@@ -358,7 +723,7 @@ class TranslationPipeline:
         tkit_config = TKitConfig(
             api_setting=api_settings,
             debug_mode=self._config.debug_mode,
-            enable_cache=True,
+            enable_cache=enable_cache,
             enable_metrics=True,
         )
 
@@ -0,0 +1,113 @@
+"""
+translateFunc/planner.py
+运行规划 —— 预估文件工作量、请求 token 数与吞吐量。
+
+  - estimate_file_work：供 WorkerPool 按最长优先（LPT）调度与分片划分。只解析 KR / LLC
+    的条目 id，不运行匹配：调度前对全部文件构建请求的开销与翻译本身相当。
+    KR 文件大小与渲染后的请求长度近似成正比，再乘以 LLC 未覆盖的条目比例，
+    已大部分翻译的大文件不会排在只需少量请求的文件之前。
+    文件内的分片由 RequestEngine.map_parts 在共享执行器中排队，调度只需按文件估算。
+  - estimate_tokens：按字符类别估算 token 数，用于 dry run 报告。
+  - ThroughputMeter：记录实际运行中每个请求的 token 吞吐量，跨运行保存，
+    供 dry run 预测耗时。
+"""
+from __future__ import annotations
+import json
+import logging
+import threading
+from pathlib import Path
+
+from translateFunc import jsoncodec
+from translateFunc.config import FilePathConfig, TranslateConfig
+
+_logger = logging.getLogger("LCTA")
+
+# 无观测数据时的单请求吞吐量（token/秒，含输入与输出）
+DEFAULT_TOKENS_PER_SECOND = 60.0
+# 保存时只保留约最近这么多秒的观测，旧数据按比例衰减
+_WINDOW_SECONDS = 6 * 3600
+
+
+def estimate_file_work(file_pc: FilePathConfig, config: TranslateConfig) -> int:
+    """返回文件的预估工作量：KR 文件字节数 × LLC 未覆盖的条目比例。
+
+    将直接复用上次输出的文件、LLC 已覆盖全部条目的文件记为 0；
+    LLC 不存在或文件无法解析时按整个 KR 文件计算。
+    """
+    if config.reuse_output_dir is not None and file_pc.rel_path.as_posix() in config.reuse_files:
+        return 0
+    try:
+        size = file_pc.KR_path.stat().st_size
+    except OSError:
+        return 0
+    if not file_pc.LLC_path.is_file():
+        return size
+    is_story = file_pc.rel_path.parent.name == "StoryData"
+    try:
+        kr_ids = _entry_ids(jsoncodec.load(file_pc.KR_path), is_story)
+        llc_ids = set(_entry_ids(jsoncodec.load(file_pc.LLC_path), is_story))
+    except (OSError, ValueError, TypeError, AttributeError, KeyError):
+        return size
+    if not kr_ids:
+        return size
+    untranslated = sum(1 for entry_id in kr_ids if entry_id not in llc_ids)
+    return size * untranslated // len(kr_ids)
+
+
+def _entry_ids(data: dict, is_story: bool) -> list:
+    """按 FileProcessor._index_data 的规则返回 dataList 的条目 id 序列。"""
+    entries = data.get("dataList") or []
+    if not is_story and entries and isinstance(entries[0], dict) and "id" in entries[0]:
+        return [entry["id"] for entry in entries]
+    return list(range(len(entries)))
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：CJK / 韩文 / 假名约 0.6 token 每字，其余约 0.3 token 每字符。"""
+    wide = sum(1 for ch in text if ord(ch) >= 0x1100)
+    return int(wide * 0.6 + (len(text) - wide) * 0.3) + 1 if text else 0
+
+
+class ThroughputMeter:
+    """线程安全的吞吐量统计：累计成功请求的 token 数与耗时。"""
+
+    def __init__(self, tokens: float = 0.0, seconds: float = 0.0):
+        self._tokens = tokens
+        self._seconds = seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | None) -> "ThroughputMeter":
+        if path is None or not path.is_file():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(float(data["tokens"]), float(data["seconds"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            _logger.warning(f"吞吐量记录读取失败，使用默认值: {path}", exc_info=True)
+            return cls()
+
+    def add(self, tokens: int, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._tokens += tokens
+            self._seconds += seconds
+
+    @property
+    def tokens_per_second(self) -> float:
+        """单个请求的平均吞吐量；无观测数据时返回默认值。"""
+        with self._lock:
+            if self._seconds <= 0:
+                return DEFAULT_TOKENS_PER_SECOND
+            return self._tokens / self._seconds
+
+    def save(self, path: Path) -> None:
+        with self._lock:
+            scale = min(1.0, _WINDOW_SECONDS / self._seconds) if self._seconds > 0 else 1.0
+            data = {
+                "tokens": round(self._tokens * scale),
+                "seconds": round(self._seconds * scale, 3),
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data), encoding="utf-8")
@@ -5,6 +5,7 @@ FileProcessor —— 对单个文件执行完整的翻译管线处理。
 """
 from __future__ import annotations
 from copy import deepcopy
+import hashlib
 import json
 import logging
 import shutil
@@ -17,6 +18,8 @@ import uuid
 _logger = logging.getLogger("LCTA")  # 与 LogManager 一致的 logger，确保日志正确路由
 
 from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
 from translateFunc.enums import ProcessResult, FileType
 from translateFunc.config import ProcessOutcome, TranslateConfig, FilePathConfig, _suppress_translatekit_log
 from translateFunc.matcher.engine import MatcherEngine
@@ -25,6 +28,16 @@ from translateFunc.builder.stages import StageStrategy
 from translateFunc.proper import flatten_dict_enhanced, update_dict_with_flattened
 from translateFunc.validator import RuleBasedValidator
 from translateFunc.recorder import TranslationRecorder
+from translateFunc.memory import TranslationMemory
+from translateFunc.entry_index import EntryIndex, SOURCE_LLC, SOURCE_OURS, hash_entry
+from translateFunc.request_engine import EngineRequest, RequestEngine
+from translateFunc.rate_limit import AdaptiveLimiter, is_congestion_signal
+from translateFunc.planner import ThroughputMeter, estimate_tokens
+from translateFunc.budget import BudgetExhausted, RunBudget
+from translateFunc.dedup import SHARED_WAIT_TIMEOUT, SharedTranslations
+from translateFunc.batcher import BatchItem, RequestBatcher
+from translateFunc.usage import UsageMeter, apportion, parse_usage, split_usage
+from translateFunc import jsoncodec
 from translateFunc.diagnostics import (
     HttpResponseObserver,
     safe_json_value,
@@ -53,14 +66,33 @@ class FileProcessor:
         translate_config: TranslateConfig,
         translator,  # translatekit TranslatorBase 实例
         recorder: "TranslationRecorder" = None,
+        memory: "TranslationMemory | None" = None,
+        entry_index: "EntryIndex | None" = None,
+        request_engine: "RequestEngine | None" = None,
+        rate_limiter: "AdaptiveLimiter | None" = None,
+        throughput: "ThroughputMeter | None" = None,
+        budget: "RunBudget | None" = None,
+        shared: "SharedTranslations | None" = None,
+        batcher: "RequestBatcher | None" = None,
+        usage: "UsageMeter | None" = None,
     ):
         self.path_config = path_config
         self._engine = engine
         self._config = translate_config
         self._translator = translator
         self._recorder = recorder
+        self._memory = memory
+        self._entry_index = entry_index
+        self._request_engine = request_engine
+        self._rate_limiter = rate_limiter
+        self._throughput = throughput
+        self._budget = budget
+        self._shared = shared
+        self._batcher = batcher
+        self._usage = usage
 
         self._api_calls: list[dict] = []
+        self._supplemental_calls: dict[int, dict] = {}
         self._input_text_blocks: list[dict] = []
         self._input_reference: dict = {}
         self._last_failed_call: dict | None = None
@@ -83,6 +115,10 @@ class FileProcessor:
         self.is_skill: bool = False
         self.translating_list: list = []
         self._base_index: dict = {}
+        # 条目级索引：id → (KR 哈希, LLC 哈希)，以及过期与复用的条目
+        self._entry_hashes: dict = {}
+        self._stale_ids: set = set()
+        self._reused_entries: dict = {}
 
     @property
     def file_name(self) -> str:
@@ -128,6 +164,8 @@ class FileProcessor:
 
             # 4. 构建数据索引
             self._make_data_index()
+            if self._entry_index is not None:
+                self._plan_entries()
 
             # 5. 检查是否已翻译
             try:
@@ -149,7 +187,10 @@ class FileProcessor:
             # 6. 获取待翻译列表
             self._get_translating()
             if not self.translating_list:
-                outcome = ProcessOutcome(ProcessResult.ALREADY_TRANSLATED, self.file_name)
+                if self._reused_entries:
+                    outcome = self._save_reused_only()
+                else:
+                    outcome = ProcessOutcome(ProcessResult.ALREADY_TRANSLATED, self.file_name)
                 self._write_processing_log(outcome, start_time)
                 return outcome
 
@@ -160,9 +201,26 @@ class FileProcessor:
                 "en": self._get_translating_text("en"),
             }
 
+            if self._config.dry_run:
+                outcome = ProcessOutcome(
+                    ProcessResult.DRY_RUN_ESTIMATED,
+                    self.file_name,
+                    {"estimate": self._estimate_requests(request_text)},
+                )
+                self._write_processing_log(outcome, start_time)
+                return outcome
+
+            # 预算用尽后不再开始新文件
+            if not self._budget_allows("files"):
+                outcome = self._save_budget_fallback(start_time)
+                return outcome
+
             # 8. 构建并翻译
             try:
                 translated_data, had_fallback = self._translate(request_text)
+            except BudgetExhausted:
+                outcome = self._save_budget_fallback(start_time)
+                return outcome
             except ValueError:
                 _logger.exception(f"[{self.file_name}] 翻译数量不匹配异常")
                 self._save_except()
@@ -212,6 +270,15 @@ class FileProcessor:
             self._write_processing_log(outcome, start_time)
             return outcome
         finally:
+            if self._shared is not None:
+                # 未发布的去重键发布为 None，等待方改为自行翻译
+                self._shared.release(self.path_config.rel_path.as_posix())
+            if (
+                self._entry_index is not None
+                and outcome is not None
+                and outcome.result in (ProcessResult.SUCCESS_SAVED, ProcessResult.ALREADY_TRANSLATED)
+            ):
+                self._record_entry_index()
             if self._recorder is not None:
                 active_exception = sys.exc_info()[1]
                 try:
@@ -239,8 +306,24 @@ class FileProcessor:
                         f"[{self.file_name}] 翻译 dump 写入失败: {self._recorder.file_path}"
                     )
 
+    def _budget_allows(self, stage: str) -> bool:
+        return self._budget is None or self._budget.allows(stage)
+
+    def _save_budget_fallback(self, start_time: float) -> ProcessOutcome:
+        """token 预算用尽：不再翻译，按 LLC → EN → JP → KR 回退保存。"""
+        _logger.warning(f"[{self.file_name}] token 预算已用尽，回退保存")
+        self.path_config.target_file.parent.mkdir(parents=True, exist_ok=True)
+        self._save_except()
+        outcome = ProcessOutcome(
+            ProcessResult.FALLBACK_TO_ORIGINAL,
+            self.file_name,
+            {"reason": "token 预算已用尽", "budget_exhausted": True},
+        )
+        self._write_processing_log(outcome, start_time)
+        return outcome
+
     def _write_processing_log(self, outcome: ProcessOutcome, start_time: float) -> None:
-        """将单文件处理结果追加写入 JSONL 日志文件。"""
+        """将单文件处理结果追加写入 JSONL 日志文件。dry_run 时只补充耗时，不写文件。"""
         try:
             elapsed = time.perf_counter() - start_time
             extra = dict(outcome.extra or {})
@@ -255,10 +338,12 @@ class FileProcessor:
                 "elapsed_seconds": extra["elapsed_seconds"],
                 "extra": safe_json_value(extra),
             }
+            if self._config.dry_run:
+                return
             log_dir = self.path_config._PathConfig.target_path
             log_dir.mkdir(parents=True, exist_ok=True)
             log_path = log_dir / "processing_log.jsonl"
-            line = json.dumps(log_entry, ensure_ascii=False) + "\n"
+            line = jsoncodec.dumps(log_entry) + "\n"
             with _processing_log_lock:
                 with open(log_path, "a", encoding="utf-8") as f:
                     f.write(line)
@@ -279,8 +364,12 @@ class FileProcessor:
         part: int | None = None,
         attempt: int | None = None,
         metadata: dict | None = None,
+        file_usage: bool = True,
     ) -> tuple[object, object, dict]:
-        """执行一次 AI 调用，并完整记录请求、响应、HTTP 尝试和异常链。"""
+        """执行一次 AI 调用，并完整记录请求、响应、HTTP 尝试和异常链。
+
+        file_usage=False 时用量不计入本文件的按文件统计（合并请求由各参与文件分摊）。
+        """
         started_at = datetime.now()
         started_perf = time.perf_counter()
         record = {
@@ -298,6 +387,7 @@ class FileProcessor:
             "parse_errors": [],
             "validation_errors": [],
             "http_attempts": [],
+            "usage": None,
             "exception": None,
             "status": "internal_error",
             "failure_kind": None,
@@ -307,10 +397,31 @@ class FileProcessor:
         raw_response = None
         parsed_response = None
         caught_exception = None
+        engine_result = None
+        rate_slot = None
+        call_perf = started_perf
+        # 预留按字符估算的 token：输入加与 user prompt 等量的输出；调用结束后按实际用量结算
+        reserved_tokens = estimate_tokens(system_prompt) + 2 * estimate_tokens(user_prompt)
+        if self._budget is not None:
+            self._budget.check(stage, reserve=reserved_tokens)
         self._http_observer.begin()
 
         try:
-            raw_response = self._translator.translate(user_prompt, timeout=timeout)
+            if self._rate_limiter is not None:
+                rate_slot = self._rate_limiter.acquire()
+                call_perf = time.perf_counter()
+            if self._request_engine is not None:
+                engine_result = self._request_engine.call(EngineRequest(
+                    user_prompt=user_prompt,
+                    system_prompt=system_prompt,
+                    response_format=response_format,
+                    timeout=timeout,
+                ))
+                if engine_result.exception is not None:
+                    raise engine_result.exception
+                raw_response = engine_result.raw_response
+            else:
+                raw_response = self._translator.translate(user_prompt, timeout=timeout)
             record["raw_response"] = str(raw_response)
             parsed_response = parser(raw_response) if parser is not None else raw_response
             record["parsed_response"] = parsed_response
@@ -348,8 +459,45 @@ class FileProcessor:
             raise
         finally:
             record["http_attempts"] = self._http_observer.finish()
+            if engine_result is not None:
+                record["http_attempts"] = engine_result.http_attempts
+            if rate_slot is not None:
+                rate_slot.congested = is_congestion_signal(
+                    record["http_attempts"],
+                    caught_exception if raw_response is None else None,
+                )
+                self._rate_limiter.release(rate_slot)
+            record["usage"] = parse_usage(record["http_attempts"])
             record["finished_at"] = datetime.now().isoformat()
             record["elapsed_seconds"] = round(time.perf_counter() - started_perf, 3)
+            # 请求本身的耗时，不含限流排队
+            record["latency_seconds"] = round(
+                engine_result.elapsed_seconds if engine_result is not None
+                else time.perf_counter() - call_perf,
+                3,
+            )
+            if self._usage is not None:
+                self._usage.add(
+                    record["usage"],
+                    file_name=self.path_config.rel_path.as_posix() if file_usage else "",
+                    stage=stage,
+                    prompt_format=prompt_format,
+                    latency=record["latency_seconds"],
+                )
+            call_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+            if raw_response is not None:
+                call_tokens += estimate_tokens(str(raw_response))
+            record["estimated_tokens"] = call_tokens
+            if self._budget is not None:
+                # 服务商返回的实际用量（含推理 token）优先，缺失时按估算记账
+                usage = record["usage"]
+                self._budget.charge(
+                    usage["total_tokens"] if usage else call_tokens,
+                    reserved=reserved_tokens,
+                )
+            if self._throughput is not None and raw_response is not None:
+                # 不含限流排队时间，只统计请求本身
+                self._throughput.add(call_tokens, record["latency_seconds"])
             if self._recorder is not None:
                 self._api_calls.append(record)
             if record["status"] not in SUCCESS_CALL_STATUSES:
@@ -477,6 +625,7 @@ class FileProcessor:
             "parse_errors": [],
             "validation_errors": validation_errors or [],
             "http_attempts": [],
+            "usage": None,
             "exception": serialize_exception(exc),
             "status": status,
             "failure_kind": failure_kind,
@@ -493,34 +642,152 @@ class FileProcessor:
 
     # ========== 翻译执行 ==========
 
-    def _translate(self, request_text: dict) -> tuple[dict, bool]:
-        """通过配置的管线阶段执行翻译，支持格式回退。
-
-        Returns:
-            (翻译结果字典, had_fallback) — had_fallback=True 表示至少一个
-            part 的全部格式失败，已回退为 KR 原文。
-        """
-        # 构建请求
-        builder = RequestBuilder(
+    def _make_builder(self, request_text: dict, share: bool = True) -> RequestBuilder:
+        use_memory = self._memory is not None and self._config.is_llm
+        return RequestBuilder(
             request_text,
             self._engine,
             is_story=self.is_story,
             is_skill=self.is_skill,
             max_length=20000,
             file_type=self.file_type,
+            memory=self._memory if use_memory else None,
+            memory_context=self._memory_context() if use_memory else "",
+            shared=self._shared if self._config.is_llm and share else None,
+            shared_owner=self.path_config.rel_path.as_posix(),
+            wait_shared=not self._config.dry_run,
+            prompt_layout=self._config.prompt_layout,
         )
 
+    def _estimate_requests(self, request_text: dict) -> dict:
+        """dry run：按实际流程构建各阶段请求但不调用 LLM，统计调用次数与 token 数。
+
+        阶段 2 尚无译文，以 KR 原文代替译文估算；输出 token 按原文长度估算。
+        回退格式只在主格式解析失败时使用，单独计入 fallback_input_tokens。
+        """
+        calls = {"stage_0": 0, "stage_1": 0, "stage_2": 0}
+        estimate = {
+            "files": 1,
+            "text_blocks": 0,
+            "memory_hits": 0,
+            "shared_hits": 0,
+            "calls": calls,
+            "input_chars": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "fallback_input_tokens": 0,
+        }
+
+        def add_call(stage: str, system_prompt: str, user_prompt: str) -> None:
+            calls[stage] += 1
+            estimate["input_chars"] += len(system_prompt) + len(user_prompt)
+            estimate["input_tokens"] += estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+
+        if not self._config.is_llm:
+            simple_builder = _SimpleRequestBuilder(request_text)
+            simple_builder.build()
+            text = "\n".join(map(str, simple_builder.get_request_text(from_lang=self._config.from_lang)))
+            add_call("stage_1", "", text)
+            estimate["output_tokens"] = estimate_tokens(text)
+            return estimate
+
+        user_format = self._config.prompt_format
+        builder = self._make_builder(request_text)
+        builder.build(prompt_format=user_format)
+        strategy = StageStrategy(self._config)
+        text_blocks = builder.unified_request.get("text_blocks", [])
+        estimate["text_blocks"] = len(text_blocks)
+        estimate["memory_hits"] = len(builder.memory_hits)
+        estimate["shared_hits"] = len(builder.shared_hits)
+        if not text_blocks:
+            return estimate
+
+        if strategy.needs_disambiguation():
+            ambiguous_terms = self._collect_ambiguous_terms(builder)
+            if ambiguous_terms:
+                s0_system = strategy.build_stage_0_prompt(prompt_format=user_format)
+                for part in strategy.split_stage_0_inputs(
+                    ambiguous_terms, text_blocks,
+                    prompt_format=user_format, max_length=builder.max_length,
+                ):
+                    add_call("stage_0", s0_system, strategy.build_stage_0_user_prompt(
+                        part["candidate_terms"], part["text_blocks"], prompt_format=user_format,
+                    ))
+
+        for fmt in self._build_format_chain():
+            system_prompt = strategy.build_stage_1_prompt(self.file_type, prompt_format=fmt)
+            for user_prompt in builder.get_request_text(prompt_format=fmt):
+                if fmt == user_format:
+                    add_call("stage_1", system_prompt, user_prompt)
+                else:
+                    estimate["fallback_input_tokens"] += (
+                        estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+                    )
+
+        source_texts = [str(block.get("kr", "")) for block in text_blocks]
+        estimate["output_tokens"] = sum(estimate_tokens(text) for text in source_texts)
+
+        if strategy.needs_self_check():
+            s2_system = strategy.build_stage_2_prompt(self.file_type, prompt_format=user_format)
+            for part in strategy.split_stage_2_inputs(
+                text_blocks,
+                [{"id": i + 1, "translation": text} for i, text in enumerate(source_texts)],
+                prompt_format=user_format,
+                reference=builder.unified_request.get("reference"),
+                max_length=builder.max_length,
+            ):
+                add_call("stage_2", s2_system, strategy.build_stage_2_user_prompt(
+                    part["original_blocks"], part["translations"],
+                    prompt_format=user_format, reference=part["reference"],
+                ))
+        return estimate
+
+    def _translate(self, request_text: dict, follow_up: bool = False) -> tuple[dict, bool]:
+        """通过配置的管线阶段执行翻译，支持格式回退。
+
+        Args:
+            follow_up: 补译其他文件未能提供译文的去重文本块；不参与去重，
+                请求记录追加到本文件已有的记录之后
+
+        Returns:
+            (翻译结果字典, had_fallback) — had_fallback=True 表示至少一个
+            part 的全部格式失败，已回退为 KR 原文。
+        """
+        # 构建请求
+        use_memory = self._memory is not None and self._config.is_llm
+        builder = self._make_builder(request_text, share=not follow_up)
+
         if self._config.is_llm:
             builder.build(prompt_format=self._config.prompt_format)
             stage_strategy = StageStrategy(self._config)
+            text_blocks = builder.unified_request.get("text_blocks", [])
 
-            self._api_calls = []
-            self._input_text_blocks = builder.unified_request.get("text_blocks", [])
-            self._input_reference = builder.unified_request.get("reference", {})
+            self._supplemental_calls = {}
+            if follow_up:
+                self._input_text_blocks = self._input_text_blocks + text_blocks
+            else:
+                self._api_calls = []
+                self._input_text_blocks = text_blocks
+                self._input_reference = builder.unified_request.get("reference", {})
+
+            if use_memory and builder.memory_hits:
+                _logger.debug(
+                    f"[{self.file_name}] 翻译记忆命中 {len(builder.memory_hits)} 个文本块，"
+                    f"待发送 {len(text_blocks)} 个"
+                )
+            if self._shared is not None and builder.shared_pending:
+                _logger.debug(
+                    f"[{self.file_name}] {len(builder.shared_pending)} 个文本块由其他文件翻译，"
+                    f"本文件请求完成后取回译文"
+                )
+            if not text_blocks:
+                # 全部命中翻译记忆 / 运行内去重（或无可翻译文本），无需调用 LLM
+                shared_fallback = self._resolve_shared(builder)
+                return builder.deBuild([]), shared_fallback
 
             # ====== 阶段 0：消歧（仅主格式） ======
             user_format = self._config.prompt_format
-            if stage_strategy.needs_disambiguation():
+            if stage_strategy.needs_disambiguation() and self._budget_allows("stage_0"):
                 _logger.debug(f"[{self.file_name}] 阶段 0: 术语消歧 (mode={self._config.disambiguation_mode})")
                 ambiguous_terms = self._collect_ambiguous_terms(builder)
                 if ambiguous_terms:
@@ -572,6 +839,9 @@ class FileProcessor:
                                         f"[{self.file_name}] 阶段 0 消歧 "
                                         f"{part_idx + 1}/{len(stage_0_parts)}：解析结果为空"
                                     )
+                            except BudgetExhausted:
+                                _logger.info(f"[{self.file_name}] token 预算不足，跳过剩余阶段 0 消歧")
+                                break
                             except Exception as e:
                                 if not s0_call_started:
                                     self._record_diagnostic_event(
@@ -610,253 +880,65 @@ class FileProcessor:
 
             result: list[str] = []
             had_fallback = False
-            for i, request_part in enumerate(builder.split_requests if builder.split_requests else [builder.unified_request]):
-                if builder.split_requests:
-                    part_data = request_part
-                else:
-                    part_data = builder.unified_request
-                if part_data is None:
-                    continue
-
-                part_result = None
-                tried_formats: list[str] = []
-                retry_indices: list[int] = []
-                selected_call_record: dict | None = None
-                failed_format_calls: list[dict] = []
-
-                for fmt_idx, fmt in enumerate(formats_chain):
-                    call_record = None
-                    tried_formats.append(fmt)
-                    # 按当前格式构建 system prompt
-                    system_prompt = stage_strategy.build_stage_1_prompt(
-                        self.file_type,
-                        prompt_format=fmt,
-                    )
-
-                    # 按当前格式构建 user prompt
-                    user_prompt = builder.get_request_text(prompt_format=fmt)
-                    user_text = user_prompt[i] if i < len(user_prompt) else user_prompt[0]
-
-                    # 自适应超时：基于实际请求长度 + 预期输出长度
-                    input_len = len(json.dumps(request_part, ensure_ascii=False))
-                    timeout = max(input_len * 3 // 400 + 40, 60)
-
-                    # P0-3: LLM 调用前预检查分片大小，记录详细诊断数据
-                    _rendered_len = len(user_text)
-                    text_blocks_for_part = part_data.get("text_blocks", [])
-                    ref_for_part = part_data.get("reference", {})
-                    if _rendered_len > 20000:
-                        _logger.warning(
-                            f"[{self.file_name}] [{fmt}] 第 {i + 1}/{len(builder.split_requests)} 部分 "
-                            f"超限: 渲染长度={_rendered_len} > 限制=20000 | "
-                            f"text_blocks={len(text_blocks_for_part)} | "
-                            f"proper_terms={len(ref_for_part.get('proper_terms', []))} | "
-                            f"affects={len(ref_for_part.get('affects', []))} | "
-                            f"models={len(ref_for_part.get('models', []))} | "
-                            f"model_docs={len(ref_for_part.get('model_docs', []))} | "
-                            f"skill_doc_len={len(ref_for_part.get('skill_doc', ''))}"
-                        )
-
-                    # 更新线程本地 translator 的 system_prompt 和 response_format
-                    # 放在 try 外：配置更新失败不应被当作解析失败
-                    try:
-                        self._update_translator_prompt(system_prompt, self._format_to_response_format(fmt))
-                    except Exception as exc:
-                        self._record_diagnostic_event(
-                            stage="stage_1",
-                            status="internal_error",
-                            failure_kind="translator_config_error",
-                            prompt_format=fmt,
-                            part=i + 1,
-                            exc=exc,
-                        )
-                        raise
-
-                    # 仅在 xml_json ↔ xml_xml 回退时清除缓存
-                    # （两者共用 _make_xml_user_prompt 产生相同 user_text，
-                    #  缓存键仅含 user_text hash，不区分 system_prompt/response_format）
-                    # 其他格式回退（json_json）user_text 不同，无需清缓存
-                    if fmt_idx > 0 and {formats_chain[fmt_idx - 1], fmt} == {"xml_json", "xml_xml"}:
-                        self._translator.clear_cache()
-
-                    try:
-                        _, parsed, call_record = self._call_ai(
-                            stage="stage_1",
-                            system_prompt=system_prompt,
-                            user_prompt=user_text,
-                            response_format=self._format_to_response_format(fmt),
-                            timeout=timeout,
-                            parser=lambda response, current_format=fmt: (
-                                stage_strategy.parse_stage_1_result(
-                                    response, prompt_format=current_format,
-                                )
-                            ),
-                            parse_error_provider=stage_strategy.consume_parse_errors,
-                            prompt_format=fmt,
-                            part=i + 1,
-                            attempt=fmt_idx + 1,
-                            metadata={
-                                "rendered_length": _rendered_len,
-                                "text_blocks": len(text_blocks_for_part),
-                            },
-                        )
-
-                        if not parsed:
-                            raise ValueError(f"{fmt}: 解析结果为空")
-
-                        # 按 id 对齐解析结果与文本块（解决 LLM 跳过/重排条目导致的错位）
-                        text_blocks = part_data.get("text_blocks", [])
-                        expected_count = len(text_blocks)
-
-                        # 构建 id → parsed_item 映射
-                        parsed_by_id: dict[int, dict] = {}
-                        for t in parsed:
-                            if isinstance(t, dict):
-                                try:
-                                    tid = int(t.get("id", 0))
-                                    if tid:
-                                        parsed_by_id[tid] = t
-                                except (ValueError, TypeError):
-                                    continue
-
-                        # 置信度检查准备
-                        _CONFIDENCE_ORDER = {"low": 0, "medium": 1, "high": 2}
-                        threshold = _CONFIDENCE_ORDER.get(self._config.min_confidence, 1)
-                        low_conf_count = 0
-                        low_confidence_ids: list[int] = []
-                        missing_ids: list[int] = []
-
-                        # 按 text_block 顺序（1-based id）提取翻译
-                        part_result: list[str] = []
-                        for idx, block in enumerate(text_blocks):
-                            expected_id = idx + 1
-                            t = parsed_by_id.get(expected_id)
-                            if t is None and idx < len(parsed):
-                                # id 未匹配，尝试按顺序回退（LLM 可能未输出 id）
-                                fallback_t = parsed[idx]
-                                if isinstance(fallback_t, dict):
-                                    t = fallback_t
-
-                            if t is not None and isinstance(t, dict):
-                                translation = t.get("translation", "")
-                                # 置信度检查：低于 min_confidence 的条目回退为 KR 原文
-                                conf = str(t.get("confidence", "medium")).lower()
-                                if _CONFIDENCE_ORDER.get(conf, 1) < threshold:
-                                    reasoning = t.get("reasoning", "")
-                                    _logger.warning(
-                                        f"[{self.file_name}] [{fmt}] 低置信度条目 #{expected_id}: "
-                                        f"confidence={conf}, reasoning={reasoning[:200]}"
-                                    )
-                                    low_conf_count += 1
-                                    low_confidence_ids.append(expected_id)
-                                    translation = block.get("kr", "")
-                                part_result.append(translation)
-                            else:
-                                part_result.append(block.get("kr", ""))
-                                missing_ids.append(expected_id)
-
-                        # P1-1: 缺失条目时若还有剩余格式则尝试下一格式
-                        if missing_ids:
-                            if fmt_idx + 1 < len(formats_chain):
-                                self._mark_call_failure(
-                                    call_record,
-                                    status="validation_error",
-                                    failure_kind="missing_translation_ids",
-                                    validation_errors=[{
-                                        "missing_ids": missing_ids,
-                                        "expected_count": expected_count,
-                                        "action": "try_next_format",
-                                    }],
-                                )
-                                _logger.warning(
-                                    f"[{self.file_name}] [{fmt}] {len(missing_ids)} 个文本块缺失翻译 "
-                                    f"(id: {missing_ids[:10]}...)，尝试下一格式"
-                                )
-                                failed_format_calls.append(call_record)
-                                continue
-                            self._mark_call_failure(
-                                call_record,
-                                status="fallback",
-                                failure_kind="missing_translation_ids",
-                                validation_errors=[{
-                                    "missing_ids": missing_ids,
-                                    "expected_count": expected_count,
-                                    "action": "fallback_to_source",
-                                }],
-                            )
-                            _logger.warning(
-                                f"[{self.file_name}] [{fmt}] {len(missing_ids)} 个文本块缺失翻译 "
-                                f"(id: {missing_ids[:10]}...)，已回退为 KR 原文"
-                            )
-                        if low_conf_count > 0:
-                            self._mark_call_failure(
-                                call_record,
-                                status="fallback",
-                                failure_kind="low_confidence",
-                                validation_errors=[{
-                                    "count": low_conf_count,
-                                    "ids": low_confidence_ids,
-                                    "minimum_confidence": self._config.min_confidence,
-                                }],
-                            )
-                            _logger.info(
-                                f"[{self.file_name}] [{fmt}] {low_conf_count} 条翻译因低置信度"
-                                f" (min={self._config.min_confidence}) 回退为 KR 原文"
-                            )
-
-                        retry_indices = sorted({
-                            *(expected_id - 1 for expected_id in missing_ids),
-                            *(expected_id - 1 for expected_id in low_confidence_ids),
-                        })
-                        selected_call_record = call_record
-                        break  # 翻译完整，退出格式回退循环
-
-                    except (json.JSONDecodeError, ValueError) as e:
-                        if call_record is not None:
-                            failed_format_calls.append(call_record)
-                        _logger.warning(
-                            f"[{self.file_name}] [{fmt}] 解析失败 ({e})"
-                        )
-                        continue
-
-                if part_result is None:
-                    # 全部格式失败 → 无条件 warning + 标记降级
-                    _logger.warning(
-                        f"[{self.file_name}] 全部格式 ({', '.join(tried_formats)}) "
-                        f"解析失败，第 {i + 1}/{len(builder.split_requests)} 部分回退为 KR 原文"
+            # 不可靠的结果位置（回退为 KR 原文），不写入翻译记忆
+            unreliable_indices: set[int] = set()
+            part_requests = builder.split_requests or [builder.unified_request]
+            parts = [
+                (i, part_data) for i, part_data in enumerate(part_requests)
+                if part_data is not None
+            ]
+
+            # 各分片共享按格式渲染的 user prompt，只渲染一次
+            rendered: dict[str, list[str]] = {}
+            render_lock = threading.Lock()
+
+            def render(fmt: str) -> list[str]:
+                with render_lock:
+                    if fmt not in rendered:
+                        rendered[fmt] = builder.get_request_text(prompt_format=fmt)
+                    return rendered[fmt]
+
+            # 阶段 1 结果即最终结果时，每个分片解析后立即发布去重译文，等待方不必等整个文件
+            publish_early = self._shared is not None and not (
+                stage_strategy.needs_self_check()
+                or (self.is_skill and self._config.enable_rule_validation)
+            )
+            part_offsets: dict[int, int] = {}
+            offset = 0
+            for i, part_data in parts:
+                part_offsets[i] = offset
+                offset += len(part_data.get("text_blocks", []))
+
+            def run_part(i: int, part_data: dict, strategy: StageStrategy) -> tuple:
+                outcome = self._translate_part(i, part_data, builder, strategy, formats_chain, render)
+                if publish_early:
+                    part_result, _, part_unreliable = outcome
+                    self._publish_shared(
+                        builder, part_result, part_unreliable, offset=part_offsets[i],
                     )
-                    had_fallback = True
-                    text_blocks = part_data.get("text_blocks", [])
-                    part_result = [b.get("kr", "") for b in text_blocks]
-                else:
-                    # P1-2: 部分格式成功但存在缺失条目 → 补充翻译重试
-                    text_blocks = part_data.get("text_blocks", [])
-                    unresolved_count = len(retry_indices)
-                    supplemental_call = None
-                    if retry_indices and len(retry_indices) < len(text_blocks):
-                        fixed = self._retry_missing_entries(
-                            builder, stage_strategy, part_data, part_result,
-                            retry_indices, tried_formats, i,
-                        )
-                        supplemental_call = self._api_calls[-1] if self._api_calls else None
-                        unresolved_count -= fixed
-
-                    if unresolved_count > 0:
-                        had_fallback = True
-                    else:
-                        self._mark_call_recovered(
-                            selected_call_record,
-                            recovery_kind="supplemental_translation",
-                            recovered_by=supplemental_call,
-                        )
+                return outcome
 
-                    for failed_call in failed_format_calls:
-                        self._mark_call_recovered(
-                            failed_call,
-                            recovery_kind="format_fallback",
-                            recovered_by=selected_call_record,
-                        )
+            part_concurrency = self._part_concurrency(len(parts))
+            if part_concurrency > 1:
+                _logger.debug(
+                    f"[{self.file_name}] 阶段 1: {len(parts)} 个分片并发翻译 "
+                    f"(并发 {part_concurrency})"
+                )
+                # 分片进入请求引擎的共享队列，不为文件另开线程；
+                # 解析错误记录在 StageStrategy 实例上，每个分片使用独立实例
+                part_outcomes = self._request_engine.map_parts(
+                    lambda item: run_part(item[0], item[1], StageStrategy(self._config)),
+                    parts,
+                    limit=part_concurrency,
+                )
+            else:
+                part_outcomes = [
+                    run_part(i, part_data, stage_strategy) for i, part_data in parts
+                ]
 
+            for part_result, part_fallback, part_unreliable in part_outcomes:
+                had_fallback = had_fallback or part_fallback
+                unreliable_indices.update(len(result) + idx for idx in part_unreliable)
                 result.extend(part_result)
 
             # ====== 规则化后处理校验（技能文件专用） ======
@@ -932,7 +1014,10 @@ class FileProcessor:
                     )
 
             # ====== 阶段 2：自校验（仅主格式，阶段 1 全部成功时执行） ======
-            if stage_strategy.needs_self_check() and not had_fallback:
+            if (
+                stage_strategy.needs_self_check() and not had_fallback
+                and self._budget_allows("stage_2")
+            ):
                 _logger.debug(f"[{self.file_name}] 阶段 2: 自校验")
                 try:
                     original_blocks = builder.unified_request.get("text_blocks", [])
@@ -994,6 +1079,9 @@ class FileProcessor:
                                     f"[{self.file_name}] 阶段 2 自校验 "
                                     f"{part_idx + 1}/{len(stage_2_parts)}：解析结果为空"
                                 )
+                        except BudgetExhausted:
+                            _logger.info(f"[{self.file_name}] token 预算不足，跳过剩余阶段 2 自校验")
+                            break
                         except Exception as e:
                             if not s2_call_started:
                                 self._record_diagnostic_event(
@@ -1021,7 +1109,10 @@ class FileProcessor:
                         f"[{self.file_name}] 阶段 2 自校验异常 ({e})，使用未校验的翻译结果"
                     )
 
-            return builder.deBuild(result), had_fallback
+            self._store_translation_memory(builder, result, unreliable_indices)
+            self._publish_shared(builder, result, unreliable_indices)
+            shared_fallback = self._resolve_shared(builder)
+            return builder.deBuild(result), had_fallback or shared_fallback
         else:
             # 非 LLM 路径：不存在格式回退
             simple_builder = _SimpleRequestBuilder(request_text)
@@ -1030,6 +1121,461 @@ class FileProcessor:
             result = self._translator.translate(request_texts)
             return simple_builder.deBuild(result), False
 
+    def _translate_part(
+        self,
+        i: int,
+        part_data: dict,
+        builder: "RequestBuilder",
+        stage_strategy: "StageStrategy",
+        formats_chain: list[str],
+        render,
+    ) -> tuple[list[str], bool, set[int]]:
+        """阶段 1：翻译单个分片，含格式回退与 P1-2 补充翻译。
+
+        Args:
+            i: 分片序号（0-based）
+            render: fmt -> 全部分片的 user prompt 列表
+
+        Returns:
+            (分片译文, 是否回退, 分片内回退为 KR 原文的位置)
+        """
+        part_result = None
+        part_fallback = False
+        part_unreliable: set[int] = set()
+        tried_formats: list[str] = []
+        retry_indices: list[int] = []
+        selected_call_record: dict | None = None
+        failed_format_calls: list[dict] = []
+
+        for fmt_idx, fmt in enumerate(formats_chain):
+            call_record = None
+            tried_formats.append(fmt)
+            # 按当前格式构建 system prompt
+            system_prompt = stage_strategy.build_stage_1_prompt(
+                self.file_type,
+                prompt_format=fmt,
+            )
+
+            # 按当前格式构建 user prompt
+            user_prompt = render(fmt)
+            user_text = user_prompt[i] if i < len(user_prompt) else user_prompt[0]
+
+            # 自适应超时：基于实际请求长度 + 预期输出长度
+            input_len = len(json.dumps(part_data, ensure_ascii=False))
+            timeout = max(input_len * 3 // 400 + 40, 60)
+
+            # P0-3: LLM 调用前预检查分片大小，记录详细诊断数据
+            _rendered_len = len(user_text)
+            text_blocks_for_part = part_data.get("text_blocks", [])
+            ref_for_part = part_data.get("reference", {})
+            if _rendered_len > 20000:
+                _logger.warning(
+                    f"[{self.file_name}] [{fmt}] 第 {i + 1}/{len(builder.split_requests)} 部分 "
+                    f"超限: 渲染长度={_rendered_len} > 限制=20000 | "
+                    f"text_blocks={len(text_blocks_for_part)} | "
+                    f"proper_terms={len(ref_for_part.get('proper_terms', []))} | "
+                    f"affects={len(ref_for_part.get('affects', []))} | "
+                    f"models={len(ref_for_part.get('models', []))} | "
+                    f"model_docs={len(ref_for_part.get('model_docs', []))} | "
+                    f"skill_doc_len={len(ref_for_part.get('skill_doc', ''))}"
+                )
+
+            # 更新线程本地 translator 的 system_prompt 和 response_format
+            # 放在 try 外：配置更新失败不应被当作解析失败
+            try:
+                self._update_translator_prompt(system_prompt, self._format_to_response_format(fmt))
+            except Exception as exc:
+                self._record_diagnostic_event(
+                    stage="stage_1",
+                    status="internal_error",
+                    failure_kind="translator_config_error",
+                    prompt_format=fmt,
+                    part=i + 1,
+                    exc=exc,
+                )
+                raise
+
+            # 仅在 xml_json ↔ xml_xml 回退时清除缓存
+            # （两者共用 _make_xml_user_prompt 产生相同 user_text，
+            #  缓存键仅含 user_text hash，不区分 system_prompt/response_format）
+            # 其他格式回退（json_json）user_text 不同，无需清缓存
+            if fmt_idx > 0 and {formats_chain[fmt_idx - 1], fmt} == {"xml_json", "xml_xml"}:
+                self._translator.clear_cache()
+
+            try:
+                batched = None
+                if fmt_idx == 0 and len(builder.split_requests) <= 1:
+                    batched = self._batched_stage_1(
+                        part_data, builder, stage_strategy, fmt, system_prompt, _rendered_len,
+                    )
+                if batched is not None:
+                    parsed, call_record = batched
+                else:
+                    _, parsed, call_record = self._call_ai(
+                        stage="stage_1",
+                        system_prompt=system_prompt,
+                        user_prompt=user_text,
+                        response_format=self._format_to_response_format(fmt),
+                        timeout=timeout,
+                        parser=lambda response, current_format=fmt: (
+                            stage_strategy.parse_stage_1_result(
+                                response, prompt_format=current_format,
+                            )
+                        ),
+                        parse_error_provider=stage_strategy.consume_parse_errors,
+                        prompt_format=fmt,
+                        part=i + 1,
+                        attempt=fmt_idx + 1,
+                        metadata={
+                            "rendered_length": _rendered_len,
+                            "text_blocks": len(text_blocks_for_part),
+                        },
+                    )
+
+                if not parsed:
+                    raise ValueError(f"{fmt}: 解析结果为空")
+
+                # 按 id 对齐解析结果与文本块（解决 LLM 跳过/重排条目导致的错位）
+                text_blocks = part_data.get("text_blocks", [])
+                expected_count = len(text_blocks)
+
+                # 构建 id → parsed_item 映射
+                parsed_by_id: dict[int, dict] = {}
+                for t in parsed:
+                    if isinstance(t, dict):
+                        try:
+                            tid = int(t.get("id", 0))
+                            if tid:
+                                parsed_by_id[tid] = t
+                        except (ValueError, TypeError):
+                            continue
+
+                # 置信度检查准备
+                _CONFIDENCE_ORDER = {"low": 0, "medium": 1, "high": 2}
+                threshold = _CONFIDENCE_ORDER.get(self._config.min_confidence, 1)
+                low_conf_count = 0
+                low_confidence_ids: list[int] = []
+                missing_ids: list[int] = []
+
+                # 按 text_block 顺序（1-based id）提取翻译
+                part_result: list[str] = []
+                for idx, block in enumerate(text_blocks):
+                    expected_id = idx + 1
+                    t = parsed_by_id.get(expected_id)
+                    if t is None and idx < len(parsed):
+                        # id 未匹配，尝试按顺序回退（LLM 可能未输出 id）
+                        fallback_t = parsed[idx]
+                        if isinstance(fallback_t, dict):
+                            t = fallback_t
+
+                    if t is not None and isinstance(t, dict):
+                        translation = t.get("translation", "")
+                        # 置信度检查：低于 min_confidence 的条目回退为 KR 原文
+                        conf = str(t.get("confidence", "medium")).lower()
+                        if _CONFIDENCE_ORDER.get(conf, 1) < threshold:
+                            reasoning = t.get("reasoning", "")
+                            _logger.warning(
+                                f"[{self.file_name}] [{fmt}] 低置信度条目 #{expected_id}: "
+                                f"confidence={conf}, reasoning={reasoning[:200]}"
+                            )
+                            low_conf_count += 1
+                            low_confidence_ids.append(expected_id)
+                            translation = block.get("kr", "")
+                        part_result.append(translation)
+                    else:
+                        part_result.append(block.get("kr", ""))
+                        missing_ids.append(expected_id)
+
+                # P1-1: 缺失条目时若还有剩余格式则尝试下一格式
+                if missing_ids:
+                    if fmt_idx + 1 < len(formats_chain):
+                        self._mark_call_failure(
+                            call_record,
+                            status="validation_error",
+                            failure_kind="missing_translation_ids",
+                            validation_errors=[{
+                                "missing_ids": missing_ids,
+                                "expected_count": expected_count,
+                                "action": "try_next_format",
+                            }],
+                        )
+                        _logger.warning(
+                            f"[{self.file_name}] [{fmt}] {len(missing_ids)} 个文本块缺失翻译 "
+                            f"(id: {missing_ids[:10]}...)，尝试下一格式"
+                        )
+                        failed_format_calls.append(call_record)
+                        continue
+                    self._mark_call_failure(
+                        call_record,
+                        status="fallback",
+                        failure_kind="missing_translation_ids",
+                        validation_errors=[{
+                            "missing_ids": missing_ids,
+                            "expected_count": expected_count,
+                            "action": "fallback_to_source",
+                        }],
+                    )
+                    _logger.warning(
+                        f"[{self.file_name}] [{fmt}] {len(missing_ids)} 个文本块缺失翻译 "
+                        f"(id: {missing_ids[:10]}...)，已回退为 KR 原文"
+                    )
+                if low_conf_count > 0:
+                    self._mark_call_failure(
+                        call_record,
+                        status="fallback",
+                        failure_kind="low_confidence",
+                        validation_errors=[{
+                            "count": low_conf_count,
+                            "ids": low_confidence_ids,
+                            "minimum_confidence": self._config.min_confidence,
+                        }],
+                    )
+                    _logger.info(
+                        f"[{self.file_name}] [{fmt}] {low_conf_count} 条翻译因低置信度"
+                        f" (min={self._config.min_confidence}) 回退为 KR 原文"
+                    )
+
+                retry_indices = sorted({
+                    *(expected_id - 1 for expected_id in missing_ids),
+                    *(expected_id - 1 for expected_id in low_confidence_ids),
+                })
+                selected_call_record = call_record
+                break  # 翻译完整，退出格式回退循环
+
+            except (json.JSONDecodeError, ValueError) as e:
+                if call_record is not None:
+                    failed_format_calls.append(call_record)
+                _logger.warning(
+                    f"[{self.file_name}] [{fmt}] 解析失败 ({e})"
+                )
+                continue
+
+        if part_result is None:
+            # 全部格式失败 → 无条件 warning + 标记降级
+            _logger.warning(
+                f"[{self.file_name}] 全部格式 ({', '.join(tried_formats)}) "
+                f"解析失败，第 {i + 1}/{len(builder.split_requests)} 部分回退为 KR 原文"
+            )
+            part_fallback = True
+            text_blocks = part_data.get("text_blocks", [])
+            part_result = [b.get("kr", "") for b in text_blocks]
+            part_unreliable.update(range(len(part_result)))
+        else:
+            # P1-2: 部分格式成功但存在缺失条目 → 补充翻译重试
+            text_blocks = part_data.get("text_blocks", [])
+            unresolved_count = len(retry_indices)
+            supplemental_call = None
+            if (
+                retry_indices and len(retry_indices) < len(text_blocks)
+                and self._budget_allows("p1_2")
+            ):
+                fixed = self._retry_missing_entries(
+                    builder, stage_strategy, part_data, part_result,
+                    retry_indices, tried_formats, i,
+                )
+                supplemental_call = self._supplemental_calls.get(i)
+                unresolved_count -= fixed
+
+            if unresolved_count > 0:
+                part_fallback = True
+                part_unreliable.update(
+                    idx for idx in retry_indices
+                    if part_result[idx] == text_blocks[idx].get("kr", "")
+                )
+            else:
+                self._mark_call_recovered(
+                    selected_call_record,
+                    recovery_kind="supplemental_translation",
+                    recovered_by=supplemental_call,
+                )
+
+            for failed_call in failed_format_calls:
+                self._mark_call_recovered(
+                    failed_call,
+                    recovery_kind="format_fallback",
+                    recovered_by=selected_call_record,
+                )
+
+        return part_result, part_fallback, part_unreliable
+
+    def _batched_stage_1(
+        self,
+        part_data: dict,
+        builder: "RequestBuilder",
+        stage_strategy: "StageStrategy",
+        fmt: str,
+        system_prompt: str,
+        rendered_length: int,
+    ) -> tuple[list[dict], dict] | None:
+        """小文件的主格式阶段 1 请求交给 RequestBatcher 与其他文件合并发送。
+
+        返回按本文件 1..n 编号的解析结果与调用记录；未合并或合并失败时返回 None，
+        由调用方按原流程单独请求。
+        """
+        if (
+            self._batcher is None
+            or self.file_type not in (FileType.UI, FileType.OTHER)
+            or not self._batcher.accepts(part_data, rendered_length)
+        ):
+            return None
+
+        def execute(merged: dict) -> tuple[list, dict]:
+            user_text = builder._get_request_text(merged, fmt)
+            input_len = len(json.dumps(merged, ensure_ascii=False))
+            _, parsed, record = self._call_ai(
+                stage="stage_1",
+                system_prompt=system_prompt,
+                user_prompt=user_text,
+                response_format=self._format_to_response_format(fmt),
+                timeout=max(input_len * 3 // 400 + 40, 60),
+                parser=lambda response: stage_strategy.parse_stage_1_result(
+                    response, prompt_format=fmt,
+                ),
+                parse_error_provider=stage_strategy.consume_parse_errors,
+                prompt_format=fmt,
+                part=1,
+                attempt=1,
+                metadata={
+                    "rendered_length": len(user_text),
+                    "text_blocks": len(merged["text_blocks"]),
+                    "batched_files": merged["metadata"]["batched_files"],
+                },
+                file_usage=False,
+            )
+            return parsed, record
+
+        item = self._batcher.submit(
+            (self.file_type, fmt),
+            BatchItem(self.file_name, part_data, rendered_length),
+            execute,
+        )
+        if item.record is None:
+            return None
+        record = self._batch_share_record(item)
+        if item.parsed is None:
+            return None
+        return item.parsed, record
+
+    def _batch_share_record(self, item: BatchItem) -> dict:
+        """按文本块数分摊合并请求的用量，返回本文件保存的调用记录副本。
+
+        每个参与文件（含发出请求的文件）都保存副本，usage / estimated_tokens 为本文件的份额，
+        metadata 记录批次 id（合并请求的 call_id）、发出请求的文件与批次总用量；
+        副本互不共享，标记失败时不会互相影响。
+        """
+        shared = item.record
+        usage = split_usage(shared.get("usage"), item.batch_sizes)[item.batch_index]
+        estimated = apportion(shared.get("estimated_tokens", 0), item.batch_sizes)[item.batch_index]
+        if self._usage is not None:
+            self._usage.add_file_share(usage, file_name=self.path_config.rel_path.as_posix())
+
+        record = deepcopy(shared)
+        record["usage"] = usage
+        record["estimated_tokens"] = estimated
+        record["metadata"] = {
+            **record.get("metadata", {}),
+            "batch_id": shared["call_id"],
+            "batch_leader": item.leader,
+            "batch_text_blocks": item.batch_sizes[item.batch_index],
+            "batch_usage": shared.get("usage"),
+            "batch_estimated_tokens": shared.get("estimated_tokens", 0),
+        }
+        if self._recorder is not None:
+            # 发出请求的文件用副本替换 _call_ai 追加的共享记录
+            self._api_calls[:] = [call for call in self._api_calls if call is not shared]
+            self._api_calls.append(record)
+        return record
+
+    def _part_concurrency(self, part_count: int) -> int:
+        """同一文件同时排入请求引擎队列的分片数。
+
+        仅在使用请求引擎时启用：传统路径的线程本地 translator 依赖
+        update_config() 切换提示词，不能被多个分片同时使用。
+        """
+        if self._request_engine is None or part_count < 2:
+            return 1
+        return max(1, min(self._config.part_concurrency, part_count))
+
+    def _memory_context(self) -> str:
+        """翻译记忆的上下文指纹：模型、翻译模式和主格式的阶段 1 提示词版本。"""
+        system_prompt = StageStrategy(self._config).build_stage_1_prompt(
+            self.file_type, prompt_format=self._config.prompt_format,
+        )
+        payload = json.dumps(
+            {
+                "translator": self._config.translator_name,
+                "model": self._config.translator_api.get("model_name", ""),
+                "translation_mode": self._config.translation_mode,
+                "self_check": self._config.enable_self_check,
+                "min_confidence": self._config.min_confidence,
+                "file_type": self.file_type.name,
+                "prompt": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _store_translation_memory(
+        self,
+        builder: "RequestBuilder",
+        result: list[str],
+        unreliable_indices: set[int],
+    ) -> None:
+        """将可靠的译文写回翻译记忆；回退为 KR 原文的位置不写入。"""
+        if self._memory is None or not builder.memory_keys:
+            return
+        items = [
+            (key, translation)
+            for index, (key, translation) in enumerate(zip(builder.memory_keys, result))
+            if key and index not in unreliable_indices and isinstance(translation, str)
+        ]
+        try:
+            self._memory.put_many(items)
+        except Exception:
+            _logger.exception(f"[{self.file_name}] 翻译记忆写入失败，不影响本次结果")
+
+    def _publish_shared(
+        self,
+        builder: "RequestBuilder",
+        result: list[str],
+        unreliable_indices: set[int],
+        offset: int = 0,
+    ) -> None:
+        """发布本文件所有的去重键译文；回退为 KR 原文的位置发布 None。
+
+        result 对应从 offset 开始的文本块（单个分片时为分片在全部文本块中的偏移）；
+        同一键只有首次发布生效。
+        """
+        if self._shared is None:
+            return
+        keys = builder.shared_keys[offset:offset + len(result)]
+        for index, (key, translation) in enumerate(zip(keys, result)):
+            if key:
+                reliable = index not in unreliable_indices and isinstance(translation, str)
+                self._shared.publish(key, translation if reliable else None)
+
+    def _resolve_shared(self, builder: "RequestBuilder") -> bool:
+        """取回由其他文件翻译的文本块；所有者未能提供译文的文本块由本文件补译。
+
+        在本文件自身的请求全部完成、本文件所有的键发布之后调用。
+
+        Returns:
+            补译是否有文本块回退为 KR 原文。
+        """
+        if self._shared is None or not builder.shared_pending:
+            return False
+        unresolved = builder.resolve_shared(SHARED_WAIT_TIMEOUT)
+        if not builder.shared_unresolved:
+            return False
+        _logger.debug(
+            f"[{self.file_name}] {len(builder.shared_unresolved)} 个去重文本块未取得其他文件的译文，"
+            f"由本文件补译"
+        )
+        translated, had_fallback = self._translate(unresolved, follow_up=True)
+        builder.fill_unresolved(translated)
+        return had_fallback
+
     def _retry_missing_entries(
         self,
         builder: "RequestBuilder",
@@ -1113,6 +1659,7 @@ class FileProcessor:
                     "missing_source_ids": [idx + 1 for idx in kr_fallback_indices],
                 },
             )
+            self._supplemental_calls[part_idx] = call_record
 
             if not supp_parsed:
                 _logger.info(f"[{self.file_name}] P1-2 补充翻译：解析结果为空，保留 KR 原文")
@@ -1163,6 +1710,9 @@ class FileProcessor:
                 )
             return fixed
 
+        except BudgetExhausted:
+            _logger.info(f"[{self.file_name}] token 预算不足，跳过 P1-2 补充翻译")
+            return 0
         except Exception as e:
             if not supp_call_started:
                 self._record_diagnostic_event(
@@ -1199,7 +1749,12 @@ class FileProcessor:
         return "text" if prompt_format == "xml_xml" else "json_object"
 
     def _update_translator_prompt(self, system_prompt: str, response_format: str):
-        """更新线程本地 translator 的 system_prompt 和 response_format，抑制日志。"""
+        """更新线程本地 translator 的 system_prompt 和 response_format，抑制日志。
+
+        使用请求引擎时提示词随每个请求传入，无需更新 translator。
+        """
+        if self._request_engine is not None:
+            return
         with _suppress_translatekit_log(self._config.debug_mode):
             self._translator.update_config(
                 system_prompt=system_prompt,
@@ -1339,38 +1894,48 @@ class FileProcessor:
     # ========== 加载与检查 ==========
 
     def _load_jsons(self) -> ProcessOutcome | None:
-        """加载 KR/EN/JP/LLC JSON 文件。出错时返回 ProcessOutcome。"""
+        """加载 KR/LLC JSON 文件。出错时返回 ProcessOutcome。
+
+        EN/JP 参考文件只在确实有条目需要翻译时由 _load_references 加载：
+        大多数文件在 _check_translated 比对 KR 与 LLC 后即直接保存 LLC。
+        """
         try:
-            with open(self.path_config.KR_path, "r", encoding="utf-8-sig") as f:
-                self.kr_json = json.load(f)
-            try:
-                with open(self.path_config.EN_path, "r", encoding="utf-8-sig") as f:
-                    self.en_json = json.load(f)
-            except FileNotFoundError:
-                _logger.debug(f"[{self.file_name}] EN 参考文件缺失: {self.path_config.EN_path}")
-                self.en_json = deepcopy(self.kr_json)
-            try:
-                with open(self.path_config.JP_path, "r", encoding="utf-8-sig") as f:
-                    self.jp_json = json.load(f)
-            except FileNotFoundError:
-                _logger.debug(f"[{self.file_name}] JP 参考文件缺失: {self.path_config.JP_path}")
-                self.jp_json = deepcopy(self.kr_json)
+            self.kr_json = jsoncodec.load(self.path_config.KR_path)
             try:
-                with open(self.path_config.LLC_path, "r", encoding="utf-8-sig") as f:
-                    self.llc_json = json.load(f)
+                self.llc_json = jsoncodec.load(self.path_config.LLC_path)
             except FileNotFoundError:
                 _logger.debug(f"[{self.file_name}] LLC 参考文件缺失: {self.path_config.LLC_path}")
                 self.llc_json = {}
         except json.JSONDecodeError as e:
-            _logger.exception(f"[{self.file_name}] JSON 解析失败: {self.path_config.KR_path} (line {e.lineno}, col {e.colno})")
-            self._save_except()
-            return ProcessOutcome(
-                ProcessResult.JSON_DECODE_ERROR,
-                self.file_name,
-                {"file_path": str(self.path_config.KR_path), "reason": f"line {e.lineno}, col {e.colno}: {e.msg}"},
-            )
+            return self._json_decode_error(self.path_config.KR_path, e)
         return None
 
+    def _load_references(self) -> ProcessOutcome | None:
+        """加载 EN/JP 参考文件并建立索引。出错时返回 ProcessOutcome。"""
+        for lang in ("en", "jp"):
+            path = getattr(self.path_config, f"{lang.upper()}_path")
+            try:
+                data = jsoncodec.load(path)
+            except FileNotFoundError:
+                _logger.debug(f"[{self.file_name}] {lang.upper()} 参考文件缺失: {path}")
+                # 只读视图代替整份副本：参考语言数据在处理过程中不会被修改
+                data = MappingProxyType(self.kr_json)
+            except json.JSONDecodeError as e:
+                return self._json_decode_error(path, e)
+            setattr(self, f"{lang}_json", data)
+            setattr(self, f"{lang}_data", data.get("dataList", []))
+            setattr(self, f"{lang}_index", self._index_data(getattr(self, f"{lang}_data")))
+        return None
+
+    def _json_decode_error(self, path: Path, e: json.JSONDecodeError) -> ProcessOutcome:
+        _logger.exception(f"[{self.file_name}] JSON 解析失败: {path} (line {e.lineno}, col {e.colno})")
+        self._save_except()
+        return ProcessOutcome(
+            ProcessResult.JSON_DECODE_ERROR,
+            self.file_name,
+            {"file_path": str(path), "reason": f"line {e.lineno}, col {e.colno}: {e.msg}"},
+        )
+
     def _check_empty(self) -> ProcessOutcome | None:
         """检查 KR 数据是否为空。为空时返回 ProcessOutcome。"""
         if self.kr_json in EMPTY_DATA or self.kr_json.get("dataList", []) in EMPTY_DATA_LIST:
@@ -1381,8 +1946,27 @@ class FileProcessor:
                 return ProcessOutcome(ProcessResult.EMPTY_SKIPPED, self.file_name)
         return None
 
+    def _llc_covers_kr(self) -> bool:
+        """LLC 与 KR 的条目 id 序列一致、且没有过期条目。"""
+        return (
+            bool(self.llc_index)
+            and list(self.kr_index.keys()) == list(self.llc_index.keys())
+            and not self._stale_ids
+        )
+
     def _check_translated(self) -> ProcessOutcome | None:
-        """检查是否已翻译。已翻译时返回 ProcessOutcome。"""
+        """检查是否已翻译。已翻译或参考文件解析失败时返回 ProcessOutcome。
+
+        快速路径：KR 与 LLC 的 id 一致时直接保存 LLC，不加载 EN/JP；
+        否则加载参考文件，按原有规则对齐后再判断。
+        """
+        if self._llc_covers_kr() and self.path_config.LLC_path.exists():
+            self._save_llc()
+            return ProcessOutcome(ProcessResult.ALREADY_TRANSLATED, self.file_name)
+        outcome = self._load_references()
+        if outcome:
+            return outcome
+
         if not len(self.jp_index) == len(self.kr_index) == len(self.en_index):
             def _align(d: dict, ref: dict) -> dict:
                 return {k: d.get(k, ref[k]) for k in ref}
@@ -1393,7 +1977,7 @@ class FileProcessor:
                 self.llc_index = _align(self.llc_index, self.kr_index)
 
         # 验证 LLC 源文件确实存在，且索引键匹配
-        if self.llc_index and list(self.kr_index.keys()) == list(self.llc_index.keys()):
+        if self._llc_covers_kr():
             if self.path_config.LLC_path.exists():
                 self._save_llc()
                 return ProcessOutcome(ProcessResult.ALREADY_TRANSLATED, self.file_name)
@@ -1410,25 +1994,108 @@ class FileProcessor:
         self.is_skill = self.path_config.real_name.startswith("Skills_")
 
     def _make_data_index(self) -> None:
-        if self.is_story:
-            self.en_index = {i: d for i, d in enumerate(self.en_data)}
-            self.kr_index = {i: d for i, d in enumerate(self.kr_data)}
-            self.jp_index = {i: d for i, d in enumerate(self.jp_data)}
-            self.llc_index = {i: d for i, d in enumerate(self.llc_data)}
-        else:
-            # 防御：部分 JSON 的 dataList 元素缺少 "id" 键，回退为 enumerate 索引
-            def _make_non_story_index(data: list) -> dict:
-                if data and isinstance(data[0], dict) and "id" in data[0]:
-                    return {i["id"]: i for i in data}
-                return {idx: item for idx, item in enumerate(data)}
+        self.en_index = self._index_data(self.en_data)
+        self.kr_index = self._index_data(self.kr_data)
+        self.jp_index = self._index_data(self.jp_data)
+        self.llc_index = self._index_data(self.llc_data)
 
-            self.en_index = _make_non_story_index(self.en_data)
-            self.kr_index = _make_non_story_index(self.kr_data)
-            self.jp_index = _make_non_story_index(self.jp_data)
-            self.llc_index = _make_non_story_index(self.llc_data)
+    def _index_data(self, data: list) -> dict:
+        if self.is_story:
+            return {i: d for i, d in enumerate(data)}
+        # 防御：部分 JSON 的 dataList 元素缺少 "id" 键，回退为 enumerate 索引
+        if data and isinstance(data[0], dict) and "id" in data[0]:
+            return {i["id"]: i for i in data}
+        return {idx: item for idx, item in enumerate(data)}
 
     def _get_translating(self) -> None:
-        self.translating_list = [i for i in self.kr_index if i not in self.llc_index]
+        self.translating_list = [
+            i for i in self.kr_index
+            if (i not in self.llc_index or i in self._stale_ids)
+            and i not in self._reused_entries
+        ]
+
+    # ========== 条目级索引 ==========
+
+    @property
+    def _entry_key(self) -> str:
+        return self.path_config.rel_path.as_posix()
+
+    def _plan_entries(self) -> None:
+        """对照上次发布的条目索引，找出过期的熟肉条目与可复用的自有译文。
+
+        - KR 已变化而 LLC 未更新：熟肉已过期，需重译
+        - 上次由本工具翻译、KR 未变化且熟肉仍未更新：直接复用上次输出
+        必须在 _check_translated 对齐 llc_index 之前调用。
+        """
+        previous = self._entry_index.previous_entries(self._entry_key)
+        self._entry_hashes = {
+            i: (hash_entry(entry), hash_entry(self.llc_index.get(i)))
+            for i, entry in self.kr_index.items()
+        }
+        if not previous:
+            return
+
+        reusable = set()
+        for i, (kr_hash, llc_hash) in self._entry_hashes.items():
+            record = previous.get(str(i))
+            if not record:
+                continue
+            prev_kr, prev_llc, prev_source = record
+            ours = prev_kr == kr_hash and prev_source == SOURCE_OURS
+            if llc_hash and prev_llc == llc_hash and (prev_kr != kr_hash or ours):
+                self._stale_ids.add(i)
+            if ours and (not llc_hash or i in self._stale_ids):
+                reusable.add(i)
+
+        if reusable:
+            previous_index = self._load_previous_output()
+            self._reused_entries = {
+                i: previous_index[i] for i in reusable if i in previous_index
+            }
+        if self._stale_ids or self._reused_entries:
+            _logger.info(
+                f"[{self.file_name}] 条目索引：{len(self._stale_ids)} 条熟肉已过期，"
+                f"{len(self._reused_entries)} 条复用上次译文"
+            )
+
+    def _load_previous_output(self) -> dict:
+        """读取上次发布中同一文件的输出并建立索引。"""
+        previous_root = self._config.reuse_output_dir
+        if previous_root is None:
+            return {}
+        previous_file = previous_root / self.path_config.rel_dir / self.path_config.real_name
+        try:
+            data = jsoncodec.load(previous_file).get("dataList", [])
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError, AttributeError):
+            _logger.warning(f"[{self.file_name}] 上次输出无法读取，不复用条目: {previous_file}")
+            return {}
+        return self._index_data(data)
+
+    def _record_entry_index(self) -> None:
+        """记录本次输出中每个条目的来源，供下次运行比对。"""
+        if not self._entry_hashes:
+            return
+        translated = set(self.translating_list) | set(self._reused_entries)
+        self._entry_index.record(self._entry_key, {
+            str(i): [kr_hash, llc_hash, SOURCE_OURS if i in translated else SOURCE_LLC]
+            for i, (kr_hash, llc_hash) in self._entry_hashes.items()
+        })
+
+    def _save_reused_only(self) -> ProcessOutcome:
+        """无条目需要翻译、但有条目复用上次译文时，直接重建并保存。"""
+        self._base_index = self.kr_index
+        try:
+            self._save_result(self._de_get_translating())
+        except Exception as e:
+            _logger.exception(f"[{self.file_name}] 保存结果异常: {e}")
+            return ProcessOutcome(
+                ProcessResult.SAVE_ERROR,
+                self.file_name,
+                {"reason": str(e), "exception_type": type(e).__name__, "traceback": traceback.format_exc()},
+            )
+        return ProcessOutcome(ProcessResult.SUCCESS_SAVED, self.file_name)
 
     # ========== 文本提取 / 重建 ==========
 
@@ -1444,17 +2111,20 @@ class FileProcessor:
         return translating_text
 
     def _de_get_translating_text(self, translated_text: dict) -> dict:
-        self._base_index = deepcopy(self.kr_index)
+        # 结构共享：只复制要写入译文的条目，其余条目直接引用 kr_index（只读）
+        self._base_index = dict(self.kr_index)
         for i in self.translating_list:
-            trans_item = self._base_index[i]
-            translated_item = translated_text[i]
-            update_dict_with_flattened(trans_item, translated_item)
+            trans_item = deepcopy(self.kr_index[i])
+            update_dict_with_flattened(trans_item, translated_text[i])
+            self._base_index[i] = trans_item
         return self._base_index
 
     def _de_get_translating(self) -> dict:
         result = []
         for i in self.kr_index:
-            if i in self.llc_index:
+            if i in self._reused_entries:
+                result.append(self._reused_entries[i])
+            elif i in self.llc_index and i not in self._stale_ids:
                 result.append(self.llc_index[i])
             else:
                 result.append(self._base_index[i])
@@ -1462,19 +2132,24 @@ class FileProcessor:
 
     # ========== 保存 ==========
 
+    # dry_run 时所有保存路径均不写文件，输出目录保持原样
+
     def _save_result(self, data: dict) -> None:
-        if not self._config.save_result:
+        if not self._config.save_result or self._config.dry_run:
             return
         self.path_config.target_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.path_config.target_file, "w", encoding="utf-8-sig") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        jsoncodec.dump(data, self.path_config.target_file, indent=4, bom=True)
 
     def _save_llc(self) -> None:
+        if self._config.dry_run:
+            return
         self.path_config.target_file.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(self.path_config.LLC_path, self.path_config.target_file)
 
     def _save_except(self) -> None:
         """回退保存：依次尝试 LLC → EN → JP → KR。"""
+        if self._config.dry_run:
+            return
         for path_attr in ("LLC_path", "EN_path", "JP_path", "KR_path"):
             try:
                 src = getattr(self.path_config, path_attr)
@@ -1532,7 +2207,10 @@ class _SimpleRequestBuilder:
         - 不足时用 KR 原文填充缺失条目
         - 多余时截断并警告
         """
-        original = deepcopy(getattr(self, f"{from_lang}_texts"))
+        # 扁平化条目的值均为叶子，逐条目浅复制即可，无需深复制整份数据
+        original = {
+            idx: dict(flat) for idx, flat in getattr(self, f"{from_lang}_texts").items()
+        }
 
         # 先计算预期数量，同时收集 KR 原文用于可能的回退填充
         expected_count = 0
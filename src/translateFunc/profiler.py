@@ -16,11 +16,13 @@ class TimingProfiler:
 
     线程安全：_lock 保护 _records 的并发访问（per-file 计时在 worker 线程中运行）。
     嵌套支持：内层 phase 的耗时会从外层 phase 中扣除，确保 report() 的总时长为真实用时。
+    指标：set_metric() 记录的数值（如并发上限、排队深度）附在报告末尾。
     """
     _instance: "TimingProfiler | None" = None
 
     def __init__(self):
         self._records: Dict[str, float] = {}
+        self._metrics: Dict[str, float] = {}
         self._lock = threading.Lock()
         self._thread_local = threading.local()
 
@@ -33,6 +35,12 @@ class TimingProfiler:
     def reset(self) -> None:
         """清除所有记录。"""
         self._records.clear()
+        self._metrics.clear()
+
+    def set_metric(self, name: str, value: float) -> None:
+        """记录一个数值指标，同名指标被覆盖。"""
+        with self._lock:
+            self._metrics[name] = value
 
     def _get_stack(self):
         """获取当前线程的 phase 栈，首次访问时初始化。"""
@@ -89,5 +97,10 @@ class TimingProfiler:
             lines.append(f"{name:<24} {elapsed:>8.2f}s  {pct:>6.1f}%")
         lines.append("-" * 44)
         lines.append(f"{'总计':<24} {total:>8.2f}s")
+        if self._metrics:
+            lines.append("-" * 44)
+            for name, value in self._metrics.items():
+                text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                lines.append(f"{name:<24} {text:>10}")
         lines.append("=" * 33)
         return "\n".join(lines)
@@ -5,11 +5,11 @@ JP/EN 上下文提取：对每个专有名词 KR 术语，在游戏文件中搜
 """
 from __future__ import annotations
 from pathlib import Path
-import json
 import logging
 
 _logger = logging.getLogger("LCTA")  # 与 LogManager 一致，确保日志正确路由
 
+from translateFunc import jsoncodec
 from translateFunc.proper.flat import flatten_dict_enhanced
 
 
@@ -72,6 +72,8 @@ def extract_contexts_batch(
     jp_path: Path,
     en_path: Path,
     max_examples: int = 20,
+    cache_dir: Path | None = None,
+    backend: str = "python",
 ) -> dict[str, list[dict]]:
     """
     批量提取多个术语的 JP/EN 上下文。单次文件扫描 + AC 自动机匹配。
@@ -85,12 +87,13 @@ def extract_contexts_batch(
         jp_path: JP 游戏文件目录
         en_path: EN 游戏文件目录
         max_examples: 每个术语最多收集的上下文条数
+        cache_dir: 自动机磁盘缓存目录；术语列表未变化时跳过构建
+        backend: AC 自动机后端（"auto" / "python" / "pyahocorasick"）
 
     Returns:
         {term: [{kr_sentence, jp_sentence, en_sentence, file, path}, ...], ...}
     """
-    import logging
-    from translateFunc.matcher.ac_automaton import AcAutomaton
+    from translateFunc.matcher.ac_cache import cached_automaton
 
     if not terms:
         return {}
@@ -98,12 +101,10 @@ def extract_contexts_batch(
     # 0. 去重，避免同一术语多次 add_pattern 导致重复匹配
     terms = list(dict.fromkeys(terms))
 
-    # 1. 构建包含所有术语的 AC 自动机
-    ac = AcAutomaton()
-    for term in terms:
-        if term:  # 跳过空术语
-            ac.add_pattern(term)
-    ac.build()
+    # 1. 构建包含所有术语的 AC 自动机（跳过空术语）
+    ac = cached_automaton(
+        [(term, None) for term in terms if term], cache_dir, "contexts", backend,
+    )
 
     # 2. 初始化结果容器
     results: dict[str, list[dict]] = {term: [] for term in terms if term}
@@ -174,7 +175,6 @@ def extract_contexts_batch(
 def _load_json(filepath: Path) -> dict | None:
     """加载 JSON 文件，任何错误返回 None。"""
     try:
-        with open(filepath, "r", encoding="utf-8-sig") as f:
-            return json.load(f)
+        return jsoncodec.load(filepath)
     except Exception:
         return None
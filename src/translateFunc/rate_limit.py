@@ -0,0 +1,128 @@
+"""
+translateFunc/rate_limit.py
+AdaptiveLimiter —— 进程内共享的 AIMD 并发控制器。
+
+所有 AI 调用在发送前获取一个名额：
+  - 成功：上限按 1/上限 递增（约每轮满并发 +1）
+  - 429 / 5xx / 超时：上限减半，同一拥塞窗口内只减一次
+这样在服务端开始限流时整体退让，恢复后再逐步加压，
+避免所有线程同时重试造成的错误风暴。
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+import threading
+from typing import Iterator
+
+_TIMEOUT_MARKERS = ("timeout", "timed out", "超时")
+_CONGESTION_MARKERS = ("请求频率超限", "服务器内部错误", "429")
+
+
+def is_congestion_signal(http_attempts: list[dict] | None, exc: BaseException | None) -> bool:
+    """判断一次调用是否遇到服务端拥塞（429、5xx 或超时）。
+
+    translatekit 内部会重试，因此只要任一 HTTP 尝试返回 429/5xx 即视为拥塞。
+    """
+    for attempt in http_attempts or []:
+        status = attempt.get("status_code")
+        if isinstance(status, int) and (status == 429 or status >= 500):
+            return True
+    while exc is not None:
+        message = f"{type(exc).__name__}: {exc}".lower()
+        if any(marker in message for marker in _TIMEOUT_MARKERS + _CONGESTION_MARKERS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class _Slot:
+    """一次调用占用的名额；调用方设置 congested 以报告拥塞。"""
+
+    __slots__ = ("epoch", "congested")
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.congested = False
+
+
+class AdaptiveLimiter:
+    """线程安全的 AIMD 并发上限。
+
+    用法：
+        with limiter.slot() as slot:
+            response = call()
+            slot.congested = is_congestion_signal(attempts, None)
+    """
+
+    def __init__(self, initial: int, *, minimum: int = 1, maximum: int | None = None):
+        if initial < 1:
+            raise ValueError("initial 必须为正整数")
+        self._minimum = max(1, minimum)
+        self._maximum = max(maximum or initial, self._minimum)
+        self._limit = float(min(max(initial, self._minimum), self._maximum))
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        # 每次减半后递增；窗口开始前发出的请求再报告拥塞不会重复减半
+        self._epoch = 0
+
+        self.peak_waiting = 0
+        self.lowest_limit = self.limit
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self._minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def acquire(self) -> _Slot:
+        with self._cond:
+            if self._in_flight >= self.limit:
+                self._waiting += 1
+                self.peak_waiting = max(self.peak_waiting, self._waiting)
+                try:
+                    while self._in_flight >= self.limit:
+                        self._cond.wait()
+                finally:
+                    self._waiting -= 1
+            self._in_flight += 1
+            return _Slot(self._epoch)
+
+    def release(self, slot: _Slot) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if slot.congested:
+                if slot.epoch == self._epoch:
+                    self._limit = max(float(self._minimum), self._limit / 2)
+                    self._epoch += 1
+                    self.decreases += 1
+                    self.lowest_limit = min(self.lowest_limit, self.limit)
+            else:
+                self._limit = min(float(self._maximum), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[_Slot]:
+        slot = self.acquire()
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "maximum": self._maximum,
+                "lowest_limit": self.lowest_limit,
+                "decreases": self.decreases,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "peak_waiting": self.peak_waiting,
+            }
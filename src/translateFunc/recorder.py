@@ -3,10 +3,10 @@ translateFunc/recorder.py
 TranslationRecorder —— 单次翻译运行写入一个 JSONL 文件，线程安全追加。
 """
 from __future__ import annotations
-import json
 import threading
 from pathlib import Path
 
+from translateFunc import jsoncodec
 from translateFunc.diagnostics import safe_json_value
 
 
@@ -24,7 +24,7 @@ class TranslationRecorder:
 
     def write_record(self, record: dict) -> None:
         """追加一条翻译记录到 JSONL 文件。线程安全。"""
-        line = json.dumps(safe_json_value(record), ensure_ascii=False) + "\n"
+        line = jsoncodec.dumps(safe_json_value(record)) + "\n"
         with self._lock:
             with open(self._file_path, "a", encoding="utf-8") as f:
                 f.write(line)
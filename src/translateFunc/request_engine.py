@@ -0,0 +1,214 @@
+"""
+translateFunc/request_engine.py
+RequestEngine —— 进程内共享的有界请求执行器。
+
+这不是异步 I/O：translatekit 基于 requests 同步发送 HTTP，每个在途请求
+都占用一个线程。引擎做两件事：
+  - 在途上限：所有线程（文件线程与执行器线程）的 AI 调用共享同一个
+    信号量，call() 在调用线程内直接发送请求，不再转交其他线程
+  - 分片队列：map_parts() 把文件的分片任务放入共享执行器
+    （线程数 = 在途上限），调用方不逐个阻塞在分片上；单个文件同时
+    排入执行器的分片数不超过 limit，完成一个再补入下一个，
+    全部文件的分片按提交顺序共用同一队列
+线程总数为 文件线程数 + 在途上限，不随分片数增长。
+每个线程持有独立的翻译器实例与 Session，system_prompt / response_format
+按请求传入，不修改共享配置。
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterable, TypeVar
+
+from translateFunc.diagnostics import HttpResponseObserver
+
+_logger = logging.getLogger("LCTA")
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@dataclass
+class EngineRequest:
+    """一次 AI 调用的请求内容。"""
+    user_prompt: str
+    system_prompt: str
+    response_format: str
+    timeout: float
+
+
+@dataclass
+class EngineResult:
+    """一次 AI 调用的结果。exception 非空时 raw_response 为 None。"""
+    raw_response: Any = None
+    exception: BaseException | None = None
+    http_attempts: list[dict] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+class RequestEngine:
+    """全部 LLM 请求共享的在途上限与分片执行器。
+
+    用法：
+        with RequestEngine(factory, max_concurrent=32) as engine:
+            result = engine.call(EngineRequest(...))
+            results = engine.map_parts(translate_part, parts, limit=4)
+    """
+
+    def __init__(
+        self,
+        translator_factory: Callable[[], Any],
+        max_concurrent: int,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent 必须为正整数")
+        self._factory = translator_factory
+        self._max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="lcta-request",
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+        # 统计
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    def __enter__(self) -> "RequestEngine":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._started = True
+
+    def close(self) -> None:
+        """等待已排入的分片任务结束并关闭执行器。"""
+        if self._closed or not self._started:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+
+    def _check_open(self) -> None:
+        if not self._started or self._closed:
+            raise RuntimeError("请求引擎未启动或已关闭")
+
+    def call(self, request: EngineRequest) -> EngineResult:
+        """在调用线程内发送请求，超过在途上限时等待空位。可在任意线程调用。"""
+        self._check_open()
+        with self._slots:
+            with self._lock:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                return self._execute(request)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+
+    def submit(self, request: EngineRequest) -> Future:
+        """把单个请求交给执行器，返回 concurrent.futures.Future[EngineResult]。"""
+        self._check_open()
+        return self._executor.submit(self.call, request)
+
+    def map_parts(
+        self,
+        fn: Callable[[_T], _R],
+        items: Iterable[_T],
+        limit: int,
+    ) -> list[_R]:
+        """在共享执行器中执行 fn(item)，按输入顺序返回结果。
+
+        同时排入执行器的任务不超过 limit 个，任一任务完成时由其回调补入下一个，
+        调用方只在最后等待全部结果。任务抛出的第一个异常在全部任务结束后重新抛出。
+        不可在执行器线程内调用（会占用执行器线程等待自身队列）。
+        """
+        self._check_open()
+        items = list(items)
+        results: list[Any] = [None] * len(items)
+        errors: list[BaseException] = []
+        pending = iter(range(len(items)))
+        remaining = len(items)
+        finished = threading.Event()
+        lock = threading.Lock()
+
+        def launch(index: int) -> None:
+            future = self._executor.submit(fn, items[index])
+            future.add_done_callback(lambda done, i=index: complete(i, done))
+
+        def complete(index: int, future: Future) -> None:
+            nonlocal remaining
+            try:
+                results[index] = future.result()
+            except BaseException as exc:
+                errors.append(exc)
+            with lock:
+                remaining -= 1
+                following = next(pending, None)
+                if remaining == 0:
+                    finished.set()
+            if following is not None:
+                launch(following)
+
+        if not items:
+            return []
+        with lock:
+            first = [index for _, index in zip(range(max(limit, 1)), pending)]
+        for index in first:
+            launch(index)
+        finished.wait()
+        if errors:
+            raise errors[0]
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrent": self._max_concurrent,
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+            }
+
+    # ========== 请求发送 ==========
+
+    def _thread_translator(self) -> tuple[Any, HttpResponseObserver]:
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._factory()
+            self._local.translator = translator
+            self._local.observer = HttpResponseObserver(translator)
+        return translator, self._local.observer
+
+    def _execute(self, request: EngineRequest) -> EngineResult:
+        started = time.perf_counter()
+        result = EngineResult()
+        observer = None
+        try:
+            translator, observer = self._thread_translator()
+            observer.begin()
+            result.raw_response = translator.translate(
+                request.user_prompt,
+                timeout=request.timeout,
+                system_prompt=request.system_prompt,
+                response_format=request.response_format,
+            )
+        except Exception as exc:
+            result.exception = exc
+        finally:
+            if observer is not None:
+                result.http_attempts = observer.finish()
+            result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return result
@@ -0,0 +1,174 @@
+"""
+translateFunc/sharding.py
+分片执行 —— 把一次运行拆到多台机器上并在最后合并。
+
+流程：
+  1. prepare：只处理优先文件（BattleKeywords / ScenarioModelCodes），输出分发给全部分片
+  2. shard i/n：按预估工作量确定性地划分文件，只处理分到第 i 片的文件；
+     优先文件直接复制 prepare 的输出并据此更新角色 / 状态效果
+  3. merge：合并全部 bundle 为一个 LLc-CN-LCTA 目录与统一的 PipelineSummary
+
+每个 bundle 就是一次运行的输出目录，Info/shard.json 记录分片信息与运行结果。
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+import json
+import shutil
+from pathlib import Path
+
+from translateFunc.checkpoint import CHECKPOINT_NAME
+from translateFunc.config import PipelineSummary
+from translateFunc.diagnostics import safe_json_value
+from translateFunc.entry_index import ENTRY_INDEX_NAME, EntryIndex
+
+SHARD_BUNDLE_NAME = "shard.json"
+PREPARE_BUNDLE = "prepare"
+_SCHEMA = 1
+
+# 合并时单独处理或丢弃的文件（相对 bundle 根目录）
+_PROCESSING_LOG = "processing_log.jsonl"
+_SKIPPED_ON_MERGE = frozenset({
+    f"Info/{SHARD_BUNDLE_NAME}",
+    f"Info/{ENTRY_INDEX_NAME}",
+    _PROCESSING_LOG,
+    CHECKPOINT_NAME,
+})
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """分片序号（从 1 开始）与分片总数。"""
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> "ShardSpec":
+        """解析 "i/n" 格式的分片参数。"""
+        try:
+            index_text, count_text = text.split("/")
+            spec = cls(int(index_text), int(count_text))
+        except ValueError:
+            raise ValueError(f"分片参数格式应为 i/n: {text!r}") from None
+        if spec.count < 1 or not 1 <= spec.index <= spec.count:
+            raise ValueError(f"分片序号超出范围: {text!r}")
+        return spec
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+
+def assign_shards(weights: dict[str, int], count: int) -> dict[str, int]:
+    """按工作量把文件分配到 1..count 片，返回 {KR 相对路径: 分片序号}。
+
+    最长优先贪心：从大到小依次放入当前负载最小的分片。
+    排序只依赖路径与工作量，各机器对同一输入得到相同划分。
+    """
+    loads = [0] * count
+    assignment: dict[str, int] = {}
+    for rel_path, weight in sorted(weights.items(), key=lambda item: (-item[1], item[0])):
+        shard = min(range(count), key=lambda i: (loads[i], i))
+        loads[shard] += max(weight, 1)
+        assignment[rel_path] = shard + 1
+    return assignment
+
+
+def write_bundle(
+    output_dir: Path,
+    summary: PipelineSummary,
+    *,
+    index: int,
+    count: int,
+    config: str,
+) -> Path:
+    """把分片信息与运行结果写入 output_dir/Info/shard.json。index 为 0 表示 prepare。"""
+    path = output_dir / "Info" / SHARD_BUNDLE_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "schema": _SCHEMA,
+        "name": PREPARE_BUNDLE if index == 0 else ShardSpec(index, count).name,
+        "index": index,
+        "count": count,
+        "config": config,
+        "summary": safe_json_value(summary.to_dict()),
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def _read_bundle(root: Path) -> dict:
+    path = root / "Info" / SHARD_BUNDLE_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"无法读取分片结果 {path}: {e}") from e
+    if not isinstance(data, dict) or data.get("schema") != _SCHEMA:
+        raise ValueError(f"分片结果格式不受支持: {path}")
+    return data
+
+
+def merge_bundles(
+    bundle_roots: list[Path],
+    target: Path,
+    *,
+    expected_config: str | None = None,
+) -> PipelineSummary:
+    """合并 prepare 与全部分片的输出到 target，返回统一的 PipelineSummary。
+
+    要求分片齐全（1..n 各一份）且翻译配置指纹一致；给出 expected_config 时
+    还要求与之相同（合并运行的配置指纹，即写入 manifest 的指纹）。同一文件出现在多个
+    bundle 中时（各分片复制的优先文件）保留先合并的一份：prepare 优先，其次按分片序号。
+    """
+    bundles = [(root, _read_bundle(root)) for root in bundle_roots]
+    prepare = [item for item in bundles if item[1]["index"] == 0]
+    shards = sorted(
+        (item for item in bundles if item[1]["index"] != 0),
+        key=lambda item: item[1]["index"],
+    )
+    if len(prepare) > 1:
+        raise ValueError("存在多个 prepare 分片结果")
+    if not shards:
+        raise ValueError("没有可合并的分片结果")
+
+    count = shards[0][1]["count"]
+    found = [(data["index"], data["count"]) for _, data in shards]
+    if found != [(i, count) for i in range(1, count + 1)]:
+        names = ", ".join(data["name"] for _, data in shards)
+        raise ValueError(f"分片结果不完整: 需要 {count} 片，实际为 {names}")
+    configs = {data["config"] for _, data in bundles}
+    if len(configs) != 1:
+        raise ValueError("各分片的翻译配置不一致，无法合并")
+    if expected_config is not None and expected_config not in configs:
+        raise ValueError(
+            "分片结果的翻译配置与本次合并运行不一致（配置、术语表或提示词模板已变化），无法合并"
+        )
+
+    target.mkdir(parents=True, exist_ok=True)
+    summary = PipelineSummary()
+    index = EntryIndex(config=configs.pop())
+    has_index = False
+    with open(target / _PROCESSING_LOG, "a", encoding="utf-8") as log:
+        for root, data in [*prepare, *shards]:
+            summary.extend(PipelineSummary.from_dict(data["summary"]))
+            for path in sorted(root.rglob("*")):
+                if not path.is_file():
+                    continue
+                rel = path.relative_to(root).as_posix()
+                if rel not in _SKIPPED_ON_MERGE:
+                    destination = target / rel
+                    if not destination.exists():
+                        destination.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(path, destination)
+            log_path = root / _PROCESSING_LOG
+            if log_path.is_file():
+                log.write(log_path.read_text(encoding="utf-8"))
+            index_path = root / "Info" / ENTRY_INDEX_NAME
+            if index_path.is_file():
+                has_index = True
+                files = json.loads(index_path.read_text(encoding="utf-8")).get("files", {})
+                for file_key, entries in files.items():
+                    if index.current_entries(file_key) is None:
+                        index.record(file_key, entries)
+    if has_index:
+        index.save(target / "Info" / ENTRY_INDEX_NAME)
+    return summary
@@ -0,0 +1,202 @@
+"""
+translateFunc/usage.py
+从 HTTP 响应中提取服务商返回的 token 用量，并在整次运行内按文件 / 阶段 / 格式累计。
+
+OpenAI 兼容接口在响应体的 usage 字段中返回用量，缓存命中的字段名因服务商而异：
+  - DeepSeek: usage.prompt_cache_hit_tokens
+  - OpenAI:   usage.prompt_tokens_details.cached_tokens
+  - Anthropic 风格: usage.cache_read_input_tokens
+推理 token（enable_thinking）在 OpenAI 兼容接口中计入 completion_tokens，明细位于
+usage.completion_tokens_details.reasoning_tokens；另行单独累计用于报告。
+total_tokens 取服务商返回值与 prompt + completion 的较大者，即预算记账的实际消耗。
+响应不含 usage（如非 LLM 翻译器或流式响应）时只计调用次数与耗时，不计 token。
+
+耗时样本按阶段保存，p50 / p95 / p99 在汇总时按最近秩计算；样本随
+PipelineSummary 保存，分片合并后仍能得到准确的分位数。
+
+合并请求（RequestBatcher）的用量按各文件的文本块数拆分（split_usage），
+按文件统计时每个参与文件各计一次调用，总计与按阶段统计仍只计一次。
+"""
+from __future__ import annotations
+import json
+import math
+import threading
+
+# 每个分组累计的计数字段
+USAGE_FIELDS = (
+    "calls", "usage_calls", "prompt_tokens", "completion_tokens", "cached_tokens", "reasoning_tokens",
+)
+# 每次调用从 usage 中累计的 token 字段
+_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "cached_tokens", "reasoning_tokens")
+PERCENTILES = (50, 95, 99)
+
+
+def _int(value) -> int:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_usage(http_attempts: list[dict]) -> dict | None:
+    """从最后一次成功的 HTTP 尝试中解析 usage；无法解析时返回 None。"""
+    for attempt in reversed(http_attempts or []):
+        status = attempt.get("status_code")
+        if not isinstance(status, int) or not 200 <= status < 300:
+            continue
+        try:
+            body = json.loads(attempt.get("body") or "")
+        except (TypeError, ValueError):
+            return None
+        usage = body.get("usage") if isinstance(body, dict) else None
+        if not isinstance(usage, dict):
+            return None
+        details = usage.get("prompt_tokens_details")
+        cached = usage.get("prompt_cache_hit_tokens")
+        if cached is None and isinstance(details, dict):
+            cached = details.get("cached_tokens")
+        if cached is None:
+            cached = usage.get("cache_read_input_tokens")
+        completion_details = usage.get("completion_tokens_details")
+        reasoning = usage.get("reasoning_tokens")
+        if reasoning is None and isinstance(completion_details, dict):
+            reasoning = completion_details.get("reasoning_tokens")
+        prompt = _int(usage.get("prompt_tokens", usage.get("input_tokens")))
+        completion = _int(usage.get("completion_tokens", usage.get("output_tokens")))
+        return {
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "cached_tokens": _int(cached),
+            "reasoning_tokens": _int(reasoning),
+            # 单独报告推理 token 的服务商在 total_tokens 中计入，取较大者
+            "total_tokens": max(_int(usage.get("total_tokens")), prompt + completion),
+        }
+    return None
+
+
+def apportion(total: int, weights: list[int]) -> list[int]:
+    """按权重把整数 total 拆为若干份，各份之和恰为 total。权重全为 0 时平均拆分。"""
+    if not weights:
+        return []
+    if sum(weights) <= 0:
+        weights = [1] * len(weights)
+    weight_sum = sum(weights)
+    parts = []
+    cumulative = previous = 0
+    for weight in weights:
+        cumulative += weight
+        current = total * cumulative // weight_sum
+        parts.append(current - previous)
+        previous = current
+    return parts
+
+
+def split_usage(usage: dict | None, weights: list[int]) -> list[dict | None]:
+    """按权重拆分一次调用的 usage（各字段分别 apportion）；usage 为 None 时每份均为 None。"""
+    if not usage:
+        return [None] * len(weights)
+    columns = {key: apportion(value, weights) for key, value in usage.items()}
+    return [
+        {key: parts[index] for key, parts in columns.items()}
+        for index in range(len(weights))
+    ]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """最近秩分位数；samples 为空时返回 0。"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def latency_percentiles(latencies: dict[str, list[float]]) -> dict[str, dict]:
+    """按阶段计算调用耗时的 p50 / p95 / p99（秒）。"""
+    return {
+        stage: {
+            "count": len(samples),
+            **{f"p{pct}": round(percentile(samples, pct), 3) for pct in PERCENTILES},
+        }
+        for stage, samples in sorted(latencies.items())
+        if samples
+    }
+
+
+class UsageMeter:
+    """线程安全的运行内 token 用量与耗时累计。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._total = dict.fromkeys(USAGE_FIELDS, 0)
+        self._groups: dict[str, dict[str, dict]] = {
+            "by_stage": {}, "by_format": {}, "by_file": {},
+        }
+        self._latencies: dict[str, list[float]] = {}
+
+    def add(
+        self,
+        usage: dict | None,
+        *,
+        file_name: str = "",
+        stage: str = "",
+        prompt_format: str = "",
+        latency: float | None = None,
+    ) -> None:
+        """记录一次调用；usage 为 None 表示响应未携带用量。"""
+        counts = {"calls": 1, "usage_calls": 1 if usage else 0}
+        for key in _TOKEN_FIELDS:
+            counts[key] = (usage or {}).get(key, 0)
+        with self._lock:
+            buckets = [self._total]
+            for group, key in (
+                ("by_stage", stage), ("by_format", prompt_format), ("by_file", file_name),
+            ):
+                if key:
+                    buckets.append(
+                        self._groups[group].setdefault(key, dict.fromkeys(USAGE_FIELDS, 0))
+                    )
+            for bucket in buckets:
+                for key, value in counts.items():
+                    bucket[key] += value
+            if latency is not None and stage:
+                self._latencies.setdefault(stage, []).append(round(latency, 3))
+
+    def add_file_share(self, usage: dict | None, *, file_name: str) -> None:
+        """只在按文件统计中记录合并请求拆分给 file_name 的一份用量。
+
+        合并请求本身已由发出请求的文件以空 file_name 调用 add() 计入总计与按阶段统计。
+        """
+        if not file_name:
+            return
+        counts = {"calls": 1, "usage_calls": 1 if usage else 0}
+        for key in _TOKEN_FIELDS:
+            counts[key] = (usage or {}).get(key, 0)
+        with self._lock:
+            bucket = self._groups["by_file"].setdefault(file_name, dict.fromkeys(USAGE_FIELDS, 0))
+            for key, value in counts.items():
+                bucket[key] += value
+
+    def summary(self) -> dict:
+        """PipelineSummary.usage：总计与按阶段 / 格式 / 文件的计数。"""
+        with self._lock:
+            return {
+                "total": dict(self._total),
+                **{
+                    group: {key: dict(bucket) for key, bucket in sorted(buckets.items())}
+                    for group, buckets in self._groups.items()
+                },
+            }
+
+    def latencies(self) -> dict[str, list[float]]:
+        with self._lock:
+            return {stage: list(samples) for stage, samples in self._latencies.items()}
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = dict(self._total)
+        total["cache_hit_rate"] = (
+            round(total["cached_tokens"] / total["prompt_tokens"], 4)
+            if total["prompt_tokens"] else 0.0
+        )
+        return total
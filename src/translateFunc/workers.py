@@ -2,12 +2,16 @@
 translateFunc/workers.py
 WorkerPool —— 基于 ThreadPoolExecutor 的并发文件处理。
 每个工作线程通过工厂函数获取独立的翻译器实例。
+可选的依赖图调度：文件声明依赖的事件，提供事件的文件完成后才提交依赖它的文件；
+就绪文件按预估工作量最长优先（LPT）开始，缩短尾部大文件拖长的总时长。
 """
 from __future__ import annotations
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import heapq
 import logging
+import threading
 import traceback
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 _logger = logging.getLogger("LCTA")
 
@@ -34,6 +38,10 @@ class WorkerPool:
         files: list,
         process_fn: Callable[[Any, Any], ProcessOutcome],
         on_progress: Callable[[int, int, str], None] | None = None,
+        *,
+        needs: Callable[[Any], Iterable[str]] | None = None,
+        provides: dict[Any, tuple[str, Callable[[], None]]] | None = None,
+        weight: Callable[[Any], float] | None = None,
     ) -> list[ProcessOutcome]:
         """并发处理文件，保持输入顺序。
 
@@ -41,6 +49,11 @@ class WorkerPool:
             files: 待处理的文件配置/路径列表。
             process_fn: (file_item, translator) -> ProcessOutcome。
             on_progress: 可选回调 done, total, current_file_name。
+            needs: 可选 file_item -> 依赖的事件名；依赖未就绪的文件延后提交。
+            provides: 可选 {file_item: (事件名, 回调)}；该文件处理结束后（无论成败）
+                在工作线程中执行回调，随后事件就绪。没有文件提供的事件视为已就绪。
+            weight: 可选 file_item -> 预估工作量；就绪文件按工作量从大到小开始
+                （最长优先），提供事件的文件始终最先。未指定时按输入顺序。
 
         Returns:
             与输入文件顺序一致的 ProcessOutcome 列表。
@@ -49,46 +62,87 @@ class WorkerPool:
         if total == 0:
             return []
 
-        # 将文件映射到原始索引以保持输出顺序
-        indexed: list[tuple[int, Any]] = list(enumerate(files))
+        provides = provides or {}
+        provided = {event for event, _ in provides.values()}
+        requirements: list[set[str]] = [
+            set(needs(file_item)) & provided if needs else set()
+            for file_item in files
+        ]
+        weights = [weight(file_item) if weight else 0 for file_item in files]
         results: list[ProcessOutcome | None] = [None] * total
+        ready_events: set[str] = set()
 
         with ThreadPoolExecutor(max_workers=int(self._max_workers)) as executor:
-            import threading
             thread_local = threading.local()
 
             def worker(file_item):
                 """在 Worker 线程内创建独立的 translator 实例。"""
-                if not hasattr(thread_local, "translator"):
-                    thread_local.translator = self._factory()
-                return process_fn(file_item, thread_local.translator)
-
-            # 提交所有任务
+                hook = provides.get(file_item)
+                try:
+                    if not hasattr(thread_local, "translator"):
+                        thread_local.translator = self._factory()
+                    return process_fn(file_item, thread_local.translator)
+                finally:
+                    if hook is not None:
+                        hook[1]()
+
+            # 依赖图调度：依赖就绪的文件进入全局就绪堆，空闲工作线程每次取
+            # 工作量最大的文件；在途任务数不超过线程数，保证后就绪的大文件也能插队
             future_to_idx = {}
-            for idx, file_item in indexed:
-                future = executor.submit(worker, file_item)
-                future_to_idx[future] = idx
-
+            pending = list(range(total))
+            ready: list[tuple[int, float, int]] = []
+            running = set()
+
+            def collect_ready():
+                nonlocal pending
+                waiting = []
+                for idx in pending:
+                    if requirements[idx] <= ready_events:
+                        is_provider = files[idx] in provides
+                        heapq.heappush(ready, (0 if is_provider else 1, -weights[idx], idx))
+                    else:
+                        waiting.append(idx)
+                pending = waiting
+
+            def fill_workers():
+                while ready and len(running) < self._max_workers:
+                    idx = heapq.heappop(ready)[2]
+                    future = executor.submit(worker, files[idx])
+                    future_to_idx[future] = idx
+                    running.add(future)
+
+            collect_ready()
+            fill_workers()
             completed = 0
-            for future in as_completed(future_to_idx):
-                idx = future_to_idx[future]
-                completed += 1
-                try:
-                    outcome = future.result()
-                    results[idx] = outcome
-                except Exception as e:
-                    # 将未预期异常转换为错误结果，同时写入完整日志
-                    file_name = str(files[idx]) if idx < len(files) else f"index_{idx}"
-                    _logger.exception(f"Worker thread 异常 (file: {file_name}): {e}")
-                    results[idx] = ProcessOutcome(
-                        ProcessResult.SAVE_ERROR,
-                        file_name,
-                        {"reason": f"未处理的异常: {e}", "traceback": traceback.format_exc()},
-                    )
-
-                if on_progress:
-                    fname = results[idx].file_name if results[idx] else str(files[idx])
-                    on_progress(completed, total, fname)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                running -= done
+                for future in done:
+                    idx = future_to_idx[future]
+                    completed += 1
+                    try:
+                        outcome = future.result()
+                        results[idx] = outcome
+                    except Exception as e:
+                        # 将未预期异常转换为错误结果，同时写入完整日志
+                        file_name = str(files[idx]) if idx < len(files) else f"index_{idx}"
+                        _logger.exception(f"Worker thread 异常 (file: {file_name}): {e}")
+                        results[idx] = ProcessOutcome(
+                            ProcessResult.SAVE_ERROR,
+                            file_name,
+                            {"reason": f"未处理的异常: {e}", "traceback": traceback.format_exc()},
+                        )
+
+                    if on_progress:
+                        fname = results[idx].file_name if results[idx] else str(files[idx])
+                        on_progress(completed, total, fname)
+
+                    hook = provides.get(files[idx])
+                    if hook is not None:
+                        ready_events.add(hook[0])
+                if pending:
+                    collect_ready()
+                fill_workers()
 
         # 汇总统计
         error_count = sum(
@@ -96,7 +150,8 @@ class WorkerPool:
             if r and r.result not in (
                 ProcessResult.SUCCESS_SAVED, ProcessResult.ALREADY_TRANSLATED,
                 ProcessResult.EMPTY_WITH_LLC, ProcessResult.EMPTY_SKIPPED,
-                ProcessResult.FALLBACK_TO_ORIGINAL,
+                ProcessResult.FALLBACK_TO_ORIGINAL, ProcessResult.REUSED_PREVIOUS,
+                ProcessResult.DRY_RUN_ESTIMATED,
             )
         )
         fallback_count = sum(
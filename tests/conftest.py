@@ -1,7 +1,67 @@
 from pathlib import Path
+import json
+import re
 import sys
+import threading
+
+import pytest
 
 
 SOURCE_ROOT = Path(__file__).resolve().parents[1] / "src"
 if str(SOURCE_ROOT) not in sys.path:
     sys.path.insert(0, str(SOURCE_ROOT))
+
+
+class FakeSession:
+    """翻译器 Session 的替身：只提供 HttpResponseObserver 挂载的 response hook 列表。"""
+
+    def __init__(self):
+        self.hooks = {"response": []}
+
+
+class EchoTranslator:
+    """把每个 <kr> 原文翻译为 "译:原文"，并按请求记录收到的原文。可在多个线程中共用。"""
+
+    def __init__(self):
+        self._session = FakeSession()
+        self.requests: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def sources(self) -> list[str]:
+        """全部请求收到的原文，按请求顺序展开。"""
+        with self._lock:
+            return [source for request in self.requests for source in request]
+
+    def update_config(self, **_kwargs):
+        return None
+
+    def clear_cache(self):
+        return None
+
+    def translate(self, text, timeout=None, system_prompt=None, response_format=None):
+        sources = re.findall(r"<kr>(.*?)</kr>", text)
+        with self._lock:
+            self.requests.append(sources)
+        return json.dumps({
+            "translations": [
+                {"id": index + 1, "translation": f"译:{source}"}
+                for index, source in enumerate(sources)
+            ],
+        })
+
+
+def write_data_list(path: Path, entries: list[dict]) -> None:
+    """写入 {"dataList": entries} 格式的游戏文本文件，自动创建上级目录。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"dataList": entries}, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def echo_translator() -> EchoTranslator:
+    return EchoTranslator()
+
+
+@pytest.fixture
+def write_data():
+    return write_data_list
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 import yaml
@@ -16,9 +17,16 @@ from auto_update.clients import (
 )
 from auto_update.config import AppConfig, ConfigError
 from auto_update.config import PublishingConfig
+from auto_update.manifest import build_manifest, unchanged_files, without_files
 from auto_update.packaging import create_packages
-from auto_update.runner import _select_release_version
+from auto_update.runner import (
+    _prepare_work_dir,
+    _select_release_version,
+    _snapshot_glossary,
+    _token_budget,
+)
 from auto_update.versioning import is_version_tag, next_version
+from translateFunc import TranslateConfig
 
 
 def test_default_config_loads():
@@ -216,3 +224,108 @@ def test_new_token_uses_latest_valid_date_sequence_tag():
     )
     assert version == "2026073009"
     assert matching is None
+
+
+def _write_sources(root: Path, files: dict[str, str]) -> None:
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _manifest(root: Path, fingerprint: str = "config") -> dict:
+    return build_manifest(
+        kr_root=root / "kr",
+        jp_root=root / "jp",
+        en_root=root / "en",
+        llc_root=root / "llc",
+        config_fingerprint=fingerprint,
+    )
+
+
+def test_manifest_detects_changed_files_and_dependencies(tmp_path):
+    _write_sources(
+        tmp_path,
+        {
+            "kr/KR_BattleKeywords.json": "{}",
+            "kr/KR_Skills_Test.json": "{}",
+            "kr/KR_Other.json": "{}",
+            "kr/StoryData/KR_S1.json": "{}",
+            "jp/JP_Other.json": "{}",
+            "llc/Other.json": "{}",
+        },
+    )
+    previous = _manifest(tmp_path)
+    assert unchanged_files(_manifest(tmp_path), previous) == frozenset(previous["files"])
+
+    (tmp_path / "kr" / "KR_BattleKeywords.json").write_text('{"a": 1}', encoding="utf-8")
+    (tmp_path / "llc" / "Other.json").write_text('{"b": 1}', encoding="utf-8")
+
+    assert unchanged_files(_manifest(tmp_path), previous) == {"StoryData/KR_S1.json"}
+    assert unchanged_files(_manifest(tmp_path, "changed"), previous) == frozenset()
+
+
+def test_manifest_excludes_failed_outputs(tmp_path):
+    _write_sources(tmp_path, {"kr/KR_A.json": "{}", "kr/KR_B.json": "{}"})
+    manifest = without_files(_manifest(tmp_path), {"B.json"})
+    assert set(manifest["files"]) == {"KR_A.json"}
+
+
+def test_glossary_snapshot_feeds_the_fingerprint(tmp_path):
+    terms_path = tmp_path / "terms.json"
+    terms_path.write_text('[{"term": "단테", "translation": "但丁", "note": ""}]', encoding="utf-8")
+    config = TranslateConfig(auto_fetch_proper=False, proper_path=str(terms_path))
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+
+    first = _snapshot_glossary(config, tmp_path / "first")
+    assert not first.auto_fetch_proper
+    assert Path(first.proper_path).read_text(encoding="utf-8") == terms_path.read_text(encoding="utf-8")
+
+    terms_path.write_text('[{"term": "단테", "translation": "但丁（管理人）", "note": ""}]', encoding="utf-8")
+    second = _snapshot_glossary(config, tmp_path / "second")
+    assert first.fingerprint() != second.fingerprint()
+
+    disabled = replace(config, enable_proper=False)
+    assert _snapshot_glossary(disabled, tmp_path) is disabled
+
+
+def test_release_assets_are_parsed():
+    release = GitHubRelease.from_api(
+        {
+            "tag_name": "2026073001",
+            "assets": [
+                {
+                    "name": "LLc-CN-LCTA-2026073001.zip",
+                    "browser_download_url": "https://example.invalid/a.zip",
+                }
+            ],
+        }
+    )
+    asset = release.find_asset("LLc-CN-LCTA-2026073001.zip")
+    assert asset is not None
+    assert asset.download_url == "https://example.invalid/a.zip"
+    assert release.find_asset("missing.zip") is None
+
+
+def test_work_dir_is_kept_for_same_token_only(tmp_path):
+    work_base = tmp_path / "work"
+    first = _prepare_work_dir(work_base, "token-a")
+    (first / "pipeline-output").mkdir()
+
+    assert _prepare_work_dir(work_base, "token-a") == first
+    assert (first / "pipeline-output").is_dir()
+
+    second = _prepare_work_dir(work_base, "token-b")
+    assert second.is_dir()
+    assert not first.exists()
+
+
+def test_cost_budget_is_converted_to_tokens():
+    config_path = Path(__file__).resolve().parents[1] / "src" / "config.yaml"
+    settings = AppConfig.load(config_path).translation
+    assert _token_budget(settings) == 0
+
+    settings = replace(settings, cost_budget=2.0, price_per_million_tokens=0.5)
+    assert _token_budget(settings) == 4_000_000
+    assert _token_budget(replace(settings, token_budget=1_000)) == 1_000
@@ -1,8 +1,17 @@
 """AC 自动机单元测试 —— 纯算法测试，零外部依赖。"""
+import logging
+import random
+import timeit
+import tracemalloc
+
 import pytest
-from translateFunc.matcher.ac_automaton import AcAutomaton, ACPattern
+from translateFunc.builder.request import RequestBuilder
+from translateFunc.enums import MatchMode
+from translateFunc.matcher.ac_automaton import AcAutomaton, ACMatch, ACPattern
 from translateFunc.matcher.engine import MatcherEngine
 
+_logger = logging.getLogger(__name__)
+
 
 class TestAcAutomaton:
     """Aho-Corasick 自动机单元测试。"""
@@ -118,6 +127,64 @@ class TestAcAutomaton:
         assert ac.pattern_count == 3
 
 
+class TestMatchModes:
+    """匹配模式：全部 / 最左最长 / 每个起点最长，结果带位置。"""
+
+    @staticmethod
+    def _automaton() -> AcAutomaton:
+        ac = AcAutomaton()
+        for pattern in ("림버스 컴퍼니", "림버스", "컴퍼니", "버스", "스 컴"):
+            ac.add_pattern(pattern)
+        ac.build()
+        return ac
+
+    @staticmethod
+    def _spans(matches: list[ACMatch]) -> list[tuple[str, int, int]]:
+        return [(m.pattern, m.start, m.end) for m in matches]
+
+    def test_all_reports_overlaps_with_positions(self):
+        text = "림버스 컴퍼니"
+        matches = self._automaton().find(text)
+        assert all(text[m.start:m.end] == m.pattern for m in matches)
+        assert self._spans(matches) == [
+            ("림버스", 0, 3), ("버스", 1, 3), ("스 컴", 2, 5), ("림버스 컴퍼니", 0, 7), ("컴퍼니", 4, 7),
+        ]
+        # 命中为普通元组，可直接解包
+        assert isinstance(matches[0], tuple)
+        assert matches[0] == ("림버스", None, 0, 3)
+
+    def test_positions_count_code_points_outside_bmp(self):
+        ac = AcAutomaton()
+        ac.add_pattern("😀림버스")
+        ac.add_pattern("\udc80")
+        ac.build()
+        text = "a\udc80😀림버스"
+        assert [(m.pattern, m.start, m.end) for m in ac.find(text)] == [("\udc80", 1, 2), ("😀림버스", 2, 6)]
+        assert all(text[m.start:m.end] == m.pattern for m in ac.find(text))
+
+    def test_leftmost_longest_drops_contained_and_overlapping_terms(self):
+        ac = self._automaton()
+        assert self._spans(ac.find("림버스 컴퍼니의 버스", MatchMode.LEFTMOST_LONGEST)) == [
+            ("림버스 컴퍼니", 0, 7), ("버스", 9, 11),
+        ]
+
+    def test_longest_per_position_keeps_overlaps_between_starts(self):
+        ac = self._automaton()
+        assert self._spans(ac.find("림버스 컴퍼니", MatchMode.LONGEST_PER_POSITION)) == [
+            ("림버스 컴퍼니", 0, 7), ("버스", 1, 3), ("스 컴", 2, 5), ("컴퍼니", 4, 7),
+        ]
+
+    def test_engine_defaults_to_leftmost_longest_for_proper_terms(self):
+        engine = MatcherEngine()
+        engine.build_proper([
+            {"term": "림버스 컴퍼니", "translation": "边狱公司"},
+            {"term": "림버스", "translation": "边狱"},
+            {"term": "림버스", "translation": "边狱（重复）"},
+        ])
+        assert [m.data["translation"] for m in engine.match_all("림버스 컴퍼니").proper_matches] == ["边狱公司"]
+        assert [m.data["translation"] for m in engine.match_proper("림버스")] == ["边狱", "边狱（重复）"]
+
+
 class TestMultilingualAffectMatching:
     """状态效果韩文名称匹配需要 JP/EN 翻译交叉确认。"""
 
@@ -161,3 +228,290 @@ class TestMultilingualAffectMatching:
             en_text="Gain another effect",
         )
         assert [match.data["id"] for match in result.affect_id_matches] == ["Charge"]
+
+    def test_request_builder_passes_references_to_matcher(self):
+        texts = {
+            "kr": ["충전 창 사용", "충전 획득"],
+            "jp": ["蓄電の槍を使用", "充電を獲得"],
+            "en": ["Use Battery Spear", "Gain Charge"],
+        }
+        request_text = {
+            lang: {index: {("content",): text} for index, text in enumerate(values)}
+            for lang, values in texts.items()
+        }
+        builder = RequestBuilder(request_text, self._build_engine())
+        builder.build()
+
+        blocks = builder.unified_request["text_blocks"]
+        assert "affect_refs" not in blocks[0]
+        assert blocks[1]["affect_refs"] == ["[Charge]"]
+
+
+class TestMatcherSnapshot:
+    """重建角色 / 状态效果时替换整个快照，旧快照保持不变。"""
+
+    def test_rebuild_publishes_new_snapshot(self):
+        engine = MatcherEngine()
+        engine.build_proper([{"term": "림버스", "translation": "边狱"}])
+        before = engine.snapshot()
+
+        engine.build_roles([{"id": "yisang", "kr": "이상", "cn": "李箱"}])
+
+        after = engine.snapshot()
+        assert after is not before
+        assert before.role_by_id == {}
+        assert after.role_by_id["yisang"]["cn"] == "李箱"
+        # 未重建的自动机沿用同一实例
+        assert after.proper_ac is before.proper_ac
+        assert [m.pattern for m in engine.match_all("림버스 yisang").role_matches] == ["yisang"]
+        assert before.role_ac.search("yisang") == []
+
+    def test_single_scan_matches_separate_automata(self):
+        """合并自动机的一次扫描与逐个运行四个自动机结果一致，同一字符串可属于多个类别。"""
+        engine = MatcherEngine(proper_match_mode=MatchMode.ALL)
+        engine.build_proper([
+            {"term": "림버스", "translation": "边狱"},
+            {"term": "Charge", "translation": "充能"},
+        ])
+        engine.build_roles([{"id": "Charge", "kr": "충전", "cn": "充能"}])
+        engine.build_affects([{"id": "Charge", "kr": "충전", "jp": "", "en": "", "cn": "充能"}])
+        snap = engine.snapshot()
+
+        text = "림버스 [Charge] 충전 Charge 림버스"
+        result = engine.match_all(text)
+
+        assert result.proper_matches == snap.proper_ac.find(text)
+        assert result.role_matches == snap.role_ac.find(text)
+        assert result.affect_id_matches == snap.affect_id_ac.find(text)
+        assert result.affect_name_matches == snap.affect_name_ac.find(text)
+        assert [m.pattern for m in result.proper_matches] == ["림버스", "Charge", "Charge", "림버스"]
+        assert result.proper_matches[0].data is snap.proper_ac.search(text)[0].data
+
+
+class TestAcAutomatonBenchmark:
+    """8000 个合成术语上的正确性与性能基准；构建 / 搜索耗时与内存记录在 INFO 日志中（`pytest --log-cli-level=INFO` 可见）。"""
+
+    @staticmethod
+    def _corpus() -> tuple[list[str], list[str]]:
+        rng = random.Random(20)
+        syllables = [chr(c) for c in range(0xAC00, 0xAC00 + 400)]
+
+        def word(low: int, high: int) -> str:
+            return "".join(rng.choice(syllables) for _ in range(rng.randint(low, high)))
+
+        terms = sorted({word(2, 6) for _ in range(8000)})
+        texts = [
+            " ".join(word(1, 5) for _ in range(20)) + " " + rng.choice(terms)
+            for _ in range(1000)
+        ]
+        return terms, texts
+
+    @staticmethod
+    def _brute_force(terms: set[str], text: str, max_len: int) -> list[str]:
+        # 与自动机一致的输出顺序：按结束位置，同一位置由长到短
+        found = []
+        for end in range(1, len(text) + 1):
+            for length in range(min(end, max_len), 0, -1):
+                if text[end - length:end] in terms:
+                    found.append(text[end - length:end])
+        return found
+
+    class _DictTrie:
+        """扁平化之前的实现：每个节点一个 字符 → 子节点 dict，每个节点物化输出列表。"""
+
+        def __init__(self, terms: list[str]):
+            self.trie: list[dict[str, int]] = [{}]
+            self.output: list[list[str]] = [[]]
+            for term in terms:
+                node = 0
+                for ch in term:
+                    if ch not in self.trie[node]:
+                        self.trie[node][ch] = len(self.trie)
+                        self.trie.append({})
+                        self.output.append([])
+                    node = self.trie[node][ch]
+                self.output[node].append(term)
+            self.fail = [0] * len(self.trie)
+            queue = list(self.trie[0].values())
+            for r in queue:
+                for ch, child in self.trie[r].items():
+                    queue.append(child)
+                    f = self.fail[r]
+                    while f and ch not in self.trie[f]:
+                        f = self.fail[f]
+                    self.fail[child] = self.trie[f].get(ch, 0) if self.trie[f].get(ch, 0) != child else 0
+                    self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+        def search(self, text: str) -> list[ACPattern]:
+            result = []
+            node = 0
+            for ch in text:
+                while node != 0 and ch not in self.trie[node]:
+                    node = self.fail[node]
+                node = self.trie[node].get(ch, 0)
+                if self.output[node]:
+                    result.extend(ACPattern(term, node) for term in self.output[node])
+            return result
+
+    def test_synthetic_terms_match_brute_force(self):
+        terms, texts = self._corpus()
+
+        tracemalloc.start()
+        try:
+            ac = AcAutomaton()
+            for term in terms:
+                ac.add_pattern(term, data=term)
+            ac.build()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        term_set = set(terms)
+        max_len = max(map(len, terms))
+        for text in texts[:200]:
+            hits = ac.search(text)
+            assert [h.pattern for h in hits] == self._brute_force(term_set, text, max_len)
+            assert all(h.data == h.pattern for h in hits)
+
+        def build():
+            fresh = AcAutomaton()
+            for term in terms:
+                fresh.add_pattern(term)
+            fresh.build()
+
+        build_time = min(timeit.repeat(build, number=1, repeat=3))
+
+        # 与逐节点字典 trie（扁平化之前的实现）交替计时，取各自最好成绩，减少机器抖动的影响
+        reference = self._DictTrie(terms)
+        sample = texts[:250]
+        timings = {"reference": [], "search": [], "find": []}
+        for _ in range(30):
+            timings["reference"].append(timeit.timeit(lambda: [reference.search(t) for t in sample], number=1))
+            timings["search"].append(timeit.timeit(lambda: ac.search_batch(sample), number=1))
+            timings["find"].append(timeit.timeit(lambda: [ac.find(t) for t in sample], number=1))
+        reference_time, search_time, find_time = (min(timings[k]) for k in ("reference", "search", "find"))
+        _logger.info(
+            "%d 个术语: 构建 %.1f ms，搜索 %d 段文本 %.2f ms（字典 trie %.2f ms），find %.2f ms，"
+            "常驻内存 %.0f KiB（峰值 %.0f KiB）",
+            len(terms), build_time * 1000, len(sample), search_time * 1000, reference_time * 1000,
+            find_time * 1000, retained / 1024, peak / 1024,
+        )
+        assert ac.pattern_count == len(terms)
+        assert [[h.pattern for h in reference.search(t)] for t in sample[:20]] == [
+            [h.pattern for h in ac.search(t)] for t in sample[:20]
+        ]
+        # 扁平表占用约一半内存，搜索不应慢于字典 trie（留余量）
+        assert search_time < reference_time * 1.25
+        # build() 结束后构建期 trie 被释放，扁平表不到峰值的一半
+        assert retained * 2 < peak
+
+
+class TestMatchMemo:
+    """match_all 结果记忆：重复字符串只扫描一次，重建自动机后失效。"""
+
+    def test_repeated_text_hits_memo(self):
+        engine = MatcherEngine()
+        engine.build_proper([{"term": "림버스", "translation": "边狱"}])
+
+        first = engine.match_all("림버스 버스")
+        second = engine.match_all("림버스 버스")
+        engine.match_all("림버스 버스", en_text="Limbus")
+
+        assert second is first
+        assert engine.memo_stats() == {"hits": 1, "misses": 2, "size": 2}
+
+    def test_rebuild_invalidates_memo(self):
+        engine = MatcherEngine()
+        engine.build_proper([])
+        assert engine.match_all("yisang").role_matches == []
+
+        engine.build_roles([{"id": "yisang", "kr": "이상", "cn": "李箱"}])
+
+        assert [m.pattern for m in engine.match_all("yisang").role_matches] == ["yisang"]
+        assert engine.memo_stats()["hits"] == 0
+
+    def test_memo_is_bounded(self):
+        engine = MatcherEngine(memo_size=2)
+        engine.build_proper([])
+        for text in ("a", "b", "c", "a"):
+            engine.match_all(text)
+        assert engine.memo_stats() == {"hits": 0, "misses": 4, "size": 2}
+
+
+class TestAutomatonCache:
+    """已构建自动机的序列化与磁盘缓存。"""
+
+    def test_save_load_roundtrip(self, tmp_path):
+        items = [("he", {"n": 1}), ("she", None), ("his", [1, "a"]), ("hers", "x"), ("한국", 2), ("he", 3)]
+        ac = AcAutomaton()
+        for pattern, data in items:
+            ac.add_pattern(pattern, data=data)
+        ac.build()
+        ac.save(tmp_path / "ac.acbin")
+
+        loaded = AcAutomaton.load(tmp_path / "ac.acbin", items)
+
+        text = "ushers 한국어 his"
+        assert loaded.is_built and loaded.pattern_count == ac.pattern_count
+        assert loaded.search(text) == ac.search(text)
+        assert loaded.search("he")[0].data is items[0][1]
+        with pytest.raises(RuntimeError):
+            loaded.add_pattern("new")
+        with pytest.raises(ValueError):
+            AcAutomaton.load(tmp_path / "ac.acbin", items[:-1])
+        raw = (tmp_path / "ac.acbin").read_bytes()
+        for broken in (b"", raw[:12], raw[:-4]):
+            (tmp_path / "broken.acbin").write_bytes(broken)
+            with pytest.raises(ValueError):
+                AcAutomaton.load(tmp_path / "broken.acbin", items)
+
+    def test_cached_automaton_reuses_and_rebuilds(self, tmp_path, monkeypatch):
+        from translateFunc.matcher import ac_cache
+
+        items = [("림버스", {"term": "림버스"}), ("단테", {"term": "단테"})]
+        first = ac_cache.cached_automaton(items, tmp_path, "proper")
+        cached = list(tmp_path.glob("proper-*.acbin"))
+        assert len(cached) == 1
+
+        def fail_build(_items):
+            raise AssertionError("命中缓存时不应重新构建")
+
+        monkeypatch.setattr(ac_cache, "_build", fail_build)
+        second = ac_cache.cached_automaton(items, tmp_path, "proper")
+        assert second.search("림버스의 단테") == first.search("림버스의 단테")
+
+        # 损坏的缓存文件回退为重新构建
+        monkeypatch.undo()
+        cached[0].write_bytes(b"broken")
+        rebuilt = ac_cache.cached_automaton(items, tmp_path, "proper")
+        assert [m.data for m in rebuilt.search("단테")] == [{"term": "단테"}]
+
+    def test_engine_loads_from_cache(self, tmp_path):
+        terms = [{"term": "림버스", "translation": "边狱"}, {"term": "단테", "translation": "但丁"}]
+        roles = [{"id": "Dante", "kr": "단테", "cn": "但丁"}]
+        results = []
+        for _ in range(2):
+            engine = MatcherEngine(cache_dir=tmp_path)
+            engine.build_proper(terms)
+            engine.build_roles(roles)
+            match = engine.match_all("림버스 Dante 단테")
+            results.append((match.proper_matches, [m.data for m in match.role_matches]))
+        assert results[0] == results[1]
+        assert [m.data["translation"] for m in results[1][0]] == ["边狱", "但丁"]
+        assert {p.name.split("-")[0] for p in tmp_path.iterdir()} == {"proper", "combined"}
+
+    def test_cache_load_benchmark(self, tmp_path):
+        terms, _ = TestAcAutomatonBenchmark._corpus()
+        items = [(term, {"term": term, "translation": "", "note": ""}) for term in terms]
+        from translateFunc.matcher.ac_cache import cached_automaton
+
+        build_time = min(timeit.repeat(lambda: cached_automaton(items, None, "proper"), number=1, repeat=3))
+        cached_automaton(items, tmp_path, "proper")
+        load_time = min(timeit.repeat(lambda: cached_automaton(items, tmp_path, "proper"), number=1, repeat=3))
+        size = next(tmp_path.glob("proper-*.acbin")).stat().st_size
+        _logger.info(
+            "%d 个术语: 构建 %.1f ms，缓存加载 %.1f ms，缓存文件 %.0f KiB",
+            len(terms), build_time * 1000, load_time * 1000, size / 1024,
+        )
+        # 加载通常快 4 倍以上，留足余量
+        assert load_time * 2 < build_time
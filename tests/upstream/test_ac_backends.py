@@ -0,0 +1,157 @@
+"""AC 自动机后端一致性测试：纯 Python 与 pyahocorasick 通过同一组用例。
+
+未安装 pyahocorasick 时相应参数被跳过。8000 词典上的构建 / 搜索耗时记录在 INFO 日志中
+（`pytest --log-cli-level=INFO` 可见）。
+"""
+from __future__ import annotations
+
+import logging
+import random
+import timeit
+
+import pytest
+
+from translateFunc.enums import MatchMode
+from translateFunc.matcher.ac_backend import available_backends, new_automaton, resolve_backend
+from translateFunc.matcher.engine import MatcherEngine
+
+_logger = logging.getLogger(__name__)
+
+BACKENDS = ["python", "pyahocorasick"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    if request.param not in available_backends():
+        pytest.skip(f"{request.param} 未安装")
+    return request.param
+
+
+def _build(backend: str, items):
+    ac = new_automaton(backend)
+    for item in items:
+        pattern, data = item if isinstance(item, tuple) else (item, None)
+        ac.add_pattern(pattern, data=data)
+    ac.build()
+    return ac
+
+
+def _dictionary(size: int, seed: int = 25) -> tuple[list[tuple[str, dict]], list[str]]:
+    """接近实际术语表的合成词典：韩文术语、带空格的多词术语、[状态效果] ID 与英文名。"""
+    rng = random.Random(seed)
+    syllables = [chr(c) for c in range(0xAC00, 0xAC00 + 600)]
+
+    def word(low: int, high: int) -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(low, high)))
+
+    terms: dict[str, dict] = {}
+    while len(terms) < size:
+        kind = rng.random()
+        if kind < 0.7:
+            term = word(2, 5)
+        elif kind < 0.85:
+            term = f"{word(2, 4)} {word(2, 4)}"
+        elif kind < 0.95:
+            term = f"[{''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(4, 12)))}]"
+        else:
+            term = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+        terms.setdefault(term, {"term": term, "translation": f"译{len(terms)}", "note": ""})
+    items = list(terms.items())
+    texts = [
+        "<color=#ff0000>" + " ".join(
+            rng.choice(items)[0] if rng.random() < 0.15 else word(1, 4) for _ in range(25)
+        ) + "</color>"
+        for _ in range(2000)
+    ]
+    return items, texts
+
+
+class TestBackendConformance:
+    """两种后端的接口与结果必须完全一致。"""
+
+    def test_empty_automaton(self, backend):
+        ac = _build(backend, [])
+        assert ac.search("hello") == [] and ac.find("hello") == []
+        assert ac.search_batch(["a", ""]) == [[], []]
+
+    def test_overlapping_matches_and_order(self, backend):
+        ac = _build(backend, ["he", "she", "his", "hers", "e"])
+        assert [m.pattern for m in ac.search("ushers his")] == ["she", "he", "e", "hers", "his"]
+
+    def test_duplicate_patterns_keep_insertion_order(self, backend):
+        ac = _build(backend, [("단테", 1), ("림버스", 2), ("단테", 3)])
+        assert [m.data for m in ac.search("단테")] == [1, 3]
+        assert ac.pattern_count == 3
+        assert [p.data for p in ac.patterns] == [1, 2, 3]
+
+    def test_data_identity_and_positions(self, backend):
+        data = {"term": "림버스"}
+        ac = _build(backend, [("림버스", data), ("버스", None)])
+        hits = ac.find("그 림버스")
+        assert [(m.pattern, m.start, m.end) for m in hits] == [("림버스", 2, 5), ("버스", 3, 5)]
+        assert hits[0].data is data
+
+    @pytest.mark.parametrize("mode, expected", [
+        (MatchMode.ALL, [("림버스", 0, 3), ("버스", 1, 3), ("림버스 컴퍼니", 0, 7), ("컴퍼니", 4, 7)]),
+        (MatchMode.LEFTMOST_LONGEST, [("림버스 컴퍼니", 0, 7)]),
+        (MatchMode.LONGEST_PER_POSITION, [("림버스 컴퍼니", 0, 7), ("버스", 1, 3), ("컴퍼니", 4, 7)]),
+    ])
+    def test_match_modes(self, backend, mode, expected):
+        ac = _build(backend, ["림버스 컴퍼니", "림버스", "컴퍼니", "버스"])
+        assert [(m.pattern, m.start, m.end) for m in ac.find("림버스 컴퍼니", mode)] == expected
+
+    def test_lifecycle_errors(self, backend):
+        ac = new_automaton(backend)
+        ac.add_pattern("")
+        ac.add_pattern("a")
+        assert not ac.is_built and ac.pattern_count == 1
+        with pytest.raises(RuntimeError):
+            ac.search("a")
+        ac.build()
+        ac.build()
+        with pytest.raises(RuntimeError):
+            ac.add_pattern("b")
+
+    def test_engine_results_match_python_backend(self, backend):
+        items, texts = _dictionary(500)
+        results = []
+        for name in ("python", backend):
+            engine = MatcherEngine(backend=name, proper_match_mode=MatchMode.ALL)
+            engine.build_proper([data for _, data in items])
+            engine.build_affects([{"id": "Charge", "kr": "충전"}])
+            assert engine.backend == name
+            results.append([engine.match_all(text) for text in texts[:200]])
+        assert results[0] == results[1]
+
+    def test_same_hits_as_python_on_dictionary(self, backend):
+        items, texts = _dictionary(2000)
+        reference = _build("python", items)
+        ac = _build(backend, items)
+        for text in texts[:300]:
+            assert ac.find(text) == reference.find(text)
+
+
+def test_resolve_backend():
+    assert resolve_backend("python") == "python"
+    assert resolve_backend("auto") == available_backends()[-1]
+    with pytest.raises(ValueError):
+        resolve_backend("rust")
+
+
+def test_backend_benchmark_on_8k_dictionary():
+    items, texts = _dictionary(8000)
+    timings = {}
+    hits = {}
+    for name in available_backends():
+        build = min(timeit.repeat(lambda: _build(name, items), number=1, repeat=3))
+        ac = _build(name, items)
+        search = min(timeit.repeat(lambda: ac.search_batch(texts), number=1, repeat=3))
+        timings[name] = (build, search)
+        hits[name] = [[p.data for p in found] for found in ac.search_batch(texts)]
+    for name, (build, search) in timings.items():
+        _logger.info("%s: 构建 %.1f ms，搜索 %d 段文本 %.1f ms", name, build * 1000, len(texts), search * 1000)
+    first = next(iter(hits.values()))
+    assert all(found == first for found in hits.values())
+    if "pyahocorasick" in timings:
+        # C 实现的构建通常快 2 倍以上；搜索受结果对象分配支配，差距较小，不作断言
+        assert timings["pyahocorasick"][0] < timings["python"][0]
@@ -0,0 +1,101 @@
+"""RequestBatcher 跨文件合并请求测试。"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from translateFunc.batcher import RequestBatcher, merge_requests, split_results
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.enums import ProcessResult
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+from translateFunc.usage import UsageMeter
+
+
+def test_merge_and_split_route_results_by_id():
+    merged = merge_requests([
+        {"reference": {"proper_terms": [{"term": "림버스"}]}, "text_blocks": [{"kr": "a"}]},
+        {"reference": {"proper_terms": [{"term": "림버스"}]}, "text_blocks": [{"kr": "b"}, {"kr": "c"}]},
+    ])
+    assert [block["kr"] for block in merged["text_blocks"]] == ["a", "b", "c"]
+    assert merged["reference"]["proper_terms"] == [{"term": "림버스"}]
+
+    routed = split_results(
+        [{"id": 3, "translation": "C"}, {"id": 1, "translation": "A"}, {"id": 9}, "bad"],
+        [1, 2],
+    )
+    assert routed == [[{"id": 1, "translation": "A"}], [{"id": 2, "translation": "C"}]]
+
+
+def test_small_files_share_one_stage_1_request(tmp_path, echo_translator, write_data):
+    names = ["KR_UIFirst.json", "KR_UISecond.json", "KR_UIThird.json"]
+    for number, name in enumerate(names):
+        write_data(tmp_path / "kr" / name, [{"id": 1, "content": f"버튼 {number}"}])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    translator = echo_translator
+    batcher = RequestBatcher(linger=0.5)
+
+    def process(name: str):
+        return FileProcessor(
+            FilePathConfig(tmp_path / "kr" / name, paths),
+            engine=engine,
+            translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+            translator=translator,
+            batcher=batcher,
+        ).process()
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        outcomes = list(pool.map(process, names))
+
+    assert [o.result for o in outcomes] == [ProcessResult.SUCCESS_SAVED] * 3
+    assert len(translator.requests) == 1
+    assert sorted(translator.requests[0]) == ["버튼 0", "버튼 1", "버튼 2"]
+    for number, name in enumerate(names):
+        saved = json.loads(
+            (tmp_path / "out" / name[3:]).read_text(encoding="utf-8-sig")
+        )
+        assert saved["dataList"][0]["content"] == f"译:버튼 {number}"
+    assert batcher.stats() == {"batches": 1, "batched_files": 3}
+
+
+def test_batched_usage_is_split_by_text_blocks(tmp_path, monkeypatch, echo_translator, write_data):
+    usage = {"prompt_tokens": 600, "completion_tokens": 60, "cached_tokens": 0}
+    monkeypatch.setattr("translateFunc.processor.parse_usage", lambda _attempts: dict(usage))
+    names = {"KR_UIOne.json": 1, "KR_UITwo.json": 2, "KR_UIThree.json": 3}
+    for name, count in names.items():
+        write_data(tmp_path / "kr" / name, [
+            {"id": index + 1, "content": f"{name[5:-5]} 버튼 {index}"} for index in range(count)
+        ])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    translator = echo_translator
+    batcher = RequestBatcher(linger=0.5)
+    meter = UsageMeter()
+
+    def process(name: str):
+        return FileProcessor(
+            FilePathConfig(tmp_path / "kr" / name, paths),
+            engine=engine,
+            translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+            translator=translator,
+            batcher=batcher,
+            usage=meter,
+        ).process()
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        outcomes = list(pool.map(process, names))
+
+    assert [o.result for o in outcomes] == [ProcessResult.SUCCESS_SAVED] * 3
+    assert len(translator.requests) == 1
+    summary = meter.summary()
+    # 总计与按阶段只计一次调用；按文件按文本块数分摊
+    assert summary["total"]["calls"] == 1 and summary["total"]["prompt_tokens"] == 600
+    assert summary["by_stage"]["stage_1"]["prompt_tokens"] == 600
+    assert {name: bucket["prompt_tokens"] for name, bucket in summary["by_file"].items()} == {
+        "KR_UIOne.json": 100, "KR_UITwo.json": 200, "KR_UIThree.json": 300,
+    }
+    assert all(bucket["calls"] == 1 for bucket in summary["by_file"].values())
+
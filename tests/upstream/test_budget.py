@@ -0,0 +1,120 @@
+"""RunBudget 逐级降级与 FileProcessor 预算回退测试。"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from translateFunc.budget import (
+    STEP_DROP_OPTIONAL,
+    STEP_STOP_NEW_FILES,
+    BudgetExhausted,
+    RunBudget,
+)
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.enums import ProcessResult
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+
+
+def test_budget_drops_optional_stages_before_stopping():
+    budget = RunBudget(100, soft_ratio=0.5)
+    assert budget.allows("stage_2") and budget.allows("stage_1")
+
+    budget.charge(60)
+    assert not budget.allows("stage_2")
+    assert not budget.allows("p1_2")
+    assert budget.allows("stage_1")
+
+    budget.charge(60)
+    assert budget.exhausted
+    with pytest.raises(BudgetExhausted):
+        budget.check("stage_1")
+    budget.charge(10)
+
+    assert [step["step"] for step in budget.degradations] == [
+        STEP_DROP_OPTIONAL, STEP_STOP_NEW_FILES,
+    ]
+    assert budget.stats()["skipped"] == {"stage_2": 1, "p1_2": 1, "stage_1": 1}
+
+
+def test_check_reserves_tokens_until_charge_settles():
+    budget = RunBudget(100)
+
+    budget.check("stage_1", reserve=60)
+    budget.check("stage_1", reserve=40)
+    # 预留已占满上限：第三个并发调用不能再通过检查
+    with pytest.raises(BudgetExhausted):
+        budget.check("stage_1", reserve=10)
+
+    budget.charge(30, reserved=60)
+    budget.charge(20, reserved=40)
+    assert budget.spent == 50
+    assert budget.allows("stage_1")
+
+
+def test_call_charges_provider_usage_instead_of_estimate(
+    tmp_path, monkeypatch, echo_translator, write_data,
+):
+    monkeypatch.setattr(
+        "translateFunc.processor.parse_usage",
+        lambda _attempts: {
+            "prompt_tokens": 1000, "completion_tokens": 700, "cached_tokens": 0,
+            "reasoning_tokens": 600, "total_tokens": 1700,
+        },
+    )
+    write_data(tmp_path / "kr" / "KR_Test.json", [{"id": 1, "content": "안녕하세요"}])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    budget = RunBudget(100_000)
+
+    FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Test.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+        translator=echo_translator,
+        budget=budget,
+    ).process()
+
+    # 实际用量（含推理 token）入账，预留全部释放
+    assert budget.spent == 1700
+    assert budget.stats()["spent_tokens"] == 1700
+
+
+def test_exhausted_budget_falls_back_without_calling(tmp_path, write_data):
+    class _ForbiddenTranslator:
+        def update_config(self, **_kwargs):
+            return None
+
+        def translate(self, *_args, **_kwargs):
+            raise AssertionError("预算用尽后不应再调用翻译器")
+
+    write_data(tmp_path / "kr" / "KR_Test.json", [
+        {"id": 1, "content": "안녕하세요"},
+        {"id": 2, "content": "새 대사"},
+    ])
+    write_data(tmp_path / "llc" / "Test.json", [{"id": 1, "content": "旧译文"}])
+    paths = PathConfig(
+        target_path=tmp_path / "out",
+        llc_base_path=tmp_path / "llc",
+        KR_base_path=tmp_path / "kr",
+    )
+    engine = MatcherEngine()
+    engine.build_proper([])
+    budget = RunBudget(10)
+    budget.charge(10)
+
+    outcome = FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Test.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+        translator=_ForbiddenTranslator(),
+        budget=budget,
+    ).process()
+
+    assert outcome.result == ProcessResult.FALLBACK_TO_ORIGINAL
+    assert outcome.extra["budget_exhausted"] is True
+    saved = json.loads((tmp_path / "out" / "Test.json").read_text(encoding="utf-8"))
+    assert saved["dataList"][0]["content"] == "旧译文"
+    assert budget.stats()["skipped"] == {"files": 1}
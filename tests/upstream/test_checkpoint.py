@@ -0,0 +1,82 @@
+"""CheckpointJournal 断点日志测试。"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from translateFunc.checkpoint import CHECKPOINT_NAME, CheckpointJournal
+from translateFunc.config import (
+    FilePathConfig, PathConfig, ProcessOutcome, TranslateConfig, glossary_digest,
+)
+from translateFunc.enums import ProcessResult
+
+
+def _file(tmp_path: Path) -> FilePathConfig:
+    kr_file = tmp_path / "kr" / "StoryData" / "KR_S1.json"
+    kr_file.parent.mkdir(parents=True)
+    kr_file.write_text('{"dataList": [{"id": 1, "content": "하나"}]}', encoding="utf-8")
+    file_pc = FilePathConfig(
+        kr_file,
+        PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr",
+                   llc_base_path=tmp_path / "llc"),
+    )
+    file_pc.target_file.parent.mkdir(parents=True)
+    file_pc.target_file.write_text('{"dataList": [{"id": 1, "content": "一"}]}', encoding="utf-8")
+    return file_pc
+
+
+def _journal(tmp_path: Path, config: str = "cfg") -> CheckpointJournal:
+    return CheckpointJournal(tmp_path / "out" / CHECKPOINT_NAME, config)
+
+
+def test_finished_file_is_resumed_with_entries(tmp_path):
+    file_pc = _file(tmp_path)
+    entries = {"1": ["k", "", "ours"]}
+    _journal(tmp_path).record(file_pc, ProcessOutcome(ProcessResult.SUCCESS_SAVED, "S1.json"), entries)
+
+    outcome, resumed_entries = _journal(tmp_path).lookup(file_pc)
+
+    assert outcome.result == ProcessResult.SUCCESS_SAVED
+    assert outcome.extra == {"resumed": True}
+    assert resumed_entries == entries
+
+
+def test_changed_input_output_or_config_is_not_resumed(tmp_path):
+    file_pc = _file(tmp_path)
+    _journal(tmp_path).record(file_pc, ProcessOutcome(ProcessResult.SUCCESS_SAVED, "S1.json"))
+
+    assert _journal(tmp_path, config="other").lookup(file_pc) is None
+
+    file_pc.LLC_path.parent.mkdir(parents=True)
+    file_pc.LLC_path.write_text("{}", encoding="utf-8")
+    assert _journal(tmp_path).lookup(file_pc) is None
+    file_pc.LLC_path.unlink()
+    assert _journal(tmp_path).lookup(file_pc) is not None
+
+    file_pc.target_file.write_text("{}", encoding="utf-8")
+    assert _journal(tmp_path).lookup(file_pc) is None
+
+
+def test_journal_from_another_glossary_is_not_resumed(tmp_path):
+    file_pc = _file(tmp_path)
+    before = TranslateConfig(glossary_digest=glossary_digest([{"term": "단테", "translation": "但丁"}]))
+    after = TranslateConfig(glossary_digest=glossary_digest([{"term": "단테", "translation": "但丁（管理人）"}]))
+    _journal(tmp_path, before.fingerprint()).record(
+        file_pc, ProcessOutcome(ProcessResult.SUCCESS_SAVED, "S1.json"),
+    )
+
+    journal = _journal(tmp_path, after.fingerprint())
+    assert (journal.resumable, journal.stale) == (0, 1)
+    assert journal.lookup(file_pc) is None
+    assert _journal(tmp_path, before.fingerprint()).resumable == 1
+
+
+def test_unfinished_results_are_not_recorded_and_torn_lines_are_ignored(tmp_path):
+    file_pc = _file(tmp_path)
+    journal = _journal(tmp_path)
+    journal.record(file_pc, ProcessOutcome(ProcessResult.FALLBACK_TO_ORIGINAL, "S1.json"))
+    journal.record(file_pc, ProcessOutcome(ProcessResult.TRANSLATION_MISMATCH, "S1.json"))
+    with open(tmp_path / "out" / CHECKPOINT_NAME, "a", encoding="utf-8") as f:
+        f.write('{"file": "StoryData/KR_S1.json", "res')
+
+    assert _journal(tmp_path).resumable == 0
+    assert _journal(tmp_path).lookup(file_pc) is None
@@ -0,0 +1,134 @@
+"""SharedTranslations 运行内去重与 FileProcessor 集成测试。"""
+from __future__ import annotations
+
+import json
+import threading
+
+from translateFunc.builder.request import RequestBuilder
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.dedup import SharedTranslations
+from translateFunc.enums import FileType
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+
+
+def test_first_claim_owns_key_and_waiters_get_published_result():
+    shared = SharedTranslations()
+    key = shared.make_key(FileType.UI, {"kr": "확인", "jp": "確認", "en": "OK"})
+    assert shared.make_key(FileType.STORY, {"kr": "확인", "jp": "確認", "en": "OK"}) != key
+
+    assert shared.claim("a.json", [key]) == set()
+    assert shared.claim("b.json", [key]) == {key}
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(shared.wait(key)))
+    waiter.start()
+    shared.publish(key, "确认")
+    waiter.join(timeout=5)
+
+    assert results == ["确认"]
+    assert shared.stats() == {"unique": 1, "fanned_out": 1, "self_translated": 0}
+
+
+def test_release_unblocks_waiters_when_owner_fails():
+    shared = SharedTranslations()
+    shared.claim("a.json", ["k"])
+    shared.claim("b.json", ["k"])
+    shared.release("a.json")
+
+    assert shared.wait("k") is None
+    assert shared.stats()["self_translated"] == 1
+
+
+def test_wait_times_out_when_owner_never_publishes():
+    shared = SharedTranslations()
+    shared.claim("a.json", ["k"])
+    shared.claim("b.json", ["k"])
+
+    assert shared.wait("k", timeout=0.01) is None
+    assert shared.stats()["self_translated"] == 1
+
+
+def test_build_does_not_wait_for_foreign_keys():
+    engine = MatcherEngine()
+    engine.build_proper([])
+    shared = SharedTranslations()
+    block = {"kr": "공통 문장", "jp": "", "en": ""}
+    shared.claim("owner.json", [shared.make_key(FileType.OTHER, block)])
+    request_text = {
+        "kr": {0: {("content",): "공통 문장"}, 1: {("content",): "혼자"}},
+        "jp": {},
+        "en": {},
+    }
+    builder = RequestBuilder(request_text, engine, shared=shared, shared_owner="waiter.json")
+
+    # 所有者尚未发布：build 立即返回，只发送本文件独有的文本块
+    builder.build()
+    assert [b["kr"] for b in builder.unified_request["text_blocks"]] == ["혼자"]
+    assert list(builder.shared_pending) == [0]
+
+    shared.publish(shared.make_key(FileType.OTHER, block), "公共句子")
+    unresolved = builder.resolve_shared(timeout=1)
+    assert unresolved["kr"] == {}
+    assert builder.deBuild(["独自"]) == {0: {("content",): "公共句子"}, 1: {("content",): "独自"}}
+
+
+def test_identical_sources_are_translated_once_across_files(tmp_path, echo_translator, write_data):
+    write_data(tmp_path / "kr" / "KR_First.json", [
+        {"id": 1, "content": "공통 문장"},
+        {"id": 2, "content": "첫 번째"},
+    ])
+    write_data(tmp_path / "kr" / "KR_Second.json", [
+        {"id": 1, "content": "두 번째"},
+        {"id": 2, "content": "공통 문장"},
+    ])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    translator = echo_translator
+    shared = SharedTranslations()
+
+    for name in ("KR_First.json", "KR_Second.json"):
+        FileProcessor(
+            FilePathConfig(tmp_path / "kr" / name, paths),
+            engine=engine,
+            translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+            translator=translator,
+            shared=shared,
+        ).process()
+
+    assert len(translator.sources) == 3
+    assert translator.sources.count("공통 문장") == 1
+    second = json.loads((tmp_path / "out" / "Second.json").read_text(encoding="utf-8-sig"))
+    assert [entry["content"] for entry in second["dataList"]] == ["译:두 번째", "译:공통 문장"]
+    assert shared.stats()["fanned_out"] == 1
+
+
+def test_waiter_translates_blocks_the_owner_failed(tmp_path, echo_translator, write_data):
+    write_data(tmp_path / "kr" / "KR_Waiter.json", [
+        {"id": 1, "content": "공통 문장"},
+        {"id": 2, "content": "혼자"},
+    ])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    translator = echo_translator
+    shared = SharedTranslations()
+    # 缺少 JP / EN 文件时以 KR 原文代替
+    key = shared.make_key(FileType.OTHER, {"kr": "공통 문장", "jp": "공통 문장", "en": "공통 문장"})
+    shared.claim("Owner.json", [key])
+    shared.release("Owner.json")
+
+    FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Waiter.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+        translator=translator,
+        shared=shared,
+    ).process()
+
+    # 本文件独有的文本块先发送，所有者失败的文本块随后补译
+    assert translator.sources == ["혼자", "공통 문장"]
+    waiter = json.loads((tmp_path / "out" / "Waiter.json").read_text(encoding="utf-8-sig"))
+    assert [entry["content"] for entry in waiter["dataList"]] == ["译:공통 문장", "译:혼자"]
+    assert shared.stats()["self_translated"] == 1
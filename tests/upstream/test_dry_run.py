@@ -0,0 +1,122 @@
+"""dry run 请求规模预估与吞吐量记录测试。"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from translateFunc.config import FilePathConfig, PathConfig, PipelineSummary, TranslateConfig
+from translateFunc.enums import ProcessResult
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.pipeline import TranslationPipeline
+from translateFunc.planner import DEFAULT_TOKENS_PER_SECOND, ThroughputMeter, estimate_tokens
+from translateFunc.processor import FileProcessor
+
+
+class _ForbiddenTranslator:
+    def update_config(self, **_kwargs):
+        return None
+
+    def translate(self, *_args, **_kwargs):
+        raise AssertionError("dry run 不应调用翻译器")
+
+
+def test_dry_run_counts_calls_without_translating(tmp_path, write_data):
+    write_data(tmp_path / "kr" / "KR_Test.json", [
+        {"id": 1, "content": "안녕하세요"},
+        {"id": 2, "content": "반갑습니다"},
+    ])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    processor = FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Test.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(
+            translation_mode="single_stage", fallback=True, dry_run=True,
+        ),
+        translator=_ForbiddenTranslator(),
+    )
+    outcome = processor.process()
+
+    assert outcome.result == ProcessResult.DRY_RUN_ESTIMATED
+    estimate = outcome.extra["estimate"]
+    assert estimate["files"] == 1
+    assert estimate["text_blocks"] == 2
+    assert estimate["calls"] == {"stage_0": 0, "stage_1": 1, "stage_2": 0}
+    assert estimate["input_tokens"] > estimate["output_tokens"] > 0
+    assert estimate["fallback_input_tokens"] > 0
+    assert not (tmp_path / "out" / "Test.json").exists()
+
+
+def _snapshot(root: Path) -> dict[str, bytes]:
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def test_dry_run_leaves_output_tree_untouched(tmp_path, write_data):
+    out = tmp_path / "out"
+    write_data(out / "Covered.json", [{"id": 1, "content": "上次的输出"}])
+    before = _snapshot(out)
+
+    write_data(tmp_path / "kr" / "KR_Covered.json", [{"id": 1, "content": "안녕하세요"}])
+    write_data(tmp_path / "llc" / "Covered.json", [{"id": 1, "content": "你好"}])
+    write_data(tmp_path / "kr" / "KR_Empty.json", [])
+    write_data(tmp_path / "llc" / "Empty.json", [])
+    write_data(tmp_path / "kr" / "KR_Reused.json", [{"id": 1, "content": "반갑습니다"}])
+    write_data(tmp_path / "previous" / "Reused.json", [{"id": 1, "content": "很高兴见到你"}])
+
+    paths = PathConfig(target_path=out, KR_base_path=tmp_path / "kr", llc_base_path=tmp_path / "llc")
+    config = TranslateConfig(
+        translation_mode="single_stage", fallback=True, dry_run=True,
+        reuse_output_dir=tmp_path / "previous", reuse_files=frozenset({"KR_Reused.json"}),
+    )
+    engine = MatcherEngine()
+    engine.build_proper([])
+    results = {}
+    for name in ("KR_Covered.json", "KR_Empty.json"):
+        processor = FileProcessor(
+            FilePathConfig(tmp_path / "kr" / name, paths),
+            engine=engine,
+            translate_config=config,
+            translator=_ForbiddenTranslator(),
+        )
+        results[name] = processor.process().result
+
+    pipeline = TranslationPipeline.__new__(TranslationPipeline)
+    pipeline._config = config
+    pipeline._entry_index = None
+    results["KR_Reused.json"] = pipeline._reuse_previous(
+        FilePathConfig(tmp_path / "kr" / "KR_Reused.json", paths)
+    ).result
+
+    assert results == {
+        "KR_Covered.json": ProcessResult.ALREADY_TRANSLATED,
+        "KR_Empty.json": ProcessResult.EMPTY_WITH_LLC,
+        "KR_Reused.json": ProcessResult.REUSED_PREVIOUS,
+    }
+    assert _snapshot(out) == before
+
+
+def test_estimate_tokens_weights_wide_characters():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("가" * 10) > estimate_tokens("a" * 10)
+
+
+def test_throughput_meter_round_trip(tmp_path):
+    path = tmp_path / "throughput.json"
+    assert ThroughputMeter.load(path).tokens_per_second == DEFAULT_TOKENS_PER_SECOND
+
+    meter = ThroughputMeter()
+    meter.add(300, 2.0)
+    meter.add(100, 0.0)  # 无耗时的观测被忽略
+    meter.save(path)
+    assert ThroughputMeter.load(path).tokens_per_second == 150.0
+
+
+def test_summary_merges_estimates():
+    summary = PipelineSummary()
+    for stage_1 in (2, 3):
+        summary.add_estimate({"files": 1, "calls": {"stage_1": stage_1}, "input_tokens": 10})
+    other = PipelineSummary(estimate={"files": 1, "projection": {"projected_seconds": 5}})
+    summary.extend(other)
+
+    assert summary.estimate == {"files": 3, "calls": {"stage_1": 5}, "input_tokens": 20}
+    assert PipelineSummary.from_dict(summary.to_dict()).estimate == summary.estimate
@@ -0,0 +1,147 @@
+"""EntryIndex 条目级索引与 FileProcessor 集成测试。"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from dataclasses import replace
+
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig, glossary_digest
+from translateFunc.entry_index import ENTRY_INDEX_NAME, EntryIndex, hash_entry
+from translateFunc.enums import ProcessResult
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.pipeline import TranslationPipeline
+from translateFunc.processor import FileProcessor
+
+from conftest import EchoTranslator, write_data_list
+
+
+def _run(tmp_path: Path, name: str, kr: list[dict], llc: list[dict],
+         index: EntryIndex, previous: Path | None = None):
+    root = tmp_path / name
+    write_data_list(root / "kr" / "KR_Test.json", kr)
+    write_data_list(root / "llc" / "Test.json", llc)
+    paths = PathConfig(
+        target_path=root / "out",
+        llc_base_path=root / "llc",
+        KR_base_path=root / "kr",
+        JP_base_path=root / "jp",
+        EN_base_path=root / "en",
+    )
+    engine = MatcherEngine()
+    engine.build_proper([])
+    translator = EchoTranslator()
+    processor = FileProcessor(
+        FilePathConfig(root / "kr" / "KR_Test.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(
+            translation_mode="single_stage",
+            fallback=False,
+            reuse_output_dir=previous,
+            entry_index=True,
+        ),
+        translator=translator,
+        entry_index=index,
+    )
+    outcome = processor.process()
+    output = json.loads((root / "out" / "Test.json").read_text(encoding="utf-8-sig"))
+    return outcome, {item["id"]: item["content"] for item in output["dataList"]}, translator
+
+
+def test_hash_entry_ignores_ids_and_numbers():
+    assert hash_entry({"id": 1, "content": "하나", "value": 3}) == hash_entry(
+        {"id": 2, "content": "하나", "value": 5}
+    )
+    assert hash_entry({"content": "하나"}) != hash_entry({"content": "둘"})
+    assert hash_entry(None) == ""
+
+
+def test_index_round_trip_requires_same_config(tmp_path):
+    index = EntryIndex(config="cfg")
+    index.record("A.json", {"1": ["k", "l", "ours"]})
+    path = tmp_path / ENTRY_INDEX_NAME
+    index.save(path)
+
+    assert EntryIndex.load(path, "cfg").previous_entries("A.json") == {"1": ["k", "l", "ours"]}
+    assert EntryIndex.load(path, "other").previous_entries("A.json") == {}
+    assert EntryIndex.load(tmp_path / "missing.json", "cfg").previous_entries("A.json") == {}
+
+
+def test_pipeline_drops_index_built_with_another_glossary(tmp_path):
+    config = TranslateConfig(
+        entry_index=True, reuse_output_dir=tmp_path,
+        glossary_digest=glossary_digest([{"term": "단테", "translation": "但丁"}]),
+    )
+    index = EntryIndex(config=config.fingerprint())
+    index.record("A.json", {"1": ["k", "l", "ours"]})
+    index.save(tmp_path / "Info" / ENTRY_INDEX_NAME)
+
+    def load(cfg: TranslateConfig) -> EntryIndex:
+        pipeline = TranslationPipeline.__new__(TranslationPipeline)
+        pipeline._config = cfg
+        pipeline._entry_index = None
+        pipeline._load_entry_index()
+        return pipeline._entry_index
+
+    assert load(config).previous_entries("A.json") == {"1": ["k", "l", "ours"]}
+    edited = replace(config, glossary_digest=glossary_digest([{"term": "단테", "translation": "但丁（管理人）"}]))
+    assert load(edited).previous_entries("A.json") == {}
+
+
+def test_only_changed_entries_are_retranslated(tmp_path):
+    llc = [{"id": 1, "content": "一"}, {"id": 3, "content": "三"}]
+    first_index = EntryIndex()
+    outcome, first, translator = _run(
+        tmp_path, "first",
+        [{"id": 1, "content": "하나"}, {"id": 2, "content": "둘"}, {"id": 3, "content": "셋"}],
+        llc, first_index,
+    )
+    assert outcome.result == ProcessResult.SUCCESS_SAVED
+    assert translator.sources == ["둘"]
+    assert first == {1: "一", 2: "译:둘", 3: "三"}
+
+    # 第二次运行：id 1 的 KR 已变化但熟肉未更新；id 2 未变化
+    first_index.save(tmp_path / ENTRY_INDEX_NAME)
+    second_index = EntryIndex.load(tmp_path / ENTRY_INDEX_NAME)
+    outcome, second, translator = _run(
+        tmp_path, "second",
+        [{"id": 1, "content": "하나 새"}, {"id": 2, "content": "둘"}, {"id": 3, "content": "셋"}],
+        llc, second_index, previous=tmp_path / "first" / "out",
+    )
+    assert outcome.result == ProcessResult.SUCCESS_SAVED
+    assert translator.sources == ["하나 새"]
+    assert second == {1: "译:하나 새", 2: "译:둘", 3: "三"}
+
+
+def test_reused_entries_are_saved_without_llm_calls(tmp_path):
+    kr = [{"id": 1, "content": "하나"}, {"id": 2, "content": "둘"}]
+    llc = [{"id": 1, "content": "一"}]
+    first_index = EntryIndex()
+    _run(tmp_path, "first", kr, llc, first_index)
+    first_index.save(tmp_path / ENTRY_INDEX_NAME)
+
+    second_index = EntryIndex.load(tmp_path / ENTRY_INDEX_NAME)
+    outcome, second, translator = _run(
+        tmp_path, "second", kr, llc, second_index, previous=tmp_path / "first" / "out",
+    )
+    assert outcome.result == ProcessResult.SUCCESS_SAVED
+    assert translator.sources == []
+    assert second == {1: "一", 2: "译:둘"}
+    assert second_index._current["KR_Test.json"]["2"][2] == "ours"
+
+
+def test_updated_cooked_translation_wins_over_previous_output(tmp_path):
+    kr = [{"id": 1, "content": "하나"}, {"id": 2, "content": "둘"}]
+    first_index = EntryIndex()
+    _run(tmp_path, "first", kr, [{"id": 1, "content": "一"}], first_index)
+    first_index.save(tmp_path / ENTRY_INDEX_NAME)
+
+    second_index = EntryIndex.load(tmp_path / ENTRY_INDEX_NAME)
+    outcome, second, translator = _run(
+        tmp_path, "second", kr,
+        [{"id": 1, "content": "一"}, {"id": 2, "content": "二"}],
+        second_index, previous=tmp_path / "first" / "out",
+    )
+    assert outcome.result == ProcessResult.ALREADY_TRANSLATED
+    assert translator.sources == []
+    assert second == {1: "一", 2: "二"}
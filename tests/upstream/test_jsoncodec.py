@@ -0,0 +1,106 @@
+"""jsoncodec 后端一致性与编解码基准测试。
+
+合成语料上两种后端的解析 / 序列化耗时记录在 INFO 日志中（`pytest --log-cli-level=INFO` 可见）。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import timeit
+
+import pytest
+
+from translateFunc import jsoncodec
+
+_logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def restore_backend():
+    original = jsoncodec.backend()
+    yield
+    jsoncodec.set_backend(original)
+
+
+def _corpus(entries: int) -> dict:
+    return {
+        "dataList": [
+            {
+                "id": i,
+                "model": "Dante",
+                "content": f"<color=#ff0000>대사 {i}</color>\n\"인용\" \\ 탭\t끝",
+                "desc": "「ダンテ」 Dante 但丁 \u0001",
+                "levelList": [{"level": n, "rate": n / 3, "empty": [], "obj": {}} for n in range(3)],
+            }
+            for i in range(entries)
+        ],
+        "big": 2 ** 70,
+    }
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_backends_match_stdlib_output_and_bom(tmp_path, restore_backend, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    jsoncodec.set_backend(backend)
+    data = _corpus(20)
+
+    path = tmp_path / "out.json"
+    jsoncodec.dump(data, path, indent=4, bom=True)
+    expected = json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+    assert path.read_bytes() == jsoncodec.UTF8_BOM + expected
+    assert jsoncodec.load(path) == data
+
+    small = {"a": "한", 1: [1.5, None, True]}
+    assert jsoncodec.dumps(small) == json.dumps(small, ensure_ascii=False, separators=(",", ":"))
+    with pytest.raises(json.JSONDecodeError):
+        jsoncodec.loads(b"{broken")
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_non_finite_and_exponent_floats_round_trip(restore_backend, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    jsoncodec.set_backend(backend)
+    data = {
+        "special": [float("nan"), float("inf"), float("-inf")],
+        "exponent": [1e16, 1.5e300, 1e-7, 0.00001, 1.2345e-5, 5e-324],
+        "plain": [0.0001, 1e15, -0.0, 0.5, None],
+    }
+
+    for indent in (None, 4):
+        raw = jsoncodec.dumps(data, indent=indent)
+        separators = (",", ":") if indent is None else None
+        assert raw == json.dumps(data, ensure_ascii=False, indent=indent, separators=separators)
+        loaded = jsoncodec.loads(raw.encode("utf-8"))
+        assert math.isnan(loaded["special"][0]) and loaded["special"][1:] == [float("inf"), float("-inf")]
+        assert loaded["exponent"] == data["exponent"] and loaded["plain"] == data["plain"]
+
+    assert jsoncodec.loads(b'{"v": NaN, "w": -Infinity}')["w"] == float("-inf")
+
+
+def test_codec_benchmark_on_synthetic_corpus(restore_backend):
+    data = _corpus(3000)
+    data.pop("big")
+    timings = {}
+    outputs = set()
+    for backend in ("json", "orjson"):
+        try:
+            jsoncodec.set_backend(backend)
+        except ValueError:
+            continue
+        raw = jsoncodec.dumps_bytes(data, indent=4)
+        assert jsoncodec.loads(raw) == data
+        outputs.add(raw)
+        timings[backend] = (
+            min(timeit.repeat(lambda: jsoncodec.dumps_bytes(data, indent=4), number=1, repeat=3)),
+            min(timeit.repeat(lambda: jsoncodec.loads(raw), number=1, repeat=3)),
+        )
+    for name, (dump, load) in timings.items():
+        _logger.info("%s: 序列化 %.1f ms，解析 %.1f ms", name, dump * 1000, load * 1000)
+    assert len(outputs) == 1
+    if "orjson" in timings:
+        # 两项差距通常在 2 倍以上，取 3 次最小值后不受机器抖动影响
+        assert timings["orjson"][0] < timings["json"][0]
+        assert timings["orjson"][1] < timings["json"][1]
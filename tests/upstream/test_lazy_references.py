@@ -0,0 +1,56 @@
+"""已翻译文件的快速跳过路径：KR 与 LLC 一致时不加载 EN/JP。"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.enums import ProcessResult
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+
+
+def _processor(tmp_path: Path) -> FileProcessor:
+    paths = PathConfig(
+        target_path=tmp_path / "out",
+        llc_base_path=tmp_path / "llc",
+        KR_base_path=tmp_path / "kr",
+        JP_base_path=tmp_path / "jp",
+        EN_base_path=tmp_path / "en",
+    )
+    engine = MatcherEngine()
+    engine.build_proper([])
+    return FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Lazy.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+        translator=None,
+    )
+
+
+def test_translated_file_skips_without_parsing_references(tmp_path, write_data):
+    write_data(tmp_path / "kr" / "KR_Lazy.json", [{"id": 1, "content": "안녕"}])
+    write_data(tmp_path / "llc" / "Lazy.json", [{"id": 1, "content": "你好"}])
+    # 参考文件损坏：只要被解析就会得到 JSON_DECODE_ERROR
+    (tmp_path / "en").mkdir()
+    (tmp_path / "en" / "EN_Lazy.json").write_text("{broken", encoding="utf-8")
+
+    processor = _processor(tmp_path)
+    outcome = processor.process()
+
+    assert outcome.result == ProcessResult.ALREADY_TRANSLATED
+    assert processor.en_index == {} and processor.jp_index == {}
+    saved = json.loads((tmp_path / "out" / "Lazy.json").read_text(encoding="utf-8"))
+    assert saved["dataList"][0]["content"] == "你好"
+
+
+def test_references_are_loaded_when_entries_need_translation(tmp_path, write_data):
+    write_data(tmp_path / "kr" / "KR_Lazy.json", [{"id": 1, "content": "안녕"}, {"id": 2, "content": "새"}])
+    write_data(tmp_path / "llc" / "Lazy.json", [{"id": 1, "content": "你好"}])
+    (tmp_path / "en").mkdir()
+    (tmp_path / "en" / "EN_Lazy.json").write_text("{broken", encoding="utf-8")
+
+    outcome = _processor(tmp_path).process()
+
+    assert outcome.result == ProcessResult.JSON_DECODE_ERROR
+    assert outcome.extra["file_path"].endswith("EN_Lazy.json")
@@ -0,0 +1,62 @@
+"""结果重建的内存占用基准：结构共享 vs 整份深复制。
+
+以 tracemalloc 的 Python 堆峰值作为单文件内存占用的近似；两种方式的峰值记录在 INFO 日志中（`pytest --log-cli-level=INFO` 可见）。
+"""
+from __future__ import annotations
+
+from copy import deepcopy
+import logging
+import tracemalloc
+
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+from translateFunc.proper import update_dict_with_flattened
+
+_logger = logging.getLogger(__name__)
+
+
+def _peak(func) -> tuple[object, int]:
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def _story_processor(tmp_path, entries: int) -> FileProcessor:
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    processor = FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "StoryData" / "KR_Big.json", paths),
+        engine=MatcherEngine(),
+        translate_config=TranslateConfig(),
+        translator=None,
+    )
+    processor.kr_index = {
+        i: {"id": i, "model": "Dante", "teller": f"단테 {i}", "content": f"대사 {i} " * 40}
+        for i in range(entries)
+    }
+    processor.translating_list = list(range(20))
+    return processor
+
+
+def test_reconstruction_copies_only_translated_entries(tmp_path):
+    processor = _story_processor(tmp_path, 3000)
+    translated = {i: {("content",): f"台词 {i}"} for i in processor.translating_list}
+
+    def full_copy():
+        base = deepcopy(processor.kr_index)
+        for i in processor.translating_list:
+            update_dict_with_flattened(base[i], translated[i])
+        return base
+
+    expected, before = _peak(full_copy)
+    result, after = _peak(lambda: processor._de_get_translating_text(translated))
+    _logger.info("重建峰值内存: 深复制 %.0f KiB -> 结构共享 %.0f KiB", before / 1024, after / 1024)
+
+    assert result == expected
+    assert processor.kr_index[0]["content"].startswith("대사 0")
+    assert result[100] is processor.kr_index[100]
+    assert after * 4 < before
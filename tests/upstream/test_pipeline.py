@@ -1,6 +1,7 @@
 """TranslationPipeline 集成测试 —— 使用 mock 依赖。"""
 import json
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 import pytest
 from unittest.mock import MagicMock, patch, PropertyMock
@@ -10,7 +11,7 @@ from translateFunc import (
     ProcessResult, ProcessOutcome,
 )
 from translateFunc.enums import FileType, MatchConfidence
-from translateFunc.config import FilePathConfig, PathConfig
+from translateFunc.config import FilePathConfig, PathConfig, glossary_digest
 
 
 class TestPipelineSummary:
@@ -273,3 +274,80 @@ class TestRegressionFixes:
         """prompt_version 字段应已从 TranslateConfig 中移除。"""
         config = TranslateConfig()
         assert not hasattr(config, "prompt_version")
+
+
+class TestIncrementalReuse:
+    """输入未变化的文件直接复用上次输出。"""
+
+    def _pipeline(self, config: TranslateConfig) -> TranslationPipeline:
+        pipeline = TranslationPipeline.__new__(TranslationPipeline)
+        pipeline._config = config
+        pipeline._entry_index = None
+        return pipeline
+
+    def test_reuse_previous_copies_listed_files(self, tmp_path):
+        kr_base = tmp_path / "kr"
+        (kr_base / "StoryData").mkdir(parents=True)
+        kr_file = kr_base / "StoryData" / "KR_S1.json"
+        kr_file.write_text("{}", encoding="utf-8")
+        previous = tmp_path / "previous"
+        (previous / "StoryData").mkdir(parents=True)
+        (previous / "StoryData" / "S1.json").write_text('{"old": 1}', encoding="utf-8")
+
+        base = PathConfig(target_path=tmp_path / "out", KR_base_path=kr_base)
+        file_pc = FilePathConfig(kr_file, base)
+        pipeline = self._pipeline(TranslateConfig(
+            reuse_output_dir=previous,
+            reuse_files=frozenset({"StoryData/KR_S1.json"}),
+        ))
+
+        outcome = pipeline._reuse_previous(file_pc)
+
+        assert outcome.result == ProcessResult.REUSED_PREVIOUS
+        assert file_pc.target_file.read_text(encoding="utf-8") == '{"old": 1}'
+
+    def test_reuse_previous_ignores_unlisted_files(self, tmp_path):
+        kr_base = tmp_path / "kr"
+        kr_base.mkdir()
+        kr_file = kr_base / "KR_A.json"
+        kr_file.write_text("{}", encoding="utf-8")
+        base = PathConfig(target_path=tmp_path / "out", KR_base_path=kr_base)
+        pipeline = self._pipeline(TranslateConfig(reuse_output_dir=tmp_path))
+
+        assert pipeline._reuse_previous(FilePathConfig(kr_file, base)) is None
+
+    def test_reused_outcome_counts_as_skipped(self):
+        pipeline = self._pipeline(TranslateConfig())
+        summary = PipelineSummary()
+        pipeline._record_outcome(
+            ProcessOutcome(ProcessResult.REUSED_PREVIOUS, "a.json"), summary,
+        )
+        assert summary.skipped == ["a.json"]
+        assert summary.error_count == 0
+
+    def test_fingerprint_ignores_paths_and_secrets(self):
+        base = TranslateConfig(translator_api={"api_key": "a", "model_name": "m"})
+        other = TranslateConfig(
+            translator_api={"api_key": "b", "model_name": "m"},
+            output_dir=Path("/elsewhere"),
+            max_workers=16,
+        )
+        assert base.fingerprint() == other.fingerprint()
+        assert base.fingerprint() != TranslateConfig(prompt_format="json_json").fingerprint()
+
+    def test_fingerprint_tracks_glossary_content_and_prompt_template(self, monkeypatch):
+        terms = [{"term": "단테", "translation": "但丁", "note": ""}]
+        base = TranslateConfig(glossary_digest=glossary_digest(terms))
+        # 术语表按内容而非路径参与计算
+        assert base.fingerprint() == replace(base, proper_path="/other/terms.json").fingerprint()
+        edited = [{"term": "단테", "translation": "但丁（管理人）", "note": ""}]
+        assert base.fingerprint() != replace(base, glossary_digest=glossary_digest(edited)).fingerprint()
+        assert (
+            replace(base, enable_proper=False).fingerprint()
+            == TranslateConfig(enable_proper=False).fingerprint()
+        )
+
+        before = base.fingerprint()
+        monkeypatch.setattr("translateFunc.config.prompt_template_digest", lambda: "changed")
+        assert base.fingerprint() != before
+
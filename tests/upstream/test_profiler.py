@@ -71,3 +71,17 @@ class TestTimingProfiler:
             time.sleep(0.01)
         profiler.reset()
         assert len(profiler._records) == 0
+
+    def test_metrics_in_report(self):
+        """set_metric() 记录的指标附在报告末尾，reset() 一并清除。"""
+        profiler = TimingProfiler.get()
+        profiler.reset()
+        with profiler.phase("test"):
+            time.sleep(0.005)
+        profiler.set_metric("LLM 并发上限(当前)", 8)
+        profiler.set_metric("LLM 并发上限(当前)", 4)
+        report = profiler.report()
+        assert "LLM 并发上限(当前)" in report
+        assert report.count("LLM 并发上限") == 1
+        profiler.reset()
+        assert len(profiler._metrics) == 0
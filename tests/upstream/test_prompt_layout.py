@@ -0,0 +1,91 @@
+"""prompt_layout="cache" 的前缀稳定性与服务商缓存用量解析测试。"""
+from __future__ import annotations
+
+import json
+
+from translateFunc.builder.request import RequestBuilder
+from translateFunc.builder.stages import StageStrategy
+from translateFunc.config import TranslateConfig
+from translateFunc.enums import FileType
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.usage import UsageMeter, parse_usage
+import translateFunc.translate_doc as translate_doc
+
+
+def _engine() -> MatcherEngine:
+    engine = MatcherEngine()
+    engine.build_proper([
+        {"term": "림버스", "translation": "边狱", "note": ""},
+        {"term": "단테", "translation": "但丁", "note": ""},
+    ])
+    return engine
+
+
+def _request_text(*texts: str) -> dict:
+    return {
+        lang: {index: {("content",): text} for index, text in enumerate(texts)}
+        for lang in ("kr", "jp", "en")
+    }
+
+
+def test_cache_layout_moves_skill_doc_into_system_prompt():
+    default = StageStrategy(TranslateConfig())
+    cached = StageStrategy(TranslateConfig(prompt_layout="cache"))
+    for fmt in ("xml_json", "xml_xml", "json_json"):
+        doc = translate_doc.SKILL_DOC
+        if fmt == "json_json":
+            doc = json.dumps(doc, ensure_ascii=False)[1:-1]
+        assert doc not in default.build_stage_1_prompt(FileType.SKILL, fmt)
+        assert doc in cached.build_stage_1_prompt(FileType.SKILL, fmt)
+        assert doc not in cached.build_stage_1_prompt(FileType.UI, fmt)
+
+    builder = RequestBuilder(
+        _request_text("림버스"), _engine(), is_skill=True, prompt_layout="cache",
+    )
+    builder.build()
+    for fmt in ("xml_json", "json_json"):
+        assert translate_doc.SKILL_DOC not in builder.get_request_text(prompt_format=fmt)[0]
+
+
+def test_cache_layout_renders_glossary_in_stable_order():
+    def glossary(layout: str, *texts: str) -> list[str]:
+        builder = RequestBuilder(_request_text(*texts), _engine(), prompt_layout=layout)
+        builder.build()
+        return [t["term"] for t in builder.unified_request["reference"]["proper_terms"]]
+
+    assert glossary("default", "림버스", "단테") == ["림버스", "단테"]
+    assert glossary("cache", "림버스", "단테") == glossary("cache", "단테", "림버스")
+    assert glossary("cache", "림버스", "단테") == sorted(["림버스", "단테"])
+
+
+def test_parse_usage_reads_provider_cache_fields():
+    def attempt(usage: dict, status: int = 200) -> dict:
+        return {"status_code": status, "body": json.dumps({"usage": usage})}
+
+    deepseek = attempt({"prompt_tokens": 900, "prompt_cache_hit_tokens": 640})
+    openai = attempt({"prompt_tokens": 500, "prompt_tokens_details": {"cached_tokens": 256}})
+
+    assert parse_usage([attempt({}, status=500), deepseek]) == {
+        "prompt_tokens": 900, "completion_tokens": 0, "cached_tokens": 640,
+        "reasoning_tokens": 0, "total_tokens": 900,
+    }
+    assert parse_usage([openai])["cached_tokens"] == 256
+    thinking = attempt({
+        "prompt_tokens": 100, "completion_tokens": 300, "total_tokens": 400,
+        "completion_tokens_details": {"reasoning_tokens": 250},
+    })
+    assert parse_usage([thinking])["reasoning_tokens"] == 250
+    assert parse_usage([thinking])["total_tokens"] == 400
+    # 推理 token 单独报告、只计入 total_tokens 的服务商
+    separate = attempt({"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 400})
+    assert parse_usage([separate])["total_tokens"] == 400
+    assert parse_usage([{"status_code": 200, "body": "not json"}]) is None
+    assert parse_usage([]) is None
+
+    meter = UsageMeter()
+    meter.add(parse_usage([deepseek]))
+    meter.add(parse_usage([openai]))
+    meter.add(None)
+    stats = meter.stats()
+    assert (stats["usage_calls"], stats["prompt_tokens"], stats["cached_tokens"]) == (2, 1400, 896)
+    assert stats["cache_hit_rate"] == 0.64
@@ -0,0 +1,89 @@
+"""AdaptiveLimiter AIMD 并发控制与拥塞判定测试。"""
+from __future__ import annotations
+
+import threading
+import time
+
+from translateFunc.rate_limit import AdaptiveLimiter, is_congestion_signal
+
+
+def test_congestion_halves_limit_once_per_window():
+    limiter = AdaptiveLimiter(8)
+    slots = [limiter.acquire() for _ in range(4)]
+    # 同一窗口内的多个失败只减半一次
+    for slot in slots:
+        slot.congested = True
+        limiter.release(slot)
+
+    assert limiter.limit == 4
+    assert limiter.stats()["decreases"] == 1
+
+    slot = limiter.acquire()
+    slot.congested = True
+    limiter.release(slot)
+    assert limiter.limit == 2
+    assert limiter.stats()["lowest_limit"] == 2
+
+
+def test_success_grows_limit_back_to_maximum():
+    limiter = AdaptiveLimiter(4)
+    with limiter.slot() as slot:
+        slot.congested = True
+    assert limiter.limit == 2
+
+    for _ in range(50):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 4
+
+
+def test_limit_never_drops_below_minimum():
+    limiter = AdaptiveLimiter(2, minimum=1)
+    for _ in range(5):
+        with limiter.slot() as slot:
+            slot.congested = True
+    assert limiter.limit == 1
+
+
+def test_acquire_blocks_at_limit_and_tracks_queue_depth():
+    limiter = AdaptiveLimiter(2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.stats()["peak_waiting"] >= 1
+
+
+def test_congestion_signal_classification():
+    assert is_congestion_signal([{"status_code": 200}, {"status_code": 429}], None)
+    assert is_congestion_signal([{"status_code": 503}], None)
+    assert not is_congestion_signal([{"status_code": 400}], None)
+    assert is_congestion_signal([], TimeoutError("Read timed out"))
+    assert is_congestion_signal([], RuntimeError("请求频率超限，请稍后重试"))
+    assert not is_congestion_signal([], ValueError("响应解析失败"))
+
+    try:
+        try:
+            raise TimeoutError("timeout")
+        except TimeoutError as inner:
+            raise RuntimeError("调用大模型API失败") from inner
+    except RuntimeError as wrapped:
+        assert is_congestion_signal(None, wrapped)
@@ -0,0 +1,262 @@
+"""RequestEngine 在途上限、分片队列与 FileProcessor 集成测试。"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import re
+import threading
+import time
+
+import pytest
+
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+from translateFunc.request_engine import RequestEngine, EngineRequest
+
+from conftest import FakeSession
+
+
+class _SlowTranslator:
+    """记录并发峰值与每次调用收到的提示词参数。"""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, calls: list, fail_on: str | None = None):
+        self._session = FakeSession()
+        self._calls = calls
+        self._fail_on = fail_on
+
+    def translate(self, text, timeout=None, system_prompt=None, response_format=None):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.02)
+            self._calls.append((text, system_prompt, response_format))
+            if text == self._fail_on:
+                raise RuntimeError("boom")
+            return f"echo:{text}"
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    _SlowTranslator.active = 0
+    _SlowTranslator.peak = 0
+
+
+def _request(text: str) -> EngineRequest:
+    return EngineRequest(
+        user_prompt=text, system_prompt="sys", response_format="json_object", timeout=10,
+    )
+
+
+def test_engine_bounds_in_flight_requests():
+    calls: list = []
+    with RequestEngine(lambda: _SlowTranslator(calls), max_concurrent=3) as engine:
+        futures = [engine.submit(_request(str(i))) for i in range(12)]
+        results = [future.result() for future in futures]
+
+    assert [r.raw_response for r in results] == [f"echo:{i}" for i in range(12)]
+    assert _SlowTranslator.peak <= 3
+    assert engine.stats()["peak_in_flight"] == 3
+    assert engine.stats()["completed"] == 12
+    assert {(system, fmt) for _, system, fmt in calls} == {("sys", "json_object")}
+
+
+def test_engine_serves_many_callers_with_one_limit():
+    calls: list = []
+    with RequestEngine(lambda: _SlowTranslator(calls), max_concurrent=4) as engine:
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            results = list(callers.map(lambda i: engine.call(_request(str(i))), range(16)))
+
+    assert len(results) == 16
+    assert _SlowTranslator.peak <= 4
+
+
+def test_engine_returns_exceptions_in_result():
+    calls: list = []
+    with RequestEngine(lambda: _SlowTranslator(calls, fail_on="bad"), max_concurrent=2) as engine:
+        result = engine.call(_request("bad"))
+
+    assert result.raw_response is None
+    assert isinstance(result.exception, RuntimeError)
+
+
+def test_map_parts_keeps_order_limit_and_thread_count():
+    calls: list = []
+    running = {"now": 0, "peak": 0}
+    threads: set[str] = set()
+    lock = threading.Lock()
+
+    def task(index: int) -> str:
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            threads.add(threading.current_thread().name)
+        try:
+            return engine.call(_request(str(index))).raw_response
+        finally:
+            with lock:
+                running["now"] -= 1
+
+    before = threading.active_count()
+    with RequestEngine(lambda: _SlowTranslator(calls), max_concurrent=4) as engine:
+        results = engine.map_parts(task, range(20), limit=3)
+        during = threading.active_count()
+
+    assert results == [f"echo:{i}" for i in range(20)]
+    assert running["peak"] <= 3
+    assert all(name.startswith("lcta-request") for name in threads)
+    # 分片只在共享执行器中运行，不另开线程
+    assert during - before <= 4
+
+
+def test_map_parts_reraises_task_errors():
+    def task(index: int) -> int:
+        if index == 2:
+            raise ValueError("bad part")
+        return index
+
+    with RequestEngine(lambda: _SlowTranslator([]), max_concurrent=2) as engine:
+        with pytest.raises(ValueError):
+            engine.map_parts(task, range(5), limit=2)
+        assert engine.map_parts(task, [], limit=2) == []
+
+
+def test_engine_rejects_submit_after_close():
+    engine = RequestEngine(lambda: _SlowTranslator([]), max_concurrent=1)
+    engine.start()
+    engine.close()
+    with pytest.raises(RuntimeError):
+        engine.submit(_request("late"))
+
+
+def test_processor_sends_ai_calls_through_engine(tmp_path):
+    class _UnusedTranslator:
+        _session = FakeSession()
+
+        def translate(self, *_args, **_kwargs):
+            raise AssertionError("使用请求引擎时不应直接调用文件线程的翻译器")
+
+        def update_config(self, **_kwargs):
+            raise AssertionError("使用请求引擎时不应修改共享翻译器配置")
+
+    class _JsonTranslator:
+        def __init__(self):
+            self._session = FakeSession()
+
+        def translate(self, text, timeout=None, system_prompt=None, response_format=None):
+            assert system_prompt
+            return json.dumps({"translations": [{"id": 1, "translation": "你好"}]})
+
+    kr_file = tmp_path / "kr" / "KR_Test.json"
+    kr_file.parent.mkdir()
+    kr_file.write_text('{"dataList": []}', encoding="utf-8")
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine_matcher = MatcherEngine()
+    engine_matcher.build_proper([])
+
+    with RequestEngine(_JsonTranslator, max_concurrent=2) as engine:
+        processor = FileProcessor(
+            FilePathConfig(kr_file, paths),
+            engine=engine_matcher,
+            translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+            translator=_UnusedTranslator(),
+            request_engine=engine,
+        )
+        result, had_fallback = processor._translate({
+            lang: {0: {("content",): "안녕"}} for lang in ("kr", "jp", "en")
+        })
+
+    assert result == {0: {("content",): "你好"}}
+    assert not had_fallback
+
+
+class _PartTranslator:
+    """按 <kr> 原文回显译文；原文在 garbled 中的请求首次返回无法解析的响应。"""
+
+    def __init__(self, garbled: set[str], seen: set[str]):
+        self._session = FakeSession()
+        self._garbled = garbled
+        self._seen = seen
+
+    def translate(self, text, timeout=None, system_prompt=None, response_format=None):
+        cls = _SlowTranslator
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.02)
+            sources = (
+                re.findall(r"<kr>(.*?)</kr>", text, re.S)
+                or re.findall(r'"kr":\s*"([^"]*)"', text)
+            )
+            if sources and sources[0] in self._garbled and sources[0] not in self._seen:
+                self._seen.add(sources[0])
+                return "not a response"
+            return json.dumps({
+                "translations": [
+                    {"id": index + 1, "translation": f"译{source[:6]}"}
+                    for index, source in enumerate(sources)
+                ],
+            })
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+def _split_processor(tmp_path, engine, part_concurrency, fallback=False):
+    kr_file = tmp_path / "kr" / "KR_Test.json"
+    kr_file.parent.mkdir(exist_ok=True)
+    kr_file.write_text('{"dataList": []}', encoding="utf-8")
+    matcher = MatcherEngine()
+    matcher.build_proper([])
+    return FileProcessor(
+        FilePathConfig(kr_file, PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")),
+        engine=matcher,
+        translate_config=TranslateConfig(
+            translation_mode="single_stage",
+            fallback=fallback,
+            part_concurrency=part_concurrency,
+        ),
+        translator=object(),
+        request_engine=engine,
+    )
+
+
+def _long_request(count: int) -> dict:
+    texts = {index: {("content",): f"{index:04d}" + "가" * 1500} for index in range(count)}
+    return {lang: texts for lang in ("kr", "jp", "en")}
+
+
+def test_parts_of_one_file_are_translated_concurrently_in_order(tmp_path):
+    request = _long_request(40)
+    with RequestEngine(lambda: _PartTranslator(set(), set()), max_concurrent=8) as engine:
+        processor = _split_processor(tmp_path, engine, part_concurrency=4)
+        result, had_fallback = processor._translate(request)
+
+    assert not had_fallback
+    assert [result[index][("content",)] for index in range(40)] == [
+        f"译{index:04d}가가" for index in range(40)
+    ]
+    assert _SlowTranslator.peak > 1
+
+
+def test_concurrent_parts_keep_per_part_format_fallback(tmp_path):
+    request = _long_request(40)
+    # 第一个分片的首个原文在首次请求时返回无法解析的响应，应由下一格式恢复
+    garbled, seen = {request["kr"][0][("content",)]}, set()
+    with RequestEngine(lambda: _PartTranslator(garbled, seen), max_concurrent=8) as engine:
+        processor = _split_processor(tmp_path, engine, part_concurrency=4, fallback=True)
+        result, had_fallback = processor._translate(request)
+
+    assert not had_fallback
+    assert seen == garbled
+    assert result[0][("content",)] == "译0000가가"
@@ -0,0 +1,97 @@
+"""分片划分、分片结果写入与合并测试。"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from translateFunc.config import PipelineSummary, ProcessOutcome
+from translateFunc.entry_index import ENTRY_INDEX_NAME, EntryIndex
+from translateFunc.enums import ProcessResult
+from translateFunc.sharding import ShardSpec, assign_shards, merge_bundles, write_bundle
+
+
+def test_shard_spec_parse():
+    assert ShardSpec.parse("2/4") == ShardSpec(2, 4)
+    assert ShardSpec(2, 4).name == "shard-2-of-4"
+    for bad in ("0/2", "3/2", "1", "a/b"):
+        with pytest.raises(ValueError):
+            ShardSpec.parse(bad)
+
+
+def test_assign_shards_is_balanced_and_deterministic():
+    weights = {"StoryData/KR_S1.json": 900, "KR_A.json": 500, "KR_B.json": 400, "KR_C.json": 10}
+    assignment = assign_shards(weights, 2)
+
+    assert assignment == assign_shards(dict(reversed(list(weights.items()))), 2)
+    assert set(assignment) == set(weights)
+    loads = {1: 0, 2: 0}
+    for rel_path, shard in assignment.items():
+        loads[shard] += weights[rel_path]
+    assert loads == {1: 910, 2: 900}
+
+
+def test_summary_round_trip():
+    summary = PipelineSummary(
+        saved=["a.json"], skipped=["b.json"], fallback=["c.json"],
+        errors=[ProcessOutcome(ProcessResult.TRANSLATION_MISMATCH, "d.json", {"reason": "x"})],
+    )
+    restored = PipelineSummary.from_dict(json.loads(json.dumps(summary.to_dict())))
+    assert restored == summary
+
+
+def _bundle(root: Path, index: int, count: int, files: dict[str, str],
+            saved: list[str], config: str = "cfg") -> Path:
+    for rel, content in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(content, encoding="utf-8")
+    (root / "processing_log.jsonl").write_text(f'{{"shard": {index}}}\n', encoding="utf-8")
+    entry_index = EntryIndex(config=config)
+    for name in saved:
+        entry_index.record(name, {"1": ["k", "", "ours"]})
+    entry_index.save(root / "Info" / ENTRY_INDEX_NAME)
+    write_bundle(root, PipelineSummary(saved=saved), index=index, count=count, config=config)
+    return root
+
+
+def test_merge_bundles_combines_outputs_summary_and_index(tmp_path):
+    bundles = [
+        _bundle(tmp_path / "prepare", 0, 0, {"BattleKeywords.json": "prepared"}, ["BattleKeywords.json"]),
+        _bundle(tmp_path / "s2", 2, 2, {"BattleKeywords.json": "copy", "StoryData/S1.json": "s1"}, ["S1.json"]),
+        _bundle(tmp_path / "s1", 1, 2, {"BattleKeywords.json": "copy", "A.json": "a"}, ["A.json"]),
+    ]
+    target = tmp_path / "merged"
+
+    summary = merge_bundles(bundles, target)
+
+    assert summary.saved == ["BattleKeywords.json", "A.json", "S1.json"]
+    assert (target / "BattleKeywords.json").read_text(encoding="utf-8") == "prepared"
+    assert (target / "StoryData" / "S1.json").read_text(encoding="utf-8") == "s1"
+    assert not (target / "Info" / "shard.json").exists()
+    assert (target / "processing_log.jsonl").read_text(encoding="utf-8").count("shard") == 3
+    index = EntryIndex.load(target / "Info" / ENTRY_INDEX_NAME, "cfg")
+    assert index.previous_entries("S1.json") == {"1": ["k", "", "ours"]}
+
+
+def test_merge_bundles_rejects_incomplete_or_mismatched_shards(tmp_path):
+    first = _bundle(tmp_path / "s1", 1, 2, {"A.json": "a"}, ["A.json"])
+    with pytest.raises(ValueError, match="不完整"):
+        merge_bundles([first], tmp_path / "merged")
+
+    other = _bundle(tmp_path / "s2", 2, 2, {"B.json": "b"}, ["B.json"], config="other")
+    with pytest.raises(ValueError, match="配置不一致"):
+        merge_bundles([first, other], tmp_path / "merged")
+
+
+def test_merge_bundles_rejects_bundles_from_another_config(tmp_path):
+    bundles = [
+        _bundle(tmp_path / "s1", 1, 2, {"A.json": "a"}, ["A.json"]),
+        _bundle(tmp_path / "s2", 2, 2, {"B.json": "b"}, ["B.json"]),
+    ]
+    with pytest.raises(ValueError, match="与本次合并运行不一致"):
+        merge_bundles(bundles, tmp_path / "stale", expected_config="new-glossary")
+    assert not (tmp_path / "stale").exists()
+
+    merge_bundles(bundles, tmp_path / "merged", expected_config="cfg")
+    assert (tmp_path / "merged" / "B.json").read_text(encoding="utf-8") == "b"
@@ -0,0 +1,148 @@
+"""TranslationMemory 与 RequestBuilder / FileProcessor 集成测试。"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from translateFunc.builder.request import RequestBuilder
+from translateFunc.config import FilePathConfig, PathConfig, TranslateConfig
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.memory import TranslationMemory
+from translateFunc.processor import FileProcessor
+
+from conftest import FakeSession
+
+
+class _NumberingTranslator:
+    """按 <block> 返回 translated-N，跳过 KR 原文在 untranslatable 中的块。"""
+
+    def __init__(self, untranslatable: set[str] | None = None):
+        self._session = FakeSession()
+        self.prompts: list[str] = []
+        self.untranslatable = untranslatable or set()
+
+    def update_config(self, **_kwargs):
+        return None
+
+    def clear_cache(self):
+        return None
+
+    def translate(self, text, timeout=None):
+        self.prompts.append(text)
+        sources = re.findall(r"<kr>(.*?)</kr>", text)
+        return json.dumps({
+            "translations": [
+                {"id": index + 1, "translation": f"translated-{len(self.prompts)}-{index + 1}"}
+                for index, source in enumerate(sources)
+                if source not in self.untranslatable
+            ],
+        })
+
+
+def _engine() -> MatcherEngine:
+    engine = MatcherEngine()
+    engine.build_proper([{"term": "림버스", "translation": "边狱", "note": ""}])
+    return engine
+
+
+def _request_text(*texts: str) -> dict:
+    return {
+        lang: {index: {("content",): text} for index, text in enumerate(texts)}
+        for lang in ("kr", "jp", "en")
+    }
+
+
+def _make_processor(tmp_path: Path, translator, memory: TranslationMemory) -> FileProcessor:
+    kr_base = tmp_path / "kr"
+    kr_base.mkdir(exist_ok=True)
+    kr_file = kr_base / "KR_test.json"
+    kr_file.write_text('{"dataList": []}', encoding="utf-8")
+    paths = PathConfig(
+        target_path=tmp_path / "out",
+        llc_base_path=tmp_path / "llc",
+        KR_base_path=kr_base,
+        JP_base_path=tmp_path / "jp",
+        EN_base_path=tmp_path / "en",
+    )
+    return FileProcessor(
+        FilePathConfig(kr_file, paths),
+        engine=_engine(),
+        translate_config=TranslateConfig(
+            translation_mode="single_stage",
+            fallback=False,
+            translator_api={"model_name": "test-model"},
+        ),
+        translator=translator,
+        memory=memory,
+    )
+
+
+def test_memory_persists_across_instances(tmp_path):
+    path = tmp_path / "cache" / "memory.sqlite3"
+    memory = TranslationMemory(path)
+    memory.put("key", "译文")
+    memory.close()
+
+    reopened = TranslationMemory(path)
+    assert reopened.get("key") == "译文"
+    assert reopened.get("missing") is None
+    assert reopened.stats() == {"hits": 1, "misses": 1, "writes": 0}
+
+
+def test_memory_key_depends_on_glossary_and_context():
+    block = {"kr": "림버스", "jp": "", "en": ""}
+    reference = {"proper_terms": [{"term": "림버스", "translation": "边狱", "note": ""}]}
+    changed = {"proper_terms": [{"term": "림버스", "translation": "地狱", "note": ""}]}
+
+    key = TranslationMemory.make_key(block, reference, "ctx")
+    assert key == TranslationMemory.make_key(dict(block), reference, "ctx")
+    assert key != TranslationMemory.make_key(block, changed, "ctx")
+    assert key != TranslationMemory.make_key(block, reference, "other")
+
+
+def test_builder_skips_memory_hits_and_debuild_merges():
+    memory = TranslationMemory()
+    probe = RequestBuilder(_request_text("림버스 안녕", "두번째"), _engine(), memory=memory)
+    probe.build()
+    memory.put(probe.memory_keys[0], "边狱 你好")
+
+    builder = RequestBuilder(_request_text("림버스 안녕", "두번째"), _engine(), memory=memory)
+    builder.build()
+
+    text_blocks = builder.unified_request["text_blocks"]
+    assert [block["kr"] for block in text_blocks] == ["두번째"]
+    # 命中的文本块引用的术语不进入 reference
+    assert builder.unified_request["reference"]["proper_terms"] == []
+    assert builder.unified_request["metadata"]["memory_hits"] == 1
+
+    result = builder.deBuild(["第二"])
+    assert result == {0: {("content",): "边狱 你好"}, 1: {("content",): "第二"}}
+
+
+def test_second_run_reuses_memory_without_llm_calls(tmp_path):
+    memory = TranslationMemory(tmp_path / "memory.sqlite3")
+    first_translator = _NumberingTranslator()
+    first = _make_processor(tmp_path, first_translator, memory)
+    first_result, first_fallback = first._translate(_request_text("하나", "둘"))
+
+    second_translator = _NumberingTranslator()
+    second = _make_processor(tmp_path, second_translator, memory)
+    second_result, second_fallback = second._translate(_request_text("하나", "둘"))
+
+    assert len(first_translator.prompts) == 1
+    assert second_translator.prompts == []
+    assert second_result == first_result
+    assert not first_fallback and not second_fallback
+
+
+def test_fallback_entries_are_not_written_to_memory(tmp_path):
+    memory = TranslationMemory()
+    translator = _NumberingTranslator(untranslatable={"둘"})
+    processor = _make_processor(tmp_path, translator, memory)
+
+    result, had_fallback = processor._translate(_request_text("하나", "둘"))
+
+    assert had_fallback
+    assert result[1] == {("content",): "둘"}
+    assert len(memory) == 1
@@ -0,0 +1,114 @@
+"""UsageMeter 按文件 / 阶段 / 格式累计用量与耗时分位数测试。"""
+from __future__ import annotations
+
+import json
+import re
+
+from translateFunc.config import FilePathConfig, PathConfig, PipelineSummary, TranslateConfig
+from translateFunc.matcher.engine import MatcherEngine
+from translateFunc.processor import FileProcessor
+from translateFunc.usage import UsageMeter, apportion, latency_percentiles, percentile, split_usage
+
+from conftest import FakeSession
+
+
+def test_meter_groups_counts_and_percentiles_survive_shard_merge():
+    meter = UsageMeter()
+    usage = {"prompt_tokens": 100, "completion_tokens": 20, "cached_tokens": 64}
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        meter.add(usage, file_name="a.json", stage="stage_1", prompt_format="xml_json", latency=latency)
+    meter.add(None, file_name="b.json", stage="stage_2", prompt_format="xml_json", latency=9.0)
+
+    summary = meter.summary()
+    assert summary["total"] == {
+        "calls": 5, "usage_calls": 4, "prompt_tokens": 400,
+        "completion_tokens": 80, "cached_tokens": 256, "reasoning_tokens": 0,
+    }
+    assert summary["by_stage"]["stage_2"]["calls"] == 1
+    assert summary["by_format"]["xml_json"]["calls"] == 5
+    assert summary["by_file"]["a.json"]["prompt_tokens"] == 400
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+    assert percentile([], 99) == 0.0
+
+    shard = PipelineSummary(usage=summary, latencies=meter.latencies())
+    merged = PipelineSummary.from_dict(json.loads(json.dumps(shard.to_dict())))
+    merged.extend(PipelineSummary.from_dict(shard.to_dict()))
+    assert merged.usage["total"]["calls"] == 10
+    assert latency_percentiles(merged.latencies)["stage_1"] == {
+        "count": 8, "p50": 2.0, "p95": 4.0, "p99": 4.0,
+    }
+
+
+class _FakeResponse:
+    status_code = 200
+    reason = "OK"
+    url = "https://api.example.com/chat/completions"
+    elapsed = None
+    headers: dict = {}
+    request = None
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _UsageTranslator:
+    """按 <kr> 回显译文，并像 requests 一样把带 usage 的响应交给 response hook。"""
+
+    def __init__(self):
+        self._session = FakeSession()
+
+    def update_config(self, **_kwargs):
+        return None
+
+    def clear_cache(self):
+        return None
+
+    def translate(self, text, timeout=None):
+        sources = re.findall(r"<kr>(.*?)</kr>", text)
+        content = json.dumps({
+            "translations": [
+                {"id": index + 1, "translation": f"译:{source}"}
+                for index, source in enumerate(sources)
+            ],
+        })
+        body = json.dumps({
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": 1200, "completion_tokens": 30, "prompt_cache_hit_tokens": 1024},
+        })
+        for hook in self._session.hooks["response"]:
+            hook(_FakeResponse(body))
+        return content
+
+
+def test_split_usage_keeps_totals_exact():
+    assert apportion(10, [1, 1, 1]) == [3, 3, 4]
+    assert apportion(7, [0, 0]) == [3, 4]
+    assert apportion(5, []) == []
+    parts = split_usage({"prompt_tokens": 1001, "completion_tokens": 7, "cached_tokens": 0}, [1, 2, 4])
+    assert [p["prompt_tokens"] for p in parts] == [143, 286, 572]
+    assert sum(p["completion_tokens"] for p in parts) == 7
+    assert split_usage(None, [1, 2]) == [None, None]
+
+
+def test_call_records_capture_provider_usage(tmp_path, write_data):
+    write_data(tmp_path / "kr" / "KR_Usage.json", [{"id": 1, "content": "안녕"}])
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr")
+    engine = MatcherEngine()
+    engine.build_proper([])
+    meter = UsageMeter()
+
+    FileProcessor(
+        FilePathConfig(tmp_path / "kr" / "KR_Usage.json", paths),
+        engine=engine,
+        translate_config=TranslateConfig(translation_mode="single_stage", fallback=False),
+        translator=_UsageTranslator(),
+        usage=meter,
+    ).process()
+
+    summary = meter.summary()
+    assert summary["by_file"] == {"KR_Usage.json": {
+        "calls": 1, "usage_calls": 1, "prompt_tokens": 1200,
+        "completion_tokens": 30, "cached_tokens": 1024, "reasoning_tokens": 0,
+    }}
+    assert list(summary["by_stage"]) == ["stage_1"]
+    assert list(meter.latencies()) == ["stage_1"]
@@ -0,0 +1,123 @@
+"""WorkerPool 依赖图与最长优先调度测试。"""
+from __future__ import annotations
+
+import threading
+import time
+
+from translateFunc.config import (
+    FilePathConfig, PathConfig, ProcessOutcome, ProcessResult, TranslateConfig,
+)
+from translateFunc.pipeline import TranslationPipeline
+from translateFunc.planner import estimate_file_work
+from translateFunc.workers import WorkerPool
+
+
+def _pool(max_workers: int = 4) -> WorkerPool:
+    return WorkerPool(translator_factory=object, max_workers=max_workers)
+
+
+def test_dependent_files_wait_for_provider_hook():
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def process_fn(item, _translator):
+        with lock:
+            events.append(f"start:{item}")
+        time.sleep(0.03 if item == "model" else 0.01)
+        return ProcessOutcome(ProcessResult.SUCCESS_SAVED, item)
+
+    def update_roles():
+        with lock:
+            events.append("roles")
+
+    outcomes = _pool().map(
+        ["model", "story", "ui"],
+        process_fn,
+        needs=lambda item: {"roles"} if item == "story" else set(),
+        provides={"model": ("roles", update_roles)},
+    )
+
+    assert [o.file_name for o in outcomes] == ["model", "story", "ui"]
+    # 无依赖的文件与提供方同时开始；剧情文件在角色更新后才开始
+    assert events.index("start:ui") < events.index("roles")
+    assert events.index("roles") < events.index("start:story")
+
+
+def test_failed_provider_still_releases_dependents():
+    def process_fn(item, _translator):
+        if item == "keywords":
+            raise RuntimeError("boom")
+        return ProcessOutcome(ProcessResult.SUCCESS_SAVED, item)
+
+    hooks: list[str] = []
+    outcomes = _pool(2).map(
+        ["keywords", "skill"],
+        process_fn,
+        needs=lambda item: {"affects"} if item == "skill" else set(),
+        provides={"keywords": ("affects", lambda: hooks.append("affects"))},
+    )
+
+    assert [o.result for o in outcomes] == [ProcessResult.SAVE_ERROR, ProcessResult.SUCCESS_SAVED]
+    assert hooks == ["affects"]
+
+
+def test_unprovided_dependencies_do_not_block():
+    outcomes = _pool(2).map(
+        ["story"],
+        lambda item, _t: ProcessOutcome(ProcessResult.SUCCESS_SAVED, item),
+        needs=lambda _item: {"roles"},
+    )
+    assert [o.file_name for o in outcomes] == ["story"]
+
+
+def test_pipeline_file_dependencies(tmp_path):
+    base = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path)
+    deps = TranslationPipeline._file_dependencies
+    assert deps(tmp_path / "StoryData" / "KR_S1.json", base, True) == {"roles"}
+    assert deps(tmp_path / "KR_Skills_Ego.json", base, True) == {"affects"}
+    assert deps(tmp_path / "KR_UI.json", base, True) == set()
+
+
+def test_ready_files_start_longest_first():
+    started: list[str] = []
+
+    def process_fn(item, _translator):
+        started.append(item)
+        return ProcessOutcome(ProcessResult.SUCCESS_SAVED, item)
+
+    sizes = {"model": 1, "small": 10, "huge": 1000, "story": 5000, "medium": 100}
+    outcomes = _pool(1).map(
+        list(sizes),
+        process_fn,
+        needs=lambda item: {"roles"} if item == "story" else set(),
+        provides={"model": ("roles", lambda: None)},
+        weight=sizes.get,
+    )
+
+    # 结果保持输入顺序；提供事件的文件最先，之后按工作量从大到小
+    assert [o.file_name for o in outcomes] == list(sizes)
+    assert started == ["model", "story", "huge", "medium", "small"]
+
+
+def test_estimate_file_work_uses_size_and_skips_reused(tmp_path):
+    kr_file = tmp_path / "KR_A.json"
+    kr_file.write_text('{"dataList": []}', encoding="utf-8")
+    file_pc = FilePathConfig(kr_file, PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path))
+
+    assert estimate_file_work(file_pc, TranslateConfig()) == kr_file.stat().st_size
+    reused = TranslateConfig(reuse_output_dir=tmp_path, reuse_files=frozenset({"KR_A.json"}))
+    assert estimate_file_work(file_pc, reused) == 0
+
+
+def test_estimate_file_work_weights_by_entries_llc_does_not_cover(tmp_path, write_data):
+    paths = PathConfig(target_path=tmp_path / "out", KR_base_path=tmp_path / "kr", llc_base_path=tmp_path / "llc")
+    kr = [{"id": i, "content": f"문장 {i}"} for i in range(1, 5)]
+    write_data(tmp_path / "kr" / "KR_A.json", kr)
+    file_pc = FilePathConfig(tmp_path / "kr" / "KR_A.json", paths)
+    size = file_pc.KR_path.stat().st_size
+
+    assert estimate_file_work(file_pc, TranslateConfig()) == size
+    write_data(tmp_path / "llc" / "A.json", [{"id": i, "content": f"句子 {i}"} for i in (1, 2, 3)])
+    assert estimate_file_work(file_pc, TranslateConfig()) == size // 4
+    write_data(tmp_path / "llc" / "A.json", [{"id": i, "content": f"句子 {i}"} for i in range(1, 5)])
+    assert estimate_file_work(file_pc, TranslateConfig()) == 0